@@ -44,6 +44,15 @@ else:
 # === File and Directory Paths ===
 DEFAULT_EXCEL_FILENAME = "clients.xlsx"
 DOWNLOAD_FOLDER_NAME = "GST_Downloads"
+DOWNLOAD_STAGING_FOLDER_NAME = ".incoming"    # Per-run Chrome download dirs (inside GST_Downloads)
+DOWNLOAD_MANIFEST_FILENAME = "manifest.sqlite3"  # Index of every file filed into GST_Downloads
+DOWNLOAD_MANIFEST_VERIFY_HASH = True  # Re-hash files before reusing them in incremental mode
+LEDGER_STORE_FOLDER_NAME = "Ledgers"  # Extracted ledger rows, per client (inside GST_Downloads/<client>_<username>)
+CREDIT_LEDGER_EXTRACTION_ENABLED = True  # Read the credit ledger table into the ledger store
+CASH_LEDGER_EXTRACTION_ENABLED = True    # Read the cash ledger balance details into a record
+CREDIT_LEDGER_MAX_SPAN_DAYS = 366  # Longest range per credit ledger query (windows also stop at 31 March)
+CREDIT_LEDGER_PARALLEL_TABS = 3    # Browser tabs fetching the windows of a long range (1 = one at a time)
+CASH_BALANCE_REPORT_PREFIX = "cash_ledger_balances"  # Consolidated batch report (in GST_Downloads)
 
 # Platform-specific ChromeDriver paths
 # Windows: chromedriver-win64/chromedriver.exe
@@ -76,9 +85,74 @@ WAIT_TIME_LONG = 40         # Slower loading elements (dashboards, reports)
 WAIT_TIME_VERY_LONG = 75    # Very slow operations (heavy reports, file generation)
 WAIT_TIME_MANUAL_CAPTCHA = 90  # Time for user to manually enter CAPTCHA
 
+# === Condition-Based Wait Settings ===
+WAIT_POLL_INTERVAL = 0.25       # Seconds between condition checks
+NETWORK_QUIET_PERIOD_MS = 500   # No XHR/fetch activity for this long means the network is idle
+ANGULAR_IDLE_WAIT_ENABLED = True  # Page-ready waits also wait for the AngularJS app to have no pending $http requests
+DOWNLOAD_STABLE_SECONDS = 1.0   # File size must stay unchanged this long to count as finished
+PARTIAL_DOWNLOAD_EXTENSIONS = (".crdownload", ".tmp", ".part")
+
+# Dismiss the post-login "Remind me later" popup from an in-page watcher
+# whenever it appears, instead of only at the one-time check after login
+POPUP_AUTO_DISMISS = True
+
+# Check all fallback locators together in one injected script per poll,
+# sharing a single deadline, instead of waiting on each strategy in turn
+RACE_FALLBACK_LOCATORS = True
+
+# Wait for elements with a MutationObserver inside the page (one script call
+# per element, resolved on the DOM change) instead of polling from Python
+OBSERVED_ELEMENT_WAITS = True
+
+# Fill form inputs (login, ledger dates) by setting all values in one script
+# call; any field whose value does not stick is typed with send_keys instead
+FAST_FORM_FILL_ENABLED = True
+
+# === Locator Ranking Cache ===
+# Remembers which fallback locator wins for each element so it is tried first
+LOCATOR_CACHE_ENABLED = True
+LOCATOR_CACHE_FILENAME = "locator_cache.json"
+LOCATOR_CACHE_MAX_MISSES = 3       # Drop a strategy's ranking after this many consecutive misses
+LOCATOR_CACHE_MAX_AGE_DAYS = 30    # Drop rankings that have not won for this long
+
+# === Page Load Metrics ===
+# Browser Navigation/Resource Timing of every portal page transition, per client and step
+PAGE_METRICS_ENABLED = True
+PAGE_METRICS_FILENAME = "page_metrics.jsonl"
+
+# === Batch Automation Settings ===
+BATCH_MAX_WORKERS = 4          # Number of clients automated concurrently in a batch run
+BATCH_MAX_WORKERS_LIMIT = 16   # Upper bound to avoid exhausting system resources
+BATCH_LOGIN_PRESTAGE_DEPTH = 1 # Clients kept waiting at a filled login form ahead of the workers (0 disables)
+BATCH_LOGIN_PRESTAGE_LIMIT = 2 # Upper bound; staged CAPTCHAs go stale if they wait too long
+BATCH_DRIVER_POOL_ENABLED = True  # Keep warm browsers for the workers and staged clients of a run
+BATCH_LOGIN_PRESTAGE_MAX_AGE_SECONDS = 180  # Older staged logins are re-staged (fresh form and CAPTCHA) before use
+
 # === GST Portal URLs and Identifiers ===
 GST_PORTAL_BASE_URL = "https://www.gst.gov.in/"
 WELCOME_PAGE_URL_PART = "services.gst.gov.in/services/auth/fowelcome"
+WELCOME_PAGE_URL = "https://" + WELCOME_PAGE_URL_PART
+RETURNS_DASHBOARD_URL_PART = "return.gst.gov.in/returns/auth/dashboard"
+CREDIT_LEDGER_URL_PART = "return.gst.gov.in/returns/auth/ledger/itcledger"
+CREDIT_LEDGER_URL = "https://" + CREDIT_LEDGER_URL_PART
+CASH_LEDGER_URL_PART = "payment.gst.gov.in/payment/auth/ledger/cashledger"
+CASH_LEDGER_URL = "https://" + CASH_LEDGER_URL_PART
+
+# Open the ledgers by loading their URLs directly; the Services > Ledgers
+# menu chain is only used if the direct load does not reach the ledger
+LEDGER_DIRECT_NAVIGATION = True
+
+# When both ledgers are selected, load the cash ledger in a second tab while
+# the credit ledger query runs in the first one
+LEDGER_MULTI_TAB_ENABLED = True
+
+# All portal origins that hold cookies/storage for a logged-in session
+GST_PORTAL_ORIGINS: List[str] = [
+    "https://www.gst.gov.in",
+    "https://services.gst.gov.in",
+    "https://return.gst.gov.in",
+    "https://payment.gst.gov.in",
+]
 
 # Login form field IDs
 LOGIN_FORM_USERNAME_ID = "username"
@@ -122,6 +196,17 @@ PERIODS: List[str] = [
 # Month options for Returns Dashboard (Legacy compatibility)
 MONTHS: List[str] = PERIODS  # Same as periods now
 
+# Months belonging to each quarter (quarter index -> month names)
+QUARTER_MONTHS: Dict[int, List[str]] = {
+    0: ["April", "May", "June"],            # Quarter 1 (Apr-Jun)
+    1: ["July", "August", "September"],     # Quarter 2 (Jul-Sep)
+    2: ["October", "November", "December"], # Quarter 3 (Oct-Dec)
+    3: ["January", "February", "March"]     # Quarter 4 (Jan-Mar)
+}
+
+# Maximum number of consecutive months downloaded in one logged-in session
+MAX_SWEEP_PERIODS = 24
+
 # Default selections (indices)
 DEFAULT_FINANCIAL_YEAR_INDEX = 0  # Current year (2025-26)
 DEFAULT_QUARTER_INDEX = 1         # Second quarter (Jul-Sep) - current
@@ -142,6 +227,25 @@ CHROME_OPTIONS = {
     "maximize_window": True,  # Maximize browser window for better element visibility
 }
 
+# === CAPTCHA Queue ===
+# In batch runs CAPTCHAs are answered in the application window instead of each browser
+CAPTCHA_QUEUE_MAX_ATTEMPTS = 3      # Re-queue a rejected CAPTCHA this many times per client
+CAPTCHA_SUBMIT_TIMEOUT = 20         # Seconds to wait for the portal to accept a submitted CAPTCHA
+CAPTCHA_PANEL_POLL_MS = 200         # How often the CAPTCHA panel checks the queue
+
+# === Session Persistence ===
+# Saved portal cookies let repeat runs skip login and CAPTCHA while the session lives
+SESSION_PERSISTENCE_ENABLED = True
+SESSION_FOLDER_NAME = "gst_sessions"   # Per-client cookie jars (contain login tokens)
+SESSION_MAX_AGE_MINUTES = 20           # Portal sessions expire after inactivity; older jars are ignored
+
+# === WebDriver Pool Configuration ===
+# Pre-warmed Chrome instances reused across clients to avoid cold starts
+WEBDRIVER_POOL_SIZE = 2                     # Number of Chrome instances kept warm
+WEBDRIVER_POOL_MAX_USES = 25                # Recycle an instance after this many clients
+WEBDRIVER_POOL_MAX_MEMORY_GROWTH_MB = 500   # Recycle when Chrome memory grows by more than this
+WEBDRIVER_POOL_ACQUIRE_TIMEOUT = 120        # Seconds to wait for a free instance
+
 # === Web Element Locators ===
 # This section contains all the locators used for finding web elements
 # Organized by functionality for easier maintenance
@@ -159,6 +263,11 @@ class Locators:
         
         # Post-login popup - Updated for current GST portal structure
         POPUP_CLOSE_XPATH = "//*[normalize-space()='Remind me later']"
+        
+        # CAPTCHA image and login submit button (used by the CAPTCHA queue)
+        CAPTCHA_IMAGE_ID = "imgCaptcha"
+        CAPTCHA_IMAGE_CSS = "img[alt*='captcha' i]"
+        SUBMIT_BUTTON_CSS = "button[type='submit']"
     
     # === Returns Dashboard Locators ===
     class ReturnsDashboard:
@@ -217,7 +326,7 @@ class Locators:
         SEARCH_BUTTON_CSS = "button[type='submit']"  # Any submit button
         SEARCH_BUTTON_XPATH_ALT = "//button[normalize-space()='SEARCH']"  # Exact text match
         SEARCH_BUTTON_XPATH_FALLBACK = "//button[contains(text(), 'Search') or contains(text(), 'SEARCH')]"
-    
+        
     # === GSTR-2B Download Locators ===
     class GSTR2B:
         INITIAL_DOWNLOAD_BUTTON_CSS = "button[data-ng-click='offlinepath(x.return_ty)']"
@@ -230,7 +339,7 @@ class Locators:
         LEDGERS_SUBMENU_LINK = "Ledgers"  # Used with By.LINK_TEXT
         
         # Direct credit ledger link from hover menu
-        DIRECT_LINK_XPATH = "//a[@href='//return.gst.gov.in/returns/auth/ledger/itcledger' and normalize-space()='Electronic Credit Ledger']"
+        DIRECT_LINK_XPATH = "//a[@href='//" + CREDIT_LEDGER_URL_PART + "' and normalize-space()='Electronic Credit Ledger']"
         
         # Detailed view link
         DETAILED_LINK_CSS = "a[data-ng-bind='trans.LBL_ELEC_CREDIT_LEDG']"
@@ -241,6 +350,12 @@ class Locators:
         
         # Go button
         GO_BUTTON_CSS = "button[data-ng-click='getdetLdgr()']"
+        
+        # Ledger details table shown after GO: searched only in the panel around
+        # the GO button, and must have these columns ("a|b" = either label)
+        DETAIL_TABLE_ANCHOR_CSS = GO_BUTTON_CSS
+        DETAIL_TABLE_CSS = "table"
+        DETAIL_TABLE_COLUMNS = ["date", "reference", "igst", "cgst", "sgst|utgst"]
     
     # === Electronic Cash Ledger Locators ===
     class CashLedger:
@@ -249,10 +364,18 @@ class Locators:
         LEDGERS_SUBMENU_LINK = "Ledgers"  # Used with By.LINK_TEXT
         
         # Cash ledger specific link (assumed - may need user verification)
-        DIRECT_LINK_XPATH = "//a[@href='//payment.gst.gov.in/payment/auth/ledger/cashledger' and normalize-space()='Electronic Cash Ledger']"
+        DIRECT_LINK_XPATH = "//a[@href='//" + CASH_LEDGER_URL_PART + "' and normalize-space()='Electronic Cash Ledger']"
         
         # Balance details link
         BALANCE_DETAILS_CSS = "a.inverseLink[data-target='#balanceModal']"
+        
+        # Balance details modal opened by the link above
+        BALANCE_MODAL_CSS = "#balanceModal"
+        
+        # Balance table inside the modal: minor heads ("Tax", "Interest", ...) as
+        # columns, or tax types ("Central Tax", ...) in the transposed layout
+        BALANCE_TABLE_CSS = ".modal-body table"
+        BALANCE_TABLE_COLUMNS = ["tax", "penalty|central|cgst"]
 
 # === Status Messages ===
 # Predefined status messages for consistent logging
@@ -277,6 +400,8 @@ class StatusMessages:
     # CAPTCHA handling
     CAPTCHA_PROMPT = "IMPORTANT: Please enter the CAPTCHA in the browser and click Login. You have {timeout} seconds."
     LOGIN_SUCCESS = "Login successful. Navigated to welcome page."
+    SESSION_RESTORED = "Restored saved portal session - login and CAPTCHA skipped."
+    SESSION_EXPIRED = "Saved portal session has expired - logging in again."
     
     # Actions
     RETURNS_DASHBOARD_CLICKED = "Clicked Returns Dashboard button."
@@ -305,4 +430,5 @@ DEFAULT_DATE_FORMAT = "%d-%m-%Y"  # Format for date entry fields
 # === Development and Debug Settings ===
 DEBUG_MODE = False  # Set to True to enable debug features
 SAVE_SCREENSHOTS_ON_ERROR = True  # Save screenshots when errors occur
+COMMAND_PROFILING_ENABLED = True  # Time every WebDriver command and log a per-step report after each run
 SCREENSHOT_PREFIX = "debug_"
\ No newline at end of file
@@ -41,6 +41,7 @@ class ActionSelectionComponent:
         self.download_gstr2b_var = tk.BooleanVar()
         self.access_credit_ledger_var = tk.BooleanVar()
         self.access_cash_ledger_var = tk.BooleanVar()
+        self.skip_existing_downloads_var = tk.BooleanVar()
         
         # Create the UI components
         self._create_ui()
@@ -147,6 +148,24 @@ class ActionSelectionComponent:
         )
         cash_desc.grid(row=4, column=1, padx=(0, 5), pady=5, sticky="w")
         
+        # Skip already downloaded GSTR-2B option
+        self.skip_existing_check = ttk.Checkbutton(
+            self.frame,
+            text="Skip Existing Downloads",
+            variable=self.skip_existing_downloads_var,
+            command=self._on_action_changed
+        )
+        self.skip_existing_check.grid(row=5, column=0, padx=5, pady=5, sticky="w")
+        
+        # Add description for incremental mode
+        skip_desc = ttk.Label(
+            self.frame,
+            text="(Reuse GSTR-2B files already in GST_Downloads)",
+            font=("TkDefaultFont", 8),
+            foreground="gray"
+        )
+        skip_desc.grid(row=5, column=1, padx=(0, 5), pady=5, sticky="w")
+        
         # Configure grid weights for responsive layout
         self.frame.grid_columnconfigure(1, weight=1)
     
@@ -205,7 +224,8 @@ class ActionSelectionComponent:
             returns_dashboard=self.returns_dashboard_var.get(),
             download_gstr2b=self.download_gstr2b_var.get(),
             access_credit_ledger=self.access_credit_ledger_var.get(),
-            access_cash_ledger=self.access_cash_ledger_var.get()
+            access_cash_ledger=self.access_cash_ledger_var.get(),
+            skip_existing_downloads=self.skip_existing_downloads_var.get()
         )
     
     def set_automation_settings(self, settings: AutomationSettings) -> None:
@@ -220,6 +240,7 @@ class ActionSelectionComponent:
         self.download_gstr2b_var.set(settings.download_gstr2b)
         self.access_credit_ledger_var.set(settings.access_credit_ledger)
         self.access_cash_ledger_var.set(settings.access_cash_ledger)
+        self.skip_existing_downloads_var.set(settings.skip_existing_downloads)
         
         # Handle dependencies and notify
         self._handle_action_dependencies()
@@ -314,6 +335,7 @@ class ActionSelectionComponent:
         self.download_gstr2b_check.config(state="normal")
         self.credit_ledger_check.config(state="normal")
         self.cash_ledger_check.config(state="normal")
+        self.skip_existing_check.config(state="normal")
     
     def disable_all_actions(self) -> None:
         """Disable all action checkboxes."""
@@ -321,4 +343,5 @@ class ActionSelectionComponent:
         self.returns_dashboard_check.config(state="disabled")
         self.download_gstr2b_check.config(state="disabled")
         self.credit_ledger_check.config(state="disabled")
-        self.cash_ledger_check.config(state="disabled")
\ No newline at end of file
+        self.cash_ledger_check.config(state="disabled")
+        self.skip_existing_check.config(state="disabled")
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+CAPTCHA panel GUI component for GST Automation Application.
+
+This module provides a panel that shows queued CAPTCHA images from the
+browsers of a batch run, one at a time, and sends the operator's answers
+back to the right browser.
+
+Author: Srinidhi B S
+"""
+import base64
+import tkinter as tk
+from tkinter import ttk
+from typing import Optional, Callable
+
+from config.settings import CAPTCHA_PANEL_POLL_MS
+from services.captcha_queue import CaptchaQueue, CaptchaRequest
+
+class CaptchaPanel:
+    """
+    GUI component for answering queued CAPTCHAs.
+    
+    The panel polls the queue on the Tk event loop; as soon as an answer is
+    submitted the next CAPTCHA is shown, so the operator can keep typing.
+    """
+    
+    def __init__(self, parent: tk.Widget, captcha_queue: CaptchaQueue,
+                 status_callback: Optional[Callable[[str, str], None]] = None):
+        """
+        Initialize the CAPTCHA panel.
+        
+        Args:
+            parent (tk.Widget): Parent widget to contain this component
+            captcha_queue (CaptchaQueue): Queue shared with the batch workers
+            status_callback (Optional[Callable]): Callback for status messages
+        """
+        self.parent = parent
+        self.captcha_queue = captcha_queue
+        self.status_callback = status_callback or self._default_status_callback
+        
+        self.current_request: Optional[CaptchaRequest] = None
+        self._photo: Optional[tk.PhotoImage] = None  # Keep a reference so Tk does not drop the image
+        self._poll_job: Optional[str] = None
+        
+        # Create the UI components
+        self._create_ui()
+    
+    def _default_status_callback(self, message: str, level: str = "INFO") -> None:
+        """Default status callback that does nothing."""
+        pass
+    
+    def _create_ui(self) -> None:
+        """Create the user interface components."""
+        # Main frame for the CAPTCHA panel
+        self.frame = ttk.LabelFrame(self.parent, text="CAPTCHA Queue")
+        
+        # Client name and queue length
+        self.client_label = ttk.Label(self.frame, text="Waiting for CAPTCHAs...")
+        self.client_label.grid(row=0, column=0, columnspan=3, padx=5, pady=5, sticky="w")
+        
+        # CAPTCHA image
+        self.image_label = ttk.Label(self.frame)
+        self.image_label.grid(row=1, column=0, columnspan=3, padx=5, pady=5, sticky="w")
+        
+        # Answer entry
+        ttk.Label(self.frame, text="CAPTCHA:").grid(row=2, column=0, padx=5, pady=5, sticky="w")
+        self.answer_entry = ttk.Entry(self.frame, width=15, state="disabled")
+        self.answer_entry.grid(row=2, column=1, padx=5, pady=5, sticky="w")
+        self.answer_entry.bind("<Return>", self._on_submit)
+        
+        # Submit and skip buttons
+        button_frame = ttk.Frame(self.frame)
+        button_frame.grid(row=2, column=2, padx=5, pady=5, sticky="e")
+        
+        self.submit_button = ttk.Button(button_frame, text="Submit", command=self._on_submit, state="disabled")
+        self.submit_button.pack(side="left", padx=2)
+        
+        self.skip_button = ttk.Button(button_frame, text="Skip", command=self._on_skip, state="disabled")
+        self.skip_button.pack(side="left", padx=2)
+        
+        # Pending count
+        self.pending_label = ttk.Label(
+            self.frame,
+            text="",
+            font=("TkDefaultFont", 8),
+            foreground="gray"
+        )
+        self.pending_label.grid(row=3, column=0, columnspan=3, padx=5, pady=(0, 5), sticky="w")
+        
+        # Configure grid weights
+        self.frame.grid_columnconfigure(1, weight=1)
+    
+    def pack(self, **kwargs) -> None:
+        """Pack the CAPTCHA panel frame."""
+        self.frame.pack(**kwargs)
+    
+    def grid(self, **kwargs) -> None:
+        """Grid the CAPTCHA panel frame."""
+        self.frame.grid(**kwargs)
+    
+    def place(self, **kwargs) -> None:
+        """Place the CAPTCHA panel frame."""
+        self.frame.place(**kwargs)
+    
+    def pack_forget(self) -> None:
+        """Hide the CAPTCHA panel frame."""
+        self.frame.pack_forget()
+    
+    def start(self) -> None:
+        """Start polling the queue for CAPTCHAs."""
+        if self._poll_job is None:
+            self._poll()
+    
+    def stop(self) -> None:
+        """Stop polling and clear the current CAPTCHA."""
+        if self._poll_job is not None:
+            self.frame.after_cancel(self._poll_job)
+            self._poll_job = None
+        self._show_request(None)
+    
+    def _poll(self) -> None:
+        """Show the next CAPTCHA if the operator is idle, then schedule the next poll."""
+        if self.current_request is not None and not self.current_request.is_pending():
+            # The browser stopped waiting (timeout or cancelled run)
+            self.status_callback(f"CAPTCHA for {self.current_request.client_name} expired", "WARNING")
+            self._show_request(None)
+            
+        if self.current_request is None:
+            self._show_request(self.captcha_queue.get_next(timeout=0))
+            
+        pending = self.captcha_queue.get_pending_count()
+        self.pending_label.config(text=f"{pending} more CAPTCHA(s) waiting" if pending else "")
+        self._poll_job = self.frame.after(CAPTCHA_PANEL_POLL_MS, self._poll)
+    
+    def _show_request(self, request: Optional[CaptchaRequest]) -> None:
+        """
+        Display a CAPTCHA request, or the idle state when None.
+        
+        Args:
+            request (Optional[CaptchaRequest]): Request to show
+        """
+        self.current_request = request
+        self.answer_entry.delete(0, tk.END)
+        
+        if request is None:
+            self._photo = None
+            self.image_label.config(image="")
+            self.client_label.config(text="Waiting for CAPTCHAs...")
+            self.answer_entry.config(state="disabled")
+            self.submit_button.config(state="disabled")
+            self.skip_button.config(state="disabled")
+            return
+            
+        try:
+            self._photo = tk.PhotoImage(data=base64.b64encode(request.image_png))
+            self.image_label.config(image=self._photo)
+        except tk.TclError as e:
+            self._photo = None
+            self.image_label.config(image="")
+            self.status_callback(f"Could not display CAPTCHA image: {e}", "ERROR")
+            
+        attempt_text = f" (attempt {request.attempt})" if request.attempt > 1 else ""
+        self.client_label.config(text=f"Client: {request.client_name}{attempt_text}")
+        self.answer_entry.config(state="normal")
+        self.submit_button.config(state="normal")
+        self.skip_button.config(state="normal")
+        self.answer_entry.focus_set()
+    
+    def _on_submit(self, event=None) -> None:
+        """Send the typed answer to the waiting browser and show the next CAPTCHA."""
+        if self.current_request is None:
+            return
+            
+        answer = self.answer_entry.get().strip()
+        if not answer:
+            return
+            
+        self.current_request.submit_answer(answer)
+        self._show_request(self.captcha_queue.get_next(timeout=0))
+    
+    def _on_skip(self) -> None:
+        """Give up on the current CAPTCHA; that client's login fails."""
+        if self.current_request is None:
+            return
+            
+        self.status_callback(f"Skipped CAPTCHA for {self.current_request.client_name}", "WARNING")
+        self.current_request.cancel()
+        self._show_request(self.captcha_queue.get_next(timeout=0))
@@ -11,7 +11,7 @@ from tkinter import ttk
 from typing import Optional, Callable
 
 from config.settings import (
-    FINANCIAL_YEARS, QUARTERS, MONTHS,
+    FINANCIAL_YEARS, QUARTERS, MONTHS, QUARTER_MONTHS, MAX_SWEEP_PERIODS,
     DEFAULT_FINANCIAL_YEAR_INDEX, DEFAULT_QUARTER_INDEX, DEFAULT_MONTH_INDEX
 )
 from models.client_data import ReturnsDashboardOptions
@@ -83,14 +83,29 @@ class ReturnsOptionsComponent:
         )
         self.month_combo.grid(row=2, column=1, padx=5, pady=5, sticky="w")
         
+        # Number of consecutive months to download in one session
+        ttk.Label(self.frame, text="Months to Download:").grid(row=3, column=0, padx=5, pady=5, sticky="w")
+        self.period_count_var = tk.IntVar(value=1)
+        self.period_count_spinbox = ttk.Spinbox(
+            self.frame,
+            from_=1,
+            to=MAX_SWEEP_PERIODS,
+            textvariable=self.period_count_var,
+            state="readonly",
+            width=5,
+            command=self._on_option_changed
+        )
+        self.period_count_spinbox.grid(row=3, column=1, padx=5, pady=5, sticky="w")
+        
         # Add helpful information
         info_label = ttk.Label(
             self.frame,
-            text="These filters will be applied when navigating to Returns Dashboard",
+            text="These filters will be applied when navigating to Returns Dashboard.\n"
+                 "GSTR-2B is downloaded for each month from the selected period onwards.",
             font=("TkDefaultFont", 8),
             foreground="gray"
         )
-        info_label.grid(row=3, column=0, columnspan=2, padx=5, pady=(10, 5), sticky="w")
+        info_label.grid(row=4, column=0, columnspan=2, padx=5, pady=(10, 5), sticky="w")
         
         # Configure grid weights
         self.frame.grid_columnconfigure(1, weight=1)
@@ -138,17 +153,9 @@ class ReturnsOptionsComponent:
         """Update month dropdown options based on selected quarter."""
         selected_quarter_index = self.quarter_combo.current()
         
-        # Define months for each quarter (0-based indexing)
-        quarter_months = {
-            0: ["April", "May", "June"],           # Quarter 1 (Apr-Jun)
-            1: ["July", "August", "September"],    # Quarter 2 (Jul-Sep) 
-            2: ["October", "November", "December"], # Quarter 3 (Oct-Dec)
-            3: ["January", "February", "March"]    # Quarter 4 (Jan-Mar)
-        }
-        
         # Get months for selected quarter, default to all months if invalid
-        if selected_quarter_index in quarter_months:
-            relevant_months = quarter_months[selected_quarter_index]
+        if selected_quarter_index in QUARTER_MONTHS:
+            relevant_months = QUARTER_MONTHS[selected_quarter_index]
         else:
             relevant_months = MONTHS  # Fallback to all months
         
@@ -218,7 +225,8 @@ class ReturnsOptionsComponent:
         return ReturnsDashboardOptions(
             financial_year_index=self.year_combo.current(),
             quarter_index=self.quarter_combo.current(),
-            month_index=self.month_combo.current()
+            month_index=self.month_combo.current(),
+            period_count=self.period_count_var.get()
         )
     
     def set_returns_options(self, options: ReturnsDashboardOptions) -> None:
@@ -239,6 +247,9 @@ class ReturnsOptionsComponent:
             if 0 <= options.month_index < len(MONTHS):
                 self.month_combo.current(options.month_index)
             
+            if 1 <= options.period_count <= MAX_SWEEP_PERIODS:
+                self.period_count_var.set(options.period_count)
+            
             # Notify callback
             self._on_option_changed()
             
@@ -293,7 +304,10 @@ class ReturnsOptionsComponent:
         quarter = self.get_selected_quarter()
         month = self.get_selected_month()
         
-        return f"FY: {year}, {quarter}, Month: {month}"
+        summary = f"FY: {year}, {quarter}, Month: {month}"
+        if self.period_count_var.get() > 1:
+            summary += f" (+{self.period_count_var.get() - 1} following months)"
+        return summary
     
     def validate_selections(self) -> tuple[bool, str]:
         """
@@ -321,6 +335,7 @@ class ReturnsOptionsComponent:
     def reset_to_defaults(self) -> None:
         """Reset all selections to default values."""
         self._set_default_values()
+        self.period_count_var.set(1)
         self._on_option_changed()
     
     def set_financial_year_by_name(self, year_name: str) -> bool:
@@ -382,9 +397,11 @@ class ReturnsOptionsComponent:
         self.year_combo.config(state="readonly")
         self.quarter_combo.config(state="readonly")
         self.month_combo.config(state="readonly")
+        self.period_count_spinbox.config(state="readonly")
     
     def disable_all_options(self) -> None:
         """Disable all option dropdowns."""
         self.year_combo.config(state="disabled")
         self.quarter_combo.config(state="disabled")
-        self.month_combo.config(state="disabled")
\ No newline at end of file
+        self.month_combo.config(state="disabled")
+        self.period_count_spinbox.config(state="disabled")
\ No newline at end of file
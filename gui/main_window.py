@@ -27,6 +27,8 @@ from models.client_data import (
 # Import services
 from services.gst_portal_service import GSTPortalService
 from services.chromedriver_service import ChromeDriverService
+from services.batch_automation_service import BatchAutomationService, BatchConfigurationError
+from services.captcha_queue import CaptchaQueue
 
 # Import GUI components
 from gui.components.status_logger import StatusLogger
@@ -35,6 +37,7 @@ from gui.components.credentials_form import CredentialsForm
 from gui.components.action_selection import ActionSelectionComponent
 from gui.components.returns_options import ReturnsOptionsComponent
 from gui.components.credit_ledger_options import CreditLedgerOptionsComponent
+from gui.components.captcha_panel import CaptchaPanel
 
 class MainWindow:
     """
@@ -66,6 +69,10 @@ class MainWindow:
         # Keep reference to GST service to prevent garbage collection
         self.current_gst_service = None
         
+        # Batch runs answer login CAPTCHAs through a shared queue shown in the window
+        self.captcha_queue = CaptchaQueue()
+        self.current_batch_service: Optional[BatchAutomationService] = None
+        
         # Create GUI components
         self._create_components()
         
@@ -108,6 +115,13 @@ class MainWindow:
         # Status logger (create first as other components may need to log)
         self.status_logger = StatusLogger(self.right_frame, height=15)
         
+        # CAPTCHA panel for batch runs (shown only while a batch is running)
+        self.captcha_panel = CaptchaPanel(
+            self.right_frame,
+            self.captcha_queue,
+            status_callback=self.status_logger.log_message
+        )
+        
         # Client selection component
         self.client_selection = ClientSelectionComponent(
             self.left_frame,
@@ -161,6 +175,23 @@ class MainWindow:
         )
         self.start_button.pack(side="left", padx=5)
         
+        # Start batch button (all loaded clients, CAPTCHAs answered in this window)
+        self.start_batch_button = ttk.Button(
+            self.control_frame,
+            text="Start Batch",
+            command=self._start_batch_thread
+        )
+        self.start_batch_button.pack(side="left", padx=5)
+        
+        # Cancel batch button (enabled only while a batch is running)
+        self.cancel_batch_button = ttk.Button(
+            self.control_frame,
+            text="Cancel Batch",
+            command=self._cancel_batch,
+            state="disabled"
+        )
+        self.cancel_batch_button.pack(side="left", padx=5)
+        
         # Clear log button
         self.clear_log_button = ttk.Button(
             self.control_frame,
@@ -448,6 +479,118 @@ class MainWindow:
             # Re-enable start button
             self.root.after(0, self._reset_start_button)
     
+    def _start_batch_thread(self) -> None:
+        """Start a batch run for all loaded clients in a separate thread."""
+        client_manager = self.client_selection.client_manager
+        if client_manager.get_client_count() == 0:
+            messagebox.showerror("Configuration Error", "Load clients from Excel before starting a batch run.")
+            return
+        
+        # Validate actions and options (credentials come from each client)
+        if not self.current_automation_settings.has_actions_selected():
+            messagebox.showerror("Configuration Error", "At least one automation action must be selected.")
+            return
+        if self.action_selection.requires_returns_dashboard_options():
+            is_valid, error = self.returns_options.validate_selections()
+            if not is_valid:
+                messagebox.showerror("Configuration Error", f"Returns Dashboard options invalid: {error}")
+                return
+        if self.action_selection.requires_credit_ledger_options():
+            is_valid, error = self.credit_ledger_options.validate_date_range()
+            if not is_valid:
+                messagebox.showerror("Configuration Error", f"Credit Ledger options invalid: {error}")
+                return
+        
+        template = AutomationConfig(
+            credentials=ClientCredentials(client_name="", username="", password=""),
+            automation_settings=self.current_automation_settings,
+            returns_options=self.current_returns_options,
+            credit_ledger_options=self.current_credit_ledger_options
+        )
+        
+        # Create the service here so Cancel works from the moment it is enabled
+        try:
+            self.current_batch_service = BatchAutomationService(
+                status_callback=self.status_logger.log_info,
+                captcha_queue=self.captcha_queue
+            )
+        except BatchConfigurationError as e:
+            messagebox.showerror("Configuration Error", str(e))
+            return
+            
+        # Disable start buttons to prevent overlapping runs; the batch can be cancelled instead
+        self.start_button.config(state="disabled")
+        self.start_batch_button.config(state="disabled")
+        self.start_batch_button.config(text="Batch Running...")
+        self.cancel_batch_button.config(state="normal")
+        
+        # Show the CAPTCHA panel above the log and start serving CAPTCHAs
+        self.captcha_panel.pack(fill="x", pady=(0, 10), before=self.status_logger.frame)
+        self.captcha_panel.start()
+        
+        self.status_logger.log_info(f"Starting batch run for {client_manager.get_client_count()} clients")
+        batch_thread = threading.Thread(
+            target=self._run_batch,
+            args=(client_manager, template),
+            daemon=True
+        )
+        batch_thread.start()
+    
+    def _run_batch(self, client_manager, template: AutomationConfig) -> None:
+        """
+        Run the batch process in a separate thread.
+        
+        Args:
+            client_manager (ClientDataManager): Loaded clients to run
+            template (AutomationConfig): Settings and options applied to every client
+        """
+        try:
+            summary = self.current_batch_service.run_batch(client_manager, template)
+            
+            for line in summary.get_summary().splitlines():
+                self.status_logger.log_info(line)
+            if summary.failed_count:
+                self.status_logger.log_warning(f"Batch finished with {summary.failed_count} failed client(s).")
+            else:
+                self.status_logger.log_success("Batch run completed successfully!")
+        
+        except Exception as e:
+            error_message = f"Batch run failed with error: {str(e)}"
+            self.status_logger.log_error(error_message)
+            self.root.after(0, lambda: messagebox.showerror("Batch Error", error_message))
+            
+        finally:
+            self.current_batch_service = None
+            self.root.after(0, self._on_batch_finished)
+    
+    def _on_batch_finished(self) -> None:
+        """Hide the CAPTCHA panel and re-enable the start buttons (called from main thread)."""
+        self.captcha_panel.stop()
+        self.captcha_panel.pack_forget()
+        self._reset_start_button()
+        self.start_batch_button.config(state="normal")
+        self.start_batch_button.config(text="Start Batch")
+        self.cancel_batch_button.config(state="disabled")
+        self.cancel_batch_button.config(text="Cancel Batch")
+    
+    def _cancel_batch(self) -> None:
+        """
+        Cancel the running batch.
+        
+        Clients that have not started are skipped and open browsers are
+        closed; the batch summary is logged once the run has wound down.
+        """
+        batch_service = self.current_batch_service
+        if not batch_service:
+            return
+            
+        self.cancel_batch_button.config(state="disabled")
+        self.cancel_batch_button.config(text="Cancelling...")
+        self.status_logger.log_warning("Cancelling batch run...")
+        
+        # Closing the browsers can take a while; keep the window responsive
+        threading.Thread(target=batch_service.cancel, daemon=True).start()
+    
     def _close_browser(self) -> None:
         """
         Manually close the browser if it's open.
@@ -586,6 +729,13 @@ Note: This tool requires manual CAPTCHA entry during login.
         try:
             self.status_logger.log_info("Application shutting down...")
             
+            # Stop a running batch and release its browsers
+            if self.current_batch_service:
+                try:
+                    self.current_batch_service.cancel()
+                except:
+                    pass  # Ignore errors while shutting down
+            
             # Close browser if it's still open
             if self.current_gst_service:
                 try:
@@ -0,0 +1,197 @@
+"""
+Batch run result models for GST Automation Application.
+
+This module defines data classes for recording the outcome of multi-client
+batch automation runs, including per-client results and overall throughput.
+
+Author: Srinidhi B S
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional
+import time
+
+from services.download_tracker import DownloadResult
+from services.ledger_extraction import CashLedgerBalance
+from services.workflow_plan import WorkflowPlan
+
+@dataclass
+class PeriodRunResult:
+    """
+    Outcome of downloading one return period within a client run.
+    
+    Attributes:
+        period_label (str): Month and financial year (e.g. "August 2025-26")
+        success (bool): True if a file is available for the period
+        download (Optional[DownloadResult]): The downloaded or reused file
+        reused (bool): True if an existing file was reused without visiting the portal
+        duration_seconds (float): Time spent on this period
+        error (Optional[str]): Error message if the period failed
+    """
+    period_label: str
+    success: bool = False
+    download: Optional[DownloadResult] = None
+    reused: bool = False
+    duration_seconds: float = 0.0
+    error: Optional[str] = None
+    
+    def __str__(self) -> str:
+        """
+        String representation of the period result.
+        
+        Returns:
+            str: One-line summary of the period outcome
+        """
+        if self.reused:
+            return f"{self.period_label}: reused existing file"
+        status = "OK" if self.success else "FAILED"
+        text = f"{self.period_label}: {status} in {self.duration_seconds:.1f}s"
+        if self.error:
+            text += f" ({self.error})"
+        return text
+
+@dataclass
+class ClientRunResult:
+    """
+    Outcome of the automation workflow for a single client in a batch run.
+    
+    Attributes:
+        client_name (str): The display name of the client
+        success (bool): True if the workflow completed successfully
+        started_at (float): Epoch timestamp when the client run started
+        finished_at (float): Epoch timestamp when the client run finished
+        error (Optional[str]): Error message if the run failed
+        downloads (List[DownloadResult]): Files downloaded and filed for this client
+        reused_downloads (List[DownloadResult]): Existing files reused instead of downloading
+        period_results (List[PeriodRunResult]): Per-period GSTR-2B outcomes
+        cash_balance (Optional[CashLedgerBalance]): Cash ledger balance, if it was read
+        workflow_plan (Optional[WorkflowPlan]): Steps run for this client, with their timings
+    """
+    client_name: str
+    success: bool = False
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    error: Optional[str] = None
+    downloads: List[DownloadResult] = field(default_factory=list)
+    reused_downloads: List[DownloadResult] = field(default_factory=list)
+    period_results: List[PeriodRunResult] = field(default_factory=list)
+    cash_balance: Optional[CashLedgerBalance] = None
+    workflow_plan: Optional[WorkflowPlan] = None
+    
+    @property
+    def duration_seconds(self) -> float:
+        """
+        Get the wall-clock duration of this client run.
+        
+        Returns:
+            float: Duration in seconds (0 if the run never finished)
+        """
+        if not self.finished_at or not self.started_at:
+            return 0.0
+        return self.finished_at - self.started_at
+    
+    def __str__(self) -> str:
+        """
+        String representation of the client result.
+        
+        Returns:
+            str: One-line summary of the client outcome
+        """
+        status = "OK" if self.success else "FAILED"
+        text = f"{self.client_name}: {status} in {self.duration_seconds:.1f}s"
+        if self.error:
+            text += f" ({self.error})"
+        return text
+
+@dataclass
+class BatchRunSummary:
+    """
+    Aggregated outcome of a multi-client batch run.
+    
+    Attributes:
+        worker_count (int): Number of concurrent workers used
+        started_at (float): Epoch timestamp when the batch started
+        finished_at (float): Epoch timestamp when the batch finished
+        results (List[ClientRunResult]): Per-client results in completion order
+        cancelled (bool): True if the batch was cancelled before finishing
+        cash_balance_report (Optional[str]): Consolidated cash ledger balance file, if written
+    """
+    worker_count: int
+    started_at: float = field(default_factory=time.time)
+    finished_at: float = 0.0
+    results: List[ClientRunResult] = field(default_factory=list)
+    cancelled: bool = False
+    cash_balance_report: Optional[str] = None
+    
+    @property
+    def total_clients(self) -> int:
+        """Number of clients that produced a result."""
+        return len(self.results)
+    
+    @property
+    def successful_count(self) -> int:
+        """Number of clients whose workflow succeeded."""
+        return sum(1 for result in self.results if result.success)
+    
+    @property
+    def failed_count(self) -> int:
+        """Number of clients whose workflow failed."""
+        return self.total_clients - self.successful_count
+    
+    @property
+    def duration_seconds(self) -> float:
+        """Wall-clock duration of the whole batch in seconds."""
+        end_time = self.finished_at or time.time()
+        return max(end_time - self.started_at, 0.0)
+    
+    @property
+    def throughput_per_hour(self) -> float:
+        """
+        Get the batch throughput in clients per hour.
+        
+        Returns:
+            float: Completed clients per hour of wall-clock time
+        """
+        if self.duration_seconds <= 0:
+            return 0.0
+        return self.total_clients * 3600.0 / self.duration_seconds
+    
+    def get_cash_balances(self) -> List[CashLedgerBalance]:
+        """
+        Get the cash ledger balances read during the batch.
+        
+        Returns:
+            List[CashLedgerBalance]: One balance per client that had it read
+        """
+        return [result.cash_balance for result in self.results if result.cash_balance]
+    
+    def get_failed_results(self) -> List[ClientRunResult]:
+        """
+        Get the results of all clients that failed.
+        
+        Returns:
+            List[ClientRunResult]: Failed client results
+        """
+        return [result for result in self.results if not result.success]
+    
+    def get_summary(self) -> str:
+        """
+        Get a human-readable summary of the batch run.
+        
+        Returns:
+            str: Multi-line summary with counts and throughput
+        """
+        lines = [
+            f"Batch run {'cancelled' if self.cancelled else 'finished'}: "
+            f"{self.successful_count}/{self.total_clients} clients succeeded "
+            f"using {self.worker_count} workers",
+            f"Total time: {self.duration_seconds:.1f}s, "
+            f"throughput: {self.throughput_per_hour:.1f} clients/hour"
+        ]
+        reused_count = sum(len(result.reused_downloads) for result in self.results)
+        if reused_count:
+            lines.append(f"Reused {reused_count} existing download(s) without visiting the portal")
+        if self.cash_balance_report:
+            lines.append(f"Cash ledger balances saved to {self.cash_balance_report}")
+        for result in self.get_failed_results():
+            lines.append(f"  - {result}")
+        return "\n".join(lines)
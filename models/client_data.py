@@ -7,9 +7,12 @@ and automation settings throughout the application.
 Author: Srinidhi B S
 """
 from dataclasses import dataclass
-from typing import Dict, Optional, Any
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Any, Tuple
 import time
 
+from config.settings import FINANCIAL_YEARS, QUARTER_MONTHS, DEFAULT_DATE_FORMAT
+
 @dataclass
 class ClientCredentials:
     """
@@ -63,12 +66,15 @@ class AutomationSettings:
         download_gstr2b (bool): If True, download GSTR-2B report
         access_credit_ledger (bool): If True, access Electronic Credit Ledger
         access_cash_ledger (bool): If True, access Electronic Cash Ledger
+        skip_existing_downloads (bool): If True, reuse GSTR-2B files already in the
+            download manifest instead of downloading them again
     """
     just_login: bool = False
     returns_dashboard: bool = False
     download_gstr2b: bool = False
     access_credit_ledger: bool = False
     access_cash_ledger: bool = False
+    skip_existing_downloads: bool = False
     
     def has_actions_selected(self) -> bool:
         """
@@ -95,6 +101,15 @@ class AutomationSettings:
             bool: True if Returns Dashboard access is needed
         """
         return self.returns_dashboard or self.download_gstr2b
+    
+    def requires_ledgers(self) -> bool:
+        """
+        Check if any Electronic Ledger action is selected.
+        
+        Returns:
+            bool: True if the Credit or Cash Ledger must be accessed
+        """
+        return self.access_credit_ledger or self.access_cash_ledger
 
 @dataclass
 class ReturnsDashboardOptions:
@@ -108,23 +123,105 @@ class ReturnsDashboardOptions:
         financial_year_index (int): Index of selected financial year
         quarter_index (int): Index of selected quarter
         month_index (int): Index of selected month/period
+        period_count (int): Number of consecutive months to process, starting
+            at the selected month (1 = only the selected month)
     """
     financial_year_index: int = 0  # Default to first option
     quarter_index: int = 0         # Default to first quarter
     month_index: int = 0           # Default to first month
+    period_count: int = 1          # Default to a single month
     
     def is_valid(self) -> bool:
         """
-        Validate that all indices are non-negative.
+        Validate that all indices are non-negative and the period count is positive.
         
         Returns:
-            bool: True if all indices are valid (>= 0)
+            bool: True if all indices are valid (>= 0) and period_count >= 1
         """
         return (
             self.financial_year_index >= 0 and
             self.quarter_index >= 0 and
-            self.month_index >= 0
+            self.month_index >= 0 and
+            self.period_count >= 1
+        )
+    
+    def get_period_ordinal(self) -> int:
+        """
+        Get the chronological position of the selected month.
+        
+        Month 0 is April of the oldest financial year in FINANCIAL_YEARS.
+        
+        Returns:
+            int: Months since the start of the oldest financial year
+        """
+        year_position = len(FINANCIAL_YEARS) - 1 - self.financial_year_index
+        return year_position * 12 + self.quarter_index * 3 + self.month_index
+    
+    @classmethod
+    def from_period_ordinal(cls, ordinal: int) -> 'ReturnsDashboardOptions':
+        """
+        Create single-month options from a chronological month position.
+        
+        Args:
+            ordinal (int): Value returned by get_period_ordinal()
+            
+        Returns:
+            ReturnsDashboardOptions: Options selecting that month
+        """
+        year_position, month_of_year = divmod(ordinal, 12)
+        return cls(
+            financial_year_index=len(FINANCIAL_YEARS) - 1 - year_position,
+            quarter_index=month_of_year // 3,
+            month_index=month_of_year % 3
         )
+    
+    def get_periods(self) -> List['ReturnsDashboardOptions']:
+        """
+        Expand the selection into one single-month option per period.
+        
+        Periods run forward in time from the selected month and stop at the
+        last month of the newest financial year.
+        
+        Returns:
+            List[ReturnsDashboardOptions]: Single-month options in chronological order
+        """
+        start = self.get_period_ordinal()
+        end = min(start + self.period_count, len(FINANCIAL_YEARS) * 12)
+        return [ReturnsDashboardOptions.from_period_ordinal(ordinal) for ordinal in range(start, end)]
+    
+    def get_financial_year_label(self) -> str:
+        """
+        Get the selected financial year as shown on the portal.
+        
+        Returns:
+            str: Financial year label (e.g. "2025-26"), empty if index is out of range
+        """
+        if 0 <= self.financial_year_index < len(FINANCIAL_YEARS):
+            return FINANCIAL_YEARS[self.financial_year_index]
+        return ""
+    
+    def get_period_label(self) -> str:
+        """
+        Get the selected return period (month) name.
+        
+        The month index is relative to the selected quarter.
+        
+        Returns:
+            str: Month name (e.g. "August"), empty if indices are out of range
+        """
+        months = QUARTER_MONTHS.get(self.quarter_index, [])
+        if 0 <= self.month_index < len(months):
+            return months[self.month_index]
+        return ""
+    
+    def get_display_label(self) -> str:
+        """
+        Get a short label for the selected month.
+        
+        Returns:
+            str: Month and financial year (e.g. "August 2025-26")
+        """
+        return f"{self.get_period_label()} {self.get_financial_year_label()}"
 
 @dataclass
 class CreditLedgerOptions:
@@ -157,6 +254,53 @@ class CreditLedgerOptions:
         """
         return bool(self.from_date.strip()) and bool(self.to_date.strip())
 
+    def get_date_range(self) -> Tuple[date, date]:
+        """
+        Parse the date range.
+        
+        Returns:
+            Tuple[date, date]: From and to dates
+            
+        Raises:
+            ValueError: If a date is not in DD-MM-YYYY format
+        """
+        return (
+            datetime.strptime(self.from_date.strip(), DEFAULT_DATE_FORMAT).date(),
+            datetime.strptime(self.to_date.strip(), DEFAULT_DATE_FORMAT).date()
+        )
+    
+    def split(self, max_span_days: int) -> List['CreditLedgerOptions']:
+        """
+        Split the range into windows the portal accepts in a single query.
+        
+        Each window stays inside one financial year (April to March) and
+        spans at most max_span_days. Ranges that cannot be parsed or run
+        backwards are returned unchanged for the portal to reject.
+        
+        Args:
+            max_span_days (int): Longest allowed window in days
+            
+        Returns:
+            List[CreditLedgerOptions]: Consecutive windows covering the range
+        """
+        try:
+            start, end = self.get_date_range()
+        except ValueError:
+            return [self]
+        if start > end:
+            return [self]
+            
+        windows = []
+        while start <= end:
+            financial_year_end = date(start.year + 1 if start.month >= 4 else start.year, 3, 31)
+            window_end = min(end, financial_year_end, start + timedelta(days=max_span_days - 1))
+            windows.append(CreditLedgerOptions(
+                from_date=start.strftime(DEFAULT_DATE_FORMAT),
+                to_date=window_end.strftime(DEFAULT_DATE_FORMAT)
+            ))
+            start = window_end + timedelta(days=1)
+        return windows
+
 @dataclass
 class AutomationConfig:
     """
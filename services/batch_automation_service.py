@@ -0,0 +1,483 @@
+"""
+Multi-client batch automation service for GST Automation Application.
+
+This module runs the GST portal automation workflow for many clients at once,
+using a pool of independent GSTPortalService workers, and reports per-client
+results and overall throughput.
+
+Author: Srinidhi B S
+"""
+import os
+import time
+import logging
+import threading
+from dataclasses import replace
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional
+
+from services.gst_portal_service import GSTPortalService
+from services.webdriver_pool import WebDriverPool
+from services.download_layout import DownloadLayout
+from services.session_store import SessionStore
+from services.captcha_queue import CaptchaQueue
+from services.ledger_extraction import write_cash_balance_report
+from config.settings import (
+    BATCH_MAX_WORKERS, BATCH_MAX_WORKERS_LIMIT, BATCH_LOGIN_PRESTAGE_DEPTH,
+    BATCH_LOGIN_PRESTAGE_LIMIT, BATCH_DRIVER_POOL_ENABLED, SESSION_PERSISTENCE_ENABLED, WAIT_POLL_INTERVAL,
+    CASH_BALANCE_REPORT_PREFIX
+)
+from models.client_data import AutomationConfig, ClientDataManager
+from models.batch_results import ClientRunResult, BatchRunSummary
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+class BatchConfigurationError(Exception):
+    """Custom exception for invalid batch run configuration."""
+    pass
+
+class BatchAutomationService:
+    """
+    Service class for running the automation workflow across many clients.
+    
+    Each client gets its own GSTPortalService (and therefore its own Chrome
+    instance). Workers run on a thread pool: the heavy lifting happens in the
+    chromedriver/Chrome processes, so threads are sufficient and let workers
+    share the status callback with the GUI.
+    
+    Workers borrow pre-warmed browsers from a WebDriverPool instead of
+    starting Chrome for every client: the supplied pool, or one the batch
+    starts for the run (BATCH_DRIVER_POOL_ENABLED). When a CaptchaQueue is
+    supplied, login CAPTCHAs are answered in the application window.
+    
+    Logins are pipelined: while the workers are busy, up to prestage_depth
+    upcoming clients are started and left at a filled-in login form, so a
+    worker that frees up only has the CAPTCHA left to do for its next client.
+    """
+    
+    def __init__(self, max_workers: int = BATCH_MAX_WORKERS,
+                 status_callback: Optional[Callable[[str], None]] = None,
+                 headless: bool = False,
+                 driver_pool: Optional[WebDriverPool] = None,
+                 captcha_queue: Optional[CaptchaQueue] = None,
+                 prestage_depth: int = BATCH_LOGIN_PRESTAGE_DEPTH):
+        """
+        Initialize the batch automation service.
+        
+        Args:
+            max_workers (int): Number of clients to automate concurrently
+            status_callback (Optional[Callable[[str], None]]): Callback function for status updates
+            headless (bool): If True, run browsers in headless mode
+            driver_pool (Optional[WebDriverPool]): Pool of pre-warmed drivers shared by the workers
+            captcha_queue (Optional[CaptchaQueue]): Shared queue the operator answers CAPTCHAs from
+            prestage_depth (int): Upcoming clients to keep staged at the login form, 0 to disable
+            
+        Raises:
+            BatchConfigurationError: If the worker count or pre-stage depth is out of range
+        """
+        if not 1 <= max_workers <= BATCH_MAX_WORKERS_LIMIT:
+            raise BatchConfigurationError(
+                f"Worker count must be between 1 and {BATCH_MAX_WORKERS_LIMIT}, got {max_workers}"
+            )
+        if not 0 <= prestage_depth <= BATCH_LOGIN_PRESTAGE_LIMIT:
+            raise BatchConfigurationError(
+                f"Login pre-stage depth must be between 0 and {BATCH_LOGIN_PRESTAGE_LIMIT}, got {prestage_depth}"
+            )
+            
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers
+        self.prestage_depth = prestage_depth
+        self.status_callback = status_callback or self._default_status_callback
+        self.headless = headless
+        self.driver_pool = driver_pool
+        self.captcha_queue = captcha_queue
+        self.download_layout = DownloadLayout()  # Shared so manifest writes are serialized
+        self.session_store = SessionStore() if SESSION_PERSISTENCE_ENABLED else None
+        self._cancel_event = threading.Event()
+        self._active_services: List[GSTPortalService] = []
+        self._services_lock = threading.Lock()
+        self._stage_slots: Optional[threading.Semaphore] = None
+        self._owned_driver_pool: Optional[WebDriverPool] = None  # Pool created by run_configs()
+    
+    def _default_status_callback(self, message: str) -> None:
+        """Default status callback that just logs the message."""
+        self.logger.info(message)
+    
+    def _log_status(self, message: str) -> None:
+        """Log status message and call status callback."""
+        self.logger.info(message)
+        if self.status_callback:
+            self.status_callback(message)
+    
+    def build_client_configs(self, client_manager: ClientDataManager,
+                             template: AutomationConfig,
+                             client_names: Optional[List[str]] = None) -> List[AutomationConfig]:
+        """
+        Build one automation configuration per client from a template.
+        
+        Args:
+            client_manager (ClientDataManager): Loaded client credentials
+            template (AutomationConfig): Configuration whose settings and options
+                are applied to every client (its credentials are ignored)
+            client_names (Optional[List[str]]): Subset of clients to run, None for all
+            
+        Returns:
+            List[AutomationConfig]: Per-client configurations in run order
+            
+        Raises:
+            BatchConfigurationError: If a requested client is unknown or no clients remain
+        """
+        names = client_names if client_names is not None else client_manager.get_all_client_names()
+        
+        configs = []
+        for name in names:
+            client = client_manager.get_client(name)
+            if client is None:
+                raise BatchConfigurationError(f"Client '{name}' not found in loaded client data")
+            configs.append(replace(template, credentials=client))
+            
+        if not configs:
+            raise BatchConfigurationError("No clients selected for batch run")
+            
+        invalid = [config.credentials.client_name for config in configs if not config.is_valid()]
+        if invalid:
+            raise BatchConfigurationError(
+                f"Invalid automation configuration for: {', '.join(invalid)}"
+            )
+            
+        return configs
+    
+    def run_batch(self, client_manager: ClientDataManager,
+                  template: AutomationConfig,
+                  client_names: Optional[List[str]] = None) -> BatchRunSummary:
+        """
+        Run the automation workflow for many clients concurrently.
+        
+        Args:
+            client_manager (ClientDataManager): Loaded client credentials
+            template (AutomationConfig): Settings and options applied to every client
+            client_names (Optional[List[str]]): Subset of clients to run, None for all
+            
+        Returns:
+            BatchRunSummary: Per-client results and overall throughput
+        """
+        configs = self.build_client_configs(client_manager, template, client_names)
+        return self.run_configs(configs)
+    
+    def run_configs(self, configs: List[AutomationConfig]) -> BatchRunSummary:
+        """
+        Run the automation workflow for a prepared list of configurations.
+        
+        Args:
+            configs (List[AutomationConfig]): One configuration per client
+            
+        Returns:
+            BatchRunSummary: Per-client results and overall throughput
+        """
+        self._cancel_event.clear()
+        worker_count = min(self.max_workers, len(configs))
+        summary = BatchRunSummary(worker_count=worker_count)
+        
+        self._log_status(f"Starting batch run for {len(configs)} clients with {worker_count} workers...")
+        
+        # Borrow warm browsers for every worker plus the staged clients waiting for one
+        owns_pool = self._open_driver_pool(worker_count)
+        try:
+            # The first round starts right away; later clients are staged while they wait for a worker
+            staged_services = [None] * worker_count + self._start_login_stager(configs[worker_count:])
+        
+            with ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="gst-batch") as executor:
+                futures = {
+                    executor.submit(self._run_single_client, config, staged_services[index]): config
+                    for index, config in enumerate(configs)
+                }
+            
+                for future in as_completed(futures):
+                    config = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # _run_single_client catches everything; this is a safety net
+                        result = ClientRunResult(
+                            client_name=config.credentials.client_name,
+                            error=f"Unexpected worker error: {str(e)}"
+                        )
+                        
+                    if result is None:
+                        continue  # Skipped because the batch was cancelled
+                        
+                    summary.results.append(result)
+                    self._log_status(
+                        f"[{len(summary.results)}/{len(configs)}] {result}"
+                    )
+                    
+        finally:
+            if owns_pool:
+                self._close_driver_pool()
+                
+        summary.finished_at = time.time()
+        summary.cancelled = self._cancel_event.is_set()
+        self._write_cash_balance_report(summary)
+        self._log_status(summary.get_summary())
+        return summary
+    
+    def _open_driver_pool(self, worker_count: int) -> bool:
+        """
+        Start a warm WebDriver pool for this run unless one was supplied.
+        
+        The pool holds a browser for every worker plus every pre-staged
+        client, so staging never starves the workers of a browser.
+        
+        Args:
+            worker_count (int): Number of workers in this run
+            
+        Returns:
+            bool: True if the batch created the pool and must shut it down
+        """
+        if self.driver_pool is not None or not BATCH_DRIVER_POOL_ENABLED:
+            return False
+            
+        self.driver_pool = WebDriverPool(
+            size=worker_count + self.prestage_depth,
+            headless=self.headless,
+            status_callback=self._log_status
+        )
+        self._owned_driver_pool = self.driver_pool
+        try:
+            self.driver_pool.warm_up()
+        except Exception as e:
+            # Missing instances are started on demand by acquire()
+            self.logger.warning(f"WebDriver pool warm-up incomplete: {e}")
+        return True
+    
+    def _close_driver_pool(self) -> None:
+        """Shut down the WebDriver pool this batch created, if it is still open."""
+        pool = self._owned_driver_pool
+        self._owned_driver_pool = None
+        if pool is None:
+            return
+            
+        if self.driver_pool is pool:
+            self.driver_pool = None
+        try:
+            pool.shutdown()
+        except Exception as e:
+            self.logger.warning(f"Error shutting down WebDriver pool: {e}")
+    
+    def _create_service(self, client_name: str) -> GSTPortalService:
+        """
+        Create a portal service for one client and register it for cancellation.
+        
+        Args:
+            client_name (str): Client the service works for (prefixes its status messages)
+            
+        Returns:
+            GSTPortalService: Service sharing the batch's layout, sessions and CAPTCHA queue
+        """
+        def client_status(message: str) -> None:
+            self.status_callback(f"[{client_name}] {message}")
+            
+        service = GSTPortalService(
+            status_callback=client_status,
+            headless=self.headless,
+            driver_pool=self.driver_pool,
+            download_layout=self.download_layout,
+            session_store=self.session_store,
+            captcha_queue=self.captcha_queue
+        )
+        with self._services_lock:
+            self._active_services.append(service)
+        return service
+    
+    def _start_login_stager(self, configs: List[AutomationConfig]) -> List[Optional[Future]]:
+        """
+        Start pre-staging client logins in run order on a background thread.
+        
+        A client is staged only while fewer than prestage_depth staged clients
+        are waiting for a worker, which bounds the number of extra browsers.
+        
+        Args:
+            configs (List[AutomationConfig]): One configuration per client, in run order
+            
+        Returns:
+            List[Optional[Future]]: Per-client futures resolving to the staged
+                GSTPortalService (None if cancelled); all None if staging is disabled
+        """
+        if self.prestage_depth == 0 or not configs:
+            return [None] * len(configs)
+            
+        staged_services = [Future() for _ in configs]
+        self._stage_slots = threading.Semaphore(self.prestage_depth)
+        
+        def stage_all() -> None:
+            with ThreadPoolExecutor(max_workers=self.prestage_depth, thread_name_prefix="gst-stage") as stagers:
+                for config, staged in zip(configs, staged_services):
+                    while not self._stage_slots.acquire(timeout=WAIT_POLL_INTERVAL):
+                        if self._cancel_event.is_set():
+                            break
+                    if self._cancel_event.is_set():
+                        break
+                    stagers.submit(self._stage_client, config, staged)
+                    
+            # Release workers still waiting for clients that were never staged
+            for staged in staged_services:
+                if not staged.done():
+                    staged.set_result(None)
+                    
+        threading.Thread(target=stage_all, name="gst-login-stager", daemon=True).start()
+        return staged_services
+    
+    def _stage_client(self, config: AutomationConfig, staged: Future) -> None:
+        """
+        Pre-stage one client's login (executed on a stager thread).
+        
+        Staging failures are not fatal: the worker redoes the login from scratch.
+        The future is always resolved, so the worker never waits on a failed stage.
+        
+        Args:
+            config (AutomationConfig): Configuration for this client
+            staged (Future): Future that receives the staged service
+        """
+        client_name = config.credentials.client_name
+        service = None
+        try:
+            service = self._create_service(client_name)
+            service.prestage_login(config.credentials)
+        except Exception as e:
+            self.logger.warning(f"Pre-staging login for {client_name} failed, worker will retry: {e}")
+            if service is None:
+                # No staged service will occupy the slot; the worker starts its own
+                self._stage_slots.release()
+        finally:
+            staged.set_result(service)
+    
+    def _take_staged_service(self, staged: Future) -> Optional[GSTPortalService]:
+        """
+        Wait for a client's staged service and free its staging slot.
+        
+        Args:
+            staged (Future): Future filled by the login stager
+            
+        Returns:
+            Optional[GSTPortalService]: The staged service, None if the batch was cancelled first
+        """
+        service = staged.result()
+        if service is not None:
+            self._stage_slots.release()
+        return service
+    
+    def _run_single_client(self, config: AutomationConfig,
+                           staged: Optional[Future] = None) -> Optional[ClientRunResult]:
+        """
+        Run the automation workflow for one client (executed on a worker thread).
+        
+        Args:
+            config (AutomationConfig): Configuration for this client
+            staged (Optional[Future]): Future of the client's pre-staged service, None to start fresh
+            
+        Returns:
+            Optional[ClientRunResult]: The client result, None if skipped due to cancellation
+        """
+        client_name = config.credentials.client_name
+        service = self._take_staged_service(staged) if staged else None
+        if self._cancel_event.is_set():
+            if service:
+                self._discard_service(service)
+            return None
+            
+        result = ClientRunResult(client_name=client_name, started_at=time.time())
+        if service is None:
+            service = self._create_service(client_name)
+            
+        try:
+            result.success = service.execute_automation_workflow(
+                credentials=config.credentials,
+                settings=config.automation_settings,
+                returns_options=config.returns_options,
+                credit_ledger_options=config.credit_ledger_options,
+                keep_browser_open=False  # Free the browser for the next client
+            )
+            result.downloads = list(service.downloads)
+            result.reused_downloads = list(service.reused_downloads)
+            result.period_results = list(service.period_results)
+            result.cash_balance = service.cash_balance
+            result.workflow_plan = service.workflow_plan
+            if not result.success:
+                result.error = service.last_error or "Workflow did not complete"
+        except Exception as e:
+            result.error = str(e)
+            self.logger.error(f"Batch worker for {client_name} failed: {e}")
+        finally:
+            with self._services_lock:
+                self._active_services.remove(service)
+            result.finished_at = time.time()
+            
+        return result
+    
+    def _write_cash_balance_report(self, summary: BatchRunSummary) -> None:
+        """
+        Write every client's cash ledger balance to one consolidated file.
+        
+        Args:
+            summary (BatchRunSummary): Finished batch; its cash_balance_report is set
+        """
+        balances = summary.get_cash_balances()
+        if not balances:
+            return
+            
+        path = os.path.join(
+            self.download_layout.root_dir,
+            f"{CASH_BALANCE_REPORT_PREFIX}_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+        )
+        try:
+            summary.cash_balance_report = write_cash_balance_report(balances, path)
+        except Exception as e:
+            self.logger.error(f"Could not write cash ledger balance report: {e}")
+    
+    def _discard_service(self, service: GSTPortalService) -> None:
+        """
+        Close a staged service that will not run and unregister it.
+        
+        Args:
+            service (GSTPortalService): Service to discard
+        """
+        try:
+            service.close_webdriver()
+        except Exception as e:
+            self.logger.warning(f"Error closing staged browser: {e}")
+        with self._services_lock:
+            if service in self._active_services:
+                self._active_services.remove(service)
+    
+    def cancel(self) -> None:
+        """
+        Cancel the batch run.
+        
+        Clients that have not started yet are skipped and browsers of clients
+        that are still running are closed.
+        """
+        self._cancel_event.set()
+        self._log_status("Cancelling batch run...")
+        
+        if self.captcha_queue:
+            self.captcha_queue.cancel_all()
+        
+        with self._services_lock:
+            active_services = list(self._active_services)
+            
+        for service in active_services:
+            try:
+                service.close_webdriver()
+            except Exception as e:
+                self.logger.warning(f"Error closing browser during cancel: {e}")
+    
+        self._close_driver_pool()
+    
+    def is_cancelled(self) -> bool:
+        """
+        Check whether the current batch run has been cancelled.
+        
+        Returns:
+            bool: True if cancel() was called for this run
+        """
+        return self._cancel_event.is_set()
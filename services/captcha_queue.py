@@ -0,0 +1,171 @@
+"""
+Human CAPTCHA queue for GST Automation Application.
+
+In batch runs every browser that reaches the login CAPTCHA submits the
+CAPTCHA image to one shared, prioritized queue. The operator answers the
+queued CAPTCHAs one after another in the application window while the other
+browsers keep working, and each answer is handed back to the browser that
+asked for it.
+
+Author: Srinidhi B S
+"""
+import time
+import heapq
+import logging
+import itertools
+import threading
+from typing import List, Optional, Tuple
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Queue priorities - lower values are shown to the operator first
+PRIORITY_RETRY = 0     # A previous answer was rejected; the browser is already waiting
+PRIORITY_NORMAL = 1    # First CAPTCHA for a client
+
+class CaptchaRequest:
+    """
+    A CAPTCHA waiting for an operator answer.
+    
+    The browser worker blocks in wait_for_answer() while the GUI thread
+    calls submit_answer() or cancel().
+    """
+    
+    def __init__(self, request_id: int, client_name: str, image_png: bytes,
+                 priority: int = PRIORITY_NORMAL, attempt: int = 1):
+        """
+        Initialize the CAPTCHA request.
+        
+        Args:
+            request_id (int): Unique, increasing request number
+            client_name (str): Client whose login needs the CAPTCHA
+            image_png (bytes): Screenshot of the CAPTCHA image as PNG
+            priority (int): Queue priority, lower values are answered first
+            attempt (int): Login attempt number for this client
+        """
+        self.request_id = request_id
+        self.client_name = client_name
+        self.image_png = image_png
+        self.priority = priority
+        self.attempt = attempt
+        self.created_at = time.time()
+        self._answer: Optional[str] = None
+        self._cancelled = False
+        self._done = threading.Event()
+    
+    def submit_answer(self, answer: str) -> None:
+        """
+        Provide the operator's answer and wake the waiting browser.
+        
+        Args:
+            answer (str): CAPTCHA text typed by the operator
+        """
+        self._answer = answer.strip()
+        self._done.set()
+    
+    def cancel(self) -> None:
+        """Give up on this CAPTCHA (skipped by the operator or run cancelled)."""
+        self._cancelled = True
+        self._done.set()
+    
+    def is_pending(self) -> bool:
+        """
+        Check whether the request still needs an answer.
+        
+        Returns:
+            bool: True if neither answered nor cancelled
+        """
+        return not self._done.is_set()
+    
+    def wait_for_answer(self, timeout: float) -> Optional[str]:
+        """
+        Block until the operator answers, skips or the timeout expires.
+        
+        Args:
+            timeout (float): Maximum time to wait in seconds
+            
+        Returns:
+            Optional[str]: The answer, None if cancelled or timed out
+        """
+        if not self._done.wait(timeout):
+            self.cancel()  # Make sure the operator is not shown a stale CAPTCHA
+            return None
+        return None if self._cancelled else self._answer
+
+class CaptchaQueue:
+    """
+    Thread-safe priority queue of CAPTCHA requests shared by all browsers.
+    """
+    
+    def __init__(self):
+        """Initialize an empty CAPTCHA queue."""
+        self.logger = logging.getLogger(__name__)
+        self._heap: List[Tuple[int, int, CaptchaRequest]] = []
+        self._condition = threading.Condition()
+        self._ids = itertools.count(1)
+    
+    def submit(self, client_name: str, image_png: bytes,
+               priority: int = PRIORITY_NORMAL, attempt: int = 1) -> CaptchaRequest:
+        """
+        Add a CAPTCHA to the queue.
+        
+        Args:
+            client_name (str): Client whose login needs the CAPTCHA
+            image_png (bytes): Screenshot of the CAPTCHA image as PNG
+            priority (int): Queue priority, lower values are answered first
+            attempt (int): Login attempt number for this client
+            
+        Returns:
+            CaptchaRequest: Request to wait on for the answer
+        """
+        with self._condition:
+            request = CaptchaRequest(next(self._ids), client_name, image_png, priority, attempt)
+            heapq.heappush(self._heap, (priority, request.request_id, request))
+            self._condition.notify_all()
+            
+        self.logger.info(f"CAPTCHA queued for {client_name} (attempt {attempt}, {self.get_pending_count()} waiting)")
+        return request
+    
+    def get_next(self, timeout: Optional[float] = None) -> Optional[CaptchaRequest]:
+        """
+        Take the most urgent pending CAPTCHA off the queue.
+        
+        Requests that were cancelled or timed out while queued are discarded.
+        
+        Args:
+            timeout (Optional[float]): Time to wait for a request, None to wait forever, 0 to poll
+            
+        Returns:
+            Optional[CaptchaRequest]: Next request to show the operator, None if none arrived
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._condition:
+            while True:
+                while self._heap:
+                    _, _, request = heapq.heappop(self._heap)
+                    if request.is_pending():
+                        return request
+                        
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+    
+    def get_pending_count(self) -> int:
+        """
+        Get the number of CAPTCHAs waiting for the operator.
+        
+        Returns:
+            int: Number of pending requests still in the queue
+        """
+        with self._condition:
+            return sum(1 for _, _, request in self._heap if request.is_pending())
+    
+    def cancel_all(self) -> None:
+        """Cancel every queued request, releasing the waiting browsers."""
+        with self._condition:
+            requests = [request for _, _, request in self._heap]
+            self._heap.clear()
+            
+        for request in requests:
+            request.cancel()
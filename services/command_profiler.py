@@ -0,0 +1,227 @@
+"""
+WebDriver command profiler for GST Automation Application.
+
+This module times every WebDriver command a browser sends (find, click,
+execute_script, get, screenshot, DevTools calls, ...) by wrapping the
+driver's command executor, and tags each command with the workflow step
+that was running. The per-step report shows where a client run spends its
+time: command counts, total and p95 command latency, and how much of the
+step's wall time was spent waiting between commands rather than working.
+
+Author: Srinidhi B S
+"""
+import math
+import time
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Step name for commands sent outside any tagged step (browser setup, cleanup)
+UNTAGGED_STEP = "setup"
+
+# Number of most frequent command types listed per step in the report
+REPORT_TOP_COMMANDS = 3
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """
+    Get a percentile of a list of values (nearest-rank method).
+    
+    Args:
+        values (List[float]): Values to rank
+        fraction (float): Percentile as a fraction, e.g. 0.95
+        
+    Returns:
+        float: The percentile value, 0.0 for an empty list
+    """
+    if not values:
+        return 0.0
+    ranked = sorted(values)
+    return ranked[max(0, math.ceil(fraction * len(ranked)) - 1)]
+
+@dataclass
+class StepCommandStats:
+    """
+    WebDriver command statistics of one workflow step.
+    
+    Attributes:
+        step (str): Workflow step name
+        command_count (int): Number of WebDriver commands sent
+        command_seconds (float): Total time spent in WebDriver commands
+        p95_seconds (float): 95th percentile command latency
+        wall_seconds (float): Wall-clock time of the step (0 for untimed steps)
+        commands (Dict[str, int]): Count per WebDriver command name
+    """
+    step: str
+    command_count: int = 0
+    command_seconds: float = 0.0
+    p95_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    commands: Dict[str, int] = field(default_factory=dict)
+    
+    @property
+    def waiting_seconds(self) -> float:
+        """Time of the step not spent in WebDriver commands (poll sleeps, downloads, the operator)."""
+        return max(0.0, self.wall_seconds - self.command_seconds)
+    
+    def __str__(self) -> str:
+        """
+        String representation of the statistics.
+        
+        Returns:
+            str: One-line summary of the step
+        """
+        text = (
+            f"{self.step}: {self.command_count} commands, {self.command_seconds:.2f}s in WebDriver "
+            f"(p95 {self.p95_seconds * 1000:.0f}ms)"
+        )
+        if self.wall_seconds:
+            text += f", {self.wall_seconds:.2f}s wall, {self.waiting_seconds:.2f}s waiting"
+        if self.commands:
+            top = Counter(self.commands).most_common(REPORT_TOP_COMMANDS)
+            text += " [" + ", ".join(f"{name} x{count}" for name, count in top) + "]"
+        return text
+
+class CommandProfiler:
+    """
+    Times the WebDriver commands of one automation run, per workflow step.
+    
+    Attach it to a driver with attach(); wrap each workflow step in step()
+    so its commands are tagged with the step name.
+    """
+    
+    def __init__(self):
+        """Initialize an empty profiler."""
+        self.logger = logging.getLogger(__name__)
+        self.current_step = UNTAGGED_STEP
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, List[float]] = {}
+        self._commands: Dict[str, Counter] = {}
+        self._wall_seconds: Dict[str, float] = {}
+    
+    def attach(self, driver: Any) -> None:
+        """
+        Route a driver's command timings to this profiler.
+        
+        The driver's command executor is wrapped once; pooled drivers that
+        are reused by later runs are simply pointed at the new profiler.
+        
+        Args:
+            driver (webdriver.Chrome): Driver whose commands should be timed
+        """
+        executor = driver.command_executor
+        if not getattr(executor, "_gst_profiled", False):
+            original_execute = executor.execute
+            
+            def timed_execute(command, params):
+                profiler = getattr(executor, "_gst_command_profiler", None)
+                if profiler is None:
+                    return original_execute(command, params)
+                start_time = time.perf_counter()
+                try:
+                    return original_execute(command, params)
+                finally:
+                    profiler.record(command, time.perf_counter() - start_time)
+                    
+            executor.execute = timed_execute
+            executor._gst_profiled = True
+        executor._gst_command_profiler = self
+    
+    @staticmethod
+    def detach(driver: Any) -> None:
+        """
+        Stop timing a driver's commands (e.g. before it goes back to the pool).
+        
+        Args:
+            driver (webdriver.Chrome): Driver passed to attach() earlier
+        """
+        executor = getattr(driver, "command_executor", None)
+        if executor is not None:
+            executor._gst_command_profiler = None
+    
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """
+        Tag the commands sent inside the block with a step name and time the step.
+        
+        Args:
+            name (str): Workflow step name
+        """
+        previous_step = self.current_step
+        self.current_step = name
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._wall_seconds[name] = self._wall_seconds.get(name, 0.0) + time.perf_counter() - start_time
+            self.current_step = previous_step
+    
+    def record(self, command: str, seconds: float) -> None:
+        """
+        Record one WebDriver command under the current step.
+        
+        Args:
+            command (str): WebDriver command name (e.g. "findElement")
+            seconds (float): Time the command took
+        """
+        with self._lock:
+            step = self.current_step
+            self._latencies.setdefault(step, []).append(seconds)
+            self._commands.setdefault(step, Counter())[command] += 1
+    
+    def reset(self) -> None:
+        """Forget all recorded commands and step timings."""
+        with self._lock:
+            self._latencies.clear()
+            self._commands.clear()
+            self._wall_seconds.clear()
+        self.current_step = UNTAGGED_STEP
+    
+    def get_step_stats(self) -> List[StepCommandStats]:
+        """
+        Get the command statistics of every step, in the order the steps first ran.
+        
+        Returns:
+            List[StepCommandStats]: One entry per step that sent commands or was timed
+        """
+        with self._lock:
+            steps = list(dict.fromkeys(list(self._latencies) + list(self._wall_seconds)))
+            return [
+                StepCommandStats(
+                    step=step,
+                    command_count=len(self._latencies.get(step, [])),
+                    command_seconds=sum(self._latencies.get(step, [])),
+                    p95_seconds=_percentile(self._latencies.get(step, []), 0.95),
+                    wall_seconds=self._wall_seconds.get(step, 0.0),
+                    commands=dict(self._commands.get(step, {}))
+                )
+                for step in steps
+            ]
+    
+    def get_report(self) -> str:
+        """
+        Get a human-readable per-step latency report.
+        
+        Returns:
+            str: One line per step plus a total line
+        """
+        stats = self.get_step_stats()
+        with self._lock:
+            latencies = [seconds for values in self._latencies.values() for seconds in values]
+        total = StepCommandStats(
+            step="total",
+            command_count=len(latencies),
+            command_seconds=sum(latencies),
+            p95_seconds=_percentile(latencies, 0.95),
+            wall_seconds=sum(step.wall_seconds for step in stats)
+        )
+        lines = ["WebDriver commands by step:"]
+        lines.extend(f"  {step}" for step in stats)
+        lines.append(f"  {total}")
+        return "\n".join(lines)
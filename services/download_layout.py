@@ -0,0 +1,409 @@
+"""
+Download layout and manifest for GST Automation Application.
+
+This module gives every automation run its own isolated Chrome download
+directory and files finished downloads into a tree keyed by client (name
+and portal username, so clients sharing a display name never share files),
+return type and period:
+
+    GST_Downloads/<client>_<username>/<return type>/<financial year>/<period>/<file>
+
+Every filed download is recorded in a SQLite manifest so later runs can
+reuse files that are already on disk instead of downloading them again.
+
+Author: Srinidhi B S
+"""
+import os
+import re
+import uuid
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+from config.settings import (
+    DOWNLOAD_FOLDER_NAME, DOWNLOAD_STAGING_FOLDER_NAME,
+    DOWNLOAD_MANIFEST_FILENAME, DOWNLOAD_MANIFEST_VERIFY_HASH
+)
+from services.download_tracker import DownloadResult
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+class DownloadLayoutError(Exception):
+    """Custom exception for download filing failures."""
+    pass
+
+def sanitize_path_component(value: str) -> str:
+    """
+    Make a value safe to use as a single directory or file name.
+    
+    Args:
+        value (str): Raw value such as a client name
+        
+    Returns:
+        str: Value with path separators and unsafe characters replaced
+    """
+    cleaned = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "_", value.strip())
+    cleaned = re.sub(r"\s+", " ", cleaned).strip(" .")
+    return cleaned or "unnamed"
+
+def client_folder_name(client_name: str, username: str) -> str:
+    """
+    Get the download tree folder of a client.
+    
+    Args:
+        client_name (str): Client name
+        username (str): GST portal username of the client
+        
+    Returns:
+        str: Folder name such as "Acme Traders_acme123"
+    """
+    if not username.strip():
+        return sanitize_path_component(client_name)
+    return f"{sanitize_path_component(client_name)}_{sanitize_path_component(username)}"
+
+def compute_sha256(file_path: str) -> str:
+    """
+    Compute the SHA-256 digest of a file.
+    
+    Args:
+        file_path (str): File to hash
+        
+    Returns:
+        str: Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+@dataclass
+class ManifestEntry:
+    """
+    A download recorded in the manifest.
+    
+    Attributes:
+        client_name (str): Client the file belongs to
+        username (str): GST portal username of the client
+        return_type (str): Return type (e.g. "GSTR-2B")
+        financial_year (str): Financial year label (e.g. "2025-26")
+        period (str): Period label (e.g. "August")
+        file_name (str): Name of the filed file
+        relative_path (str): Path of the file relative to the download root
+        sha256 (str): SHA-256 hex digest of the file contents
+        size_bytes (int): Size of the file in bytes
+        fetched_at (str): ISO timestamp of when the file was filed
+    """
+    client_name: str
+    username: str
+    return_type: str
+    financial_year: str
+    period: str
+    file_name: str
+    relative_path: str
+    sha256: str
+    size_bytes: int
+    fetched_at: str
+
+class DownloadManifest:
+    """
+    SQLite index of filed downloads.
+    
+    Entries are keyed by client name and username, return type, financial
+    year, period and file name, so re-filing the same file replaces its entry. Each operation
+    uses its own connection, which makes the manifest safe to share between
+    concurrent batch workers.
+    """
+    
+    def __init__(self, manifest_path: str):
+        """
+        Initialize the manifest, creating the database if needed.
+        
+        Args:
+            manifest_path (str): Path to the SQLite database file
+        """
+        self.logger = logging.getLogger(__name__)
+        self.manifest_path = manifest_path
+        self._lock = threading.Lock()
+        self._create_schema()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the manifest database."""
+        connection = sqlite3.connect(self.manifest_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+    
+    def _create_schema(self) -> None:
+        """Create the downloads table and its lookup index."""
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS downloads (
+                    client_name TEXT NOT NULL,
+                    username TEXT NOT NULL,
+                    return_type TEXT NOT NULL,
+                    financial_year TEXT NOT NULL,
+                    period TEXT NOT NULL,
+                    file_name TEXT NOT NULL,
+                    relative_path TEXT NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    fetched_at TEXT NOT NULL,
+                    PRIMARY KEY (client_name, username, return_type, financial_year, period, file_name)
+                )
+                """
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_downloads_fetched_at ON downloads (fetched_at)"
+            )
+    
+    def record(self, entry: ManifestEntry) -> None:
+        """
+        Insert or replace a manifest entry.
+        
+        Args:
+            entry (ManifestEntry): Description of a filed download
+        """
+        columns = list(asdict(entry))
+        placeholders = ", ".join("?" for _ in columns)
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.execute(
+                f"INSERT OR REPLACE INTO downloads ({', '.join(columns)}) VALUES ({placeholders})",
+                [getattr(entry, column) for column in columns]
+            )
+    
+    def find_entries(self, client_name: str, username: str, return_type: str,
+                     financial_year: str, period: str) -> List[ManifestEntry]:
+        """
+        Get the entries recorded for a client's return period.
+        
+        Args:
+            client_name (str): Client name
+            username (str): GST portal username of the client
+            return_type (str): Return type (e.g. "GSTR-2B")
+            financial_year (str): Financial year label
+            period (str): Period label
+            
+        Returns:
+            List[ManifestEntry]: Matching entries, most recently fetched first
+        """
+        with self._lock, closing(self._connect()) as connection:
+            rows = connection.execute(
+                """
+                SELECT * FROM downloads
+                WHERE client_name = ? AND username = ? AND return_type = ?
+                  AND financial_year = ? AND period = ?
+                ORDER BY fetched_at DESC
+                """,
+                (client_name, username, return_type, financial_year, period)
+            ).fetchall()
+        return [ManifestEntry(**dict(row)) for row in rows]
+    
+    def remove_entry(self, entry: ManifestEntry) -> None:
+        """
+        Delete an entry, e.g. because its file is missing or corrupt.
+        
+        Args:
+            entry (ManifestEntry): The entry to delete
+        """
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.execute(
+                """
+                DELETE FROM downloads
+                WHERE client_name = ? AND username = ? AND return_type = ?
+                  AND financial_year = ? AND period = ? AND file_name = ?
+                """,
+                (entry.client_name, entry.username, entry.return_type, entry.financial_year,
+                 entry.period, entry.file_name)
+            )
+    
+    def read_entries(self) -> List[ManifestEntry]:
+        """
+        Read all manifest entries.
+        
+        Returns:
+            List[ManifestEntry]: Entries in the order they were fetched
+        """
+        with self._lock, closing(self._connect()) as connection:
+            rows = connection.execute("SELECT * FROM downloads ORDER BY fetched_at").fetchall()
+        return [ManifestEntry(**dict(row)) for row in rows]
+
+class DownloadLayout:
+    """
+    Manages per-run download directories and the final download tree.
+    """
+    
+    def __init__(self, root_dir: Optional[str] = None):
+        """
+        Initialize the download layout.
+        
+        Args:
+            root_dir (Optional[str]): Root of the download tree, None for GST_Downloads in the app folder
+        """
+        if root_dir is None:
+            app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            root_dir = os.path.join(app_dir, DOWNLOAD_FOLDER_NAME)
+            
+        self.logger = logging.getLogger(__name__)
+        self.root_dir = root_dir
+        self.staging_dir = os.path.join(root_dir, DOWNLOAD_STAGING_FOLDER_NAME)
+        os.makedirs(self.staging_dir, exist_ok=True)
+        self.manifest = DownloadManifest(os.path.join(root_dir, DOWNLOAD_MANIFEST_FILENAME))
+    
+    def create_run_directory(self, client_name: str) -> str:
+        """
+        Create an isolated directory for one automation run's browser downloads.
+        
+        The directory lives inside the download root so finished files can be
+        moved into the final tree atomically.
+        
+        Args:
+            client_name (str): Client the run is for
+            
+        Returns:
+            str: Path to the new, empty run directory
+        """
+        run_id = f"{sanitize_path_component(client_name)}_{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        run_dir = os.path.join(self.staging_dir, run_id)
+        os.makedirs(run_dir)
+        self.logger.debug(f"Created run download directory: {run_dir}")
+        return run_dir
+    
+    def get_target_directory(self, client_name: str, username: str, return_type: str,
+                             financial_year: str, period: str) -> str:
+        """
+        Get the final directory for a client's return file.
+        
+        Args:
+            client_name (str): Client name
+            username (str): GST portal username of the client
+            return_type (str): Return type (e.g. "GSTR-2B")
+            financial_year (str): Financial year label (e.g. "2025-26")
+            period (str): Period label (e.g. "August")
+            
+        Returns:
+            str: Directory path inside the download tree
+        """
+        return os.path.join(
+            self.root_dir,
+            client_folder_name(client_name, username),
+            sanitize_path_component(return_type),
+            sanitize_path_component(financial_year),
+            sanitize_path_component(period)
+        )
+    
+    def file_download(self, download: DownloadResult, client_name: str, username: str,
+                      return_type: str, financial_year: str, period: str) -> DownloadResult:
+        """
+        Move a finished download into the final tree and record it in the manifest.
+        
+        The move is an atomic rename, so readers never see a partial file.
+        An existing file with the same name is replaced.
+        
+        Args:
+            download (DownloadResult): Completed download in a run directory
+            client_name (str): Client name
+            username (str): GST portal username of the client
+            return_type (str): Return type (e.g. "GSTR-2B")
+            financial_year (str): Financial year label
+            period (str): Period label
+            
+        Returns:
+            DownloadResult: The download at its final location
+            
+        Raises:
+            DownloadLayoutError: If the file cannot be moved
+        """
+        target_dir = self.get_target_directory(client_name, username, return_type, financial_year, period)
+        target_path = os.path.join(target_dir, download.file_name)
+        
+        try:
+            os.makedirs(target_dir, exist_ok=True)
+            os.replace(download.path, target_path)
+        except OSError as e:
+            error_msg = f"Failed to move {download.path} to {target_path}: {str(e)}"
+            self.logger.error(error_msg)
+            raise DownloadLayoutError(error_msg) from e
+            
+        filed = DownloadResult(
+            path=target_path,
+            size_bytes=download.size_bytes,
+            elapsed_seconds=download.elapsed_seconds
+        )
+        
+        self.manifest.record(ManifestEntry(
+            client_name=client_name,
+            username=username,
+            return_type=return_type,
+            financial_year=financial_year,
+            period=period,
+            file_name=filed.file_name,
+            relative_path=os.path.relpath(target_path, self.root_dir),
+            sha256=compute_sha256(target_path),
+            size_bytes=filed.size_bytes,
+            fetched_at=time.strftime("%Y-%m-%dT%H:%M:%S")
+        ))
+        self.logger.info(f"Filed download: {os.path.relpath(target_path, self.root_dir)}")
+        return filed
+    
+    def find_existing(self, client_name: str, username: str, return_type: str, financial_year: str,
+                      period: str, verify_hash: bool = DOWNLOAD_MANIFEST_VERIFY_HASH) -> Optional[DownloadResult]:
+        """
+        Find a valid, previously filed download for a client's return period.
+        
+        An entry is valid when its file still exists with the recorded size
+        (and, if requested, the recorded hash). Invalid entries are removed
+        from the manifest so the period is downloaded again.
+        
+        Args:
+            client_name (str): Client name
+            username (str): GST portal username of the client
+            return_type (str): Return type (e.g. "GSTR-2B")
+            financial_year (str): Financial year label
+            period (str): Period label
+            verify_hash (bool): If True, re-hash the file and compare with the manifest
+            
+        Returns:
+            Optional[DownloadResult]: The existing file, None if it must be downloaded
+        """
+        for entry in self.manifest.find_entries(client_name, username, return_type, financial_year, period):
+            file_path = os.path.join(self.root_dir, entry.relative_path)
+            try:
+                valid = os.path.getsize(file_path) == entry.size_bytes
+                if valid and verify_hash:
+                    valid = compute_sha256(file_path) == entry.sha256
+            except OSError:
+                valid = False
+                
+            if valid:
+                return DownloadResult(path=file_path, size_bytes=entry.size_bytes, elapsed_seconds=0.0)
+                
+            self.logger.warning(f"Manifest entry no longer matches file on disk, forgetting it: {entry.relative_path}")
+            self.manifest.remove_entry(entry)
+            
+        return None
+    
+    def cleanup_run_directory(self, run_dir: str) -> None:
+        """
+        Remove a run directory once the run is over.
+        
+        Leftover files (e.g. unexpected extra downloads) are kept for
+        inspection; only empty directories are removed.
+        
+        Args:
+            run_dir (str): Directory returned by create_run_directory
+        """
+        try:
+            if os.path.isdir(run_dir) and not os.listdir(run_dir):
+                os.rmdir(run_dir)
+            elif os.path.isdir(run_dir):
+                self.logger.warning(f"Run download directory not empty, keeping it: {run_dir}")
+        except OSError as e:
+            self.logger.debug(f"Could not remove run directory {run_dir}: {e}")
@@ -0,0 +1,177 @@
+"""
+Download completion tracking for GST Automation Application.
+
+This module watches a browser download directory and reports when a newly
+started download has finished: the partial (.crdownload) file is gone and
+the final file size has stopped changing.
+
+Author: Srinidhi B S
+"""
+import os
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from config.settings import (
+    WAIT_TIME_VERY_LONG, WAIT_POLL_INTERVAL,
+    DOWNLOAD_STABLE_SECONDS, PARTIAL_DOWNLOAD_EXTENSIONS
+)
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+class DownloadTrackingError(Exception):
+    """Custom exception for download tracking failures."""
+    pass
+
+class DownloadTimeoutError(DownloadTrackingError):
+    """Custom exception raised when a download does not finish in time."""
+    pass
+
+@dataclass
+class DownloadResult:
+    """
+    A completed browser download.
+    
+    Attributes:
+        path (str): Full path of the downloaded file
+        size_bytes (int): Final size of the file in bytes
+        elapsed_seconds (float): Time from tracking start until the file was complete
+    """
+    path: str
+    size_bytes: int
+    elapsed_seconds: float
+    
+    @property
+    def file_name(self) -> str:
+        """Name of the downloaded file without its directory."""
+        return os.path.basename(self.path)
+    
+    def __str__(self) -> str:
+        """
+        String representation of the download.
+        
+        Returns:
+            str: File name, size and duration
+        """
+        return f"{self.file_name} ({self.size_bytes:,} bytes in {self.elapsed_seconds:.1f}s)"
+
+class DownloadTracker:
+    """
+    Tracker for a single download into a directory.
+    
+    Call start() (or enter the context manager) before triggering the
+    download, then wait_for_download() to block until the new file is
+    complete.
+    """
+    
+    def __init__(self, directory: str,
+                 stable_seconds: float = DOWNLOAD_STABLE_SECONDS,
+                 poll_interval: float = WAIT_POLL_INTERVAL):
+        """
+        Initialize the download tracker.
+        
+        Args:
+            directory (str): Directory the browser downloads into
+            stable_seconds (float): File size must stay unchanged this long to count as finished
+            poll_interval (float): Time between directory scans
+        """
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory
+        self.stable_seconds = stable_seconds
+        self.poll_interval = poll_interval
+        self._baseline: Dict[str, Tuple[int, float]] = {}
+        self._started_at: Optional[float] = None
+    
+    def _scan(self) -> Dict[str, Tuple[int, float]]:
+        """
+        Scan the directory for files.
+        
+        Returns:
+            Dict[str, Tuple[int, float]]: Mapping of file name to (size, modification time)
+        """
+        files = {}
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.is_file():
+                    stat = entry.stat()
+                    files[entry.name] = (stat.st_size, stat.st_mtime)
+        except FileNotFoundError:
+            pass
+        return files
+    
+    def start(self) -> None:
+        """Record the files that already exist so only new downloads are reported."""
+        os.makedirs(self.directory, exist_ok=True)
+        self._baseline = self._scan()
+        self._started_at = time.time()
+    
+    def wait_for_download(self, timeout: float = WAIT_TIME_VERY_LONG) -> DownloadResult:
+        """
+        Wait until a new download has finished writing.
+        
+        Args:
+            timeout (float): Maximum time to wait from this call
+            
+        Returns:
+            DownloadResult: Final path and size of the downloaded file
+            
+        Raises:
+            DownloadTrackingError: If start() was not called
+            DownloadTimeoutError: If no complete download appears within the timeout
+        """
+        if self._started_at is None:
+            raise DownloadTrackingError("DownloadTracker.start() must be called before the download is triggered")
+            
+        deadline = time.time() + timeout
+        last_seen: Dict[str, Tuple[int, float]] = {}
+        partial_seen: Optional[str] = None
+        
+        while time.time() < deadline:
+            now = time.time()
+            current = self._scan()
+            new_files = {
+                name: info for name, info in current.items()
+                if self._baseline.get(name) != info
+            }
+            
+            partials = [name for name in new_files if name.endswith(PARTIAL_DOWNLOAD_EXTENSIONS)]
+            if partials:
+                if partial_seen is None:
+                    self.logger.info(f"Download in progress: {partials[0]}")
+                partial_seen = partials[0]
+            else:
+                for name, (size, _) in new_files.items():
+                    previous = last_seen.get(name)
+                    if previous is None or previous[0] != size:
+                        last_seen[name] = (size, now)
+                    elif size > 0 and now - previous[1] >= self.stable_seconds:
+                        result = DownloadResult(
+                            path=os.path.join(self.directory, name),
+                            size_bytes=size,
+                            elapsed_seconds=now - self._started_at
+                        )
+                        self.logger.info(f"Download complete: {result}")
+                        return result
+                        
+            time.sleep(self.poll_interval)
+            
+        if partial_seen:
+            error_msg = (
+                f"Download started but did not finish within {timeout}s "
+                f"(partial file still present: {partial_seen})"
+            )
+        else:
+            error_msg = f"No download arrived in {self.directory} within {timeout}s"
+        self.logger.error(error_msg)
+        raise DownloadTimeoutError(error_msg)
+    
+    def __enter__(self):
+        """Start tracking when used as a context manager."""
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Nothing to clean up; exceptions propagate."""
+        return False
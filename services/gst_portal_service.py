@@ -6,29 +6,127 @@ including login, returns dashboard navigation, GSTR-2B downloads, and ledger acc
 
 Author: Srinidhi B S
 """
+import json
 import time
 import logging
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING
+
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException
 
 from services.web_automation_service import (
     WebAutomationService, ElementNotFoundError, AutomationTimeoutError
 )
+from services.download_tracker import DownloadResult, DownloadTimeoutError
+from services.download_layout import DownloadLayout
+from services.session_store import SessionStore
+from services.captcha_queue import CaptchaQueue, PRIORITY_NORMAL, PRIORITY_RETRY
+from services.workflow_plan import (
+    WorkflowPlan, compile_workflow_plan, STEP_LOGIN, STEP_RETURNS_DASHBOARD,
+    STEP_FILTER_DASHBOARD, STEP_GSTR2B, STEP_CREDIT_LEDGER, STEP_CASH_LEDGER, STEP_LEDGERS,
+    PAGE_DASHBOARD
+)
+from services.ledger_extraction import (
+    LedgerStore, CashLedgerBalance, LedgerExtractionError, LEDGER_TABLE_SCRIPT, CREDIT_LEDGER_NAME,
+    build_credit_ledger_frame, build_cash_ledger_balance, merge_ledger_frames
+)
 from config.settings import (
-    GST_PORTAL_BASE_URL, WELCOME_PAGE_URL_PART,
+    GST_PORTAL_BASE_URL, WELCOME_PAGE_URL, WELCOME_PAGE_URL_PART, RETURNS_DASHBOARD_URL_PART,
+    CREDIT_LEDGER_URL, CREDIT_LEDGER_URL_PART, CASH_LEDGER_URL, CASH_LEDGER_URL_PART,
+    LEDGER_DIRECT_NAVIGATION,
+    CREDIT_LEDGER_EXTRACTION_ENABLED, CASH_LEDGER_EXTRACTION_ENABLED,
+    CREDIT_LEDGER_MAX_SPAN_DAYS, CREDIT_LEDGER_PARALLEL_TABS, BATCH_LOGIN_PRESTAGE_MAX_AGE_SECONDS,
+    SESSION_PERSISTENCE_ENABLED, CAPTCHA_QUEUE_MAX_ATTEMPTS, CAPTCHA_SUBMIT_TIMEOUT, POPUP_AUTO_DISMISS,
     LOGIN_FORM_USERNAME_ID, LOGIN_FORM_PASSWORD_ID, LOGIN_FORM_CAPTCHA_ID,
     WAIT_TIME_SHORT, WAIT_TIME_LONG, WAIT_TIME_VERY_LONG, WAIT_TIME_MANUAL_CAPTCHA,
-    Locators, StatusMessages, ErrorMessages, LoginFormLocators
+    DEBUG_MODE, COMMAND_PROFILING_ENABLED, Locators, StatusMessages, ErrorMessages, LoginFormLocators
 )
 from models.client_data import (
     ClientCredentials, AutomationSettings, 
     ReturnsDashboardOptions, CreditLedgerOptions
 )
+from models.batch_results import PeriodRunResult
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from services.webdriver_pool import WebDriverPool
 
 # Set up logging for this module
 logger = logging.getLogger(__name__)
 
+# How far stage_login() got before the CAPTCHA
+LOGIN_STAGE_SESSION = "session"  # Saved session resumed, already logged in
+LOGIN_STAGE_FORM = "form"        # Credentials filled in, waiting for the CAPTCHA
+
+# Injected into every portal page. Watches DOM changes and clicks the
+# "Remind me later" popup button as soon as it is rendered.
+POPUP_WATCHER_SCRIPT = """
+(function(xpath) {
+    if (window.__gstPopupWatcher) { return; }
+    window.__gstPopupWatcher = true;
+    var scheduled = false;
+    function dismiss() {
+        scheduled = false;
+        var snapshot = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var i = 0; i < snapshot.snapshotLength; i++) {
+            var button = snapshot.snapshotItem(i);
+            if (button.getClientRects().length && window.getComputedStyle(button).visibility !== 'hidden') {
+                button.click();
+                return;
+            }
+        }
+    }
+    function start() {
+        new MutationObserver(function() {
+            // Angular mutates the DOM in bursts; check once per burst
+            if (!scheduled) { scheduled = true; setTimeout(dismiss, 100); }
+        }).observe(document.documentElement, {childList: true, subtree: true});
+        dismiss();
+    }
+    if (document.documentElement) { start(); }
+    else { document.addEventListener('DOMContentLoaded', start); }
+})(%s);
+""" % json.dumps(Locators.Login.POPUP_CLOSE_XPATH)
+
+# Selects the Returns Dashboard dropdowns in order and clicks Search, all in
+# one asynchronous call. Each <select> is polled until it is enabled, has
+# the wanted option and the page has no requests in flight (a dependent
+# dropdown is filled after its parent changes). Reports the selected labels,
+# or an error naming the step that timed out.
+DASHBOARD_FILTER_SCRIPT = """
+var selections = arguments[0];
+var searchLocators = arguments[1];
+var deadline = Date.now() + arguments[2];
+var done = arguments[arguments.length - 1];
+var selected = [];
+function networkBusy() { return window.__gstPendingRequests > 0; }
+function selectNext(position) {
+    if (position === selections.length) { return search(); }
+    var name = selections[position][0];
+    var index = selections[position][1];
+    var select = document.getElementsByName(name)[0];
+    if (!select || select.disabled || select.options.length < 2 || select.options.length <= index || networkBusy()) {
+        if (Date.now() > deadline) { return done({error: "Dropdown '" + name + "' was not populated"}); }
+        return setTimeout(function() { selectNext(position); }, 100);
+    }
+    select.selectedIndex = index;
+    select.dispatchEvent(new Event('change', {bubbles: true}));
+    selected.push(select.options[index].text.trim());
+    setTimeout(function() { selectNext(position + 1); }, 0);
+}
+function search() {
+    var button = document.evaluate(searchLocators[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        || document.querySelector(searchLocators[1]);
+    if (!button || button.disabled || networkBusy()) {
+        if (Date.now() > deadline) { return done({error: "Search button was not ready"}); }
+        return setTimeout(search, 100);
+    }
+    button.click();
+    done({selected: selected});
+}
+selectNext(0);
+"""
+
 class GSTPortalLoginError(Exception):
     """Custom exception for GST portal login failures."""
     pass
@@ -45,17 +143,45 @@ class GSTPortalService(WebAutomationService):
     designed for GST portal interactions.
     """
     
-    def __init__(self, status_callback: Optional[Callable[[str], None]] = None, headless: bool = False):
+    def __init__(self, status_callback: Optional[Callable[[str], None]] = None, headless: bool = False,
+                 driver_pool: Optional["WebDriverPool"] = None,
+                 download_layout: Optional[DownloadLayout] = None,
+                 session_store: Optional[SessionStore] = None,
+                 captcha_queue: Optional[CaptchaQueue] = None):
         """
         Initialize the GST portal automation service.
         
         Args:
             status_callback (Optional[Callable[[str], None]]): Callback function for status updates
             headless (bool): If True, run browser in headless mode
+            driver_pool (Optional[WebDriverPool]): Pool of pre-warmed drivers to borrow from
+            download_layout (Optional[DownloadLayout]): Where run downloads are staged and filed
+            session_store (Optional[SessionStore]): Saved portal sessions, None for the default
+                store (or no persistence if SESSION_PERSISTENCE_ENABLED is False)
+            captcha_queue (Optional[CaptchaQueue]): Shared queue for answering CAPTCHAs in the
+                application window, None to let the user type the CAPTCHA in the browser
         """
-        super().__init__(headless=headless)
+        super().__init__(headless=headless, driver_pool=driver_pool)
         self.status_callback = status_callback or self._default_status_callback
         self.logger = logging.getLogger(__name__)
+        self.download_layout = download_layout or DownloadLayout()
+        self.ledger_store = LedgerStore(self.download_layout.root_dir)
+        if session_store is None and SESSION_PERSISTENCE_ENABLED:
+            session_store = SessionStore()
+        self.session_store = session_store
+        self.captcha_queue = captcha_queue
+        self._logged_in_username: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.downloads: List[DownloadResult] = []
+        self.reused_downloads: List[DownloadResult] = []
+        self.period_results: List[PeriodRunResult] = []
+        self.credit_ledger: Optional["pd.DataFrame"] = None
+        self.cash_balance: Optional[CashLedgerBalance] = None
+        self.workflow_plan: Optional[WorkflowPlan] = None
+        self._run_download_dir: Optional[str] = None
+        self._staged_login: Optional[str] = None  # LOGIN_STAGE_* reached by stage_login()
+        self._staged_at: float = 0.0  # When prestage_login() reached that stage
+        self._popup_watcher_id: Optional[str] = None
     
     def _default_status_callback(self, message: str) -> None:
         """Default status callback that just logs the message."""
@@ -135,36 +261,37 @@ class GSTPortalService(WebAutomationService):
             ElementNotFoundError: If form fields cannot be found
         """
         try:
-            # Wait for and fill username field (using original working approach)
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-            
-            WebDriverWait(self.driver, WAIT_TIME_LONG).until(
-                EC.visibility_of_element_located((By.ID, LOGIN_FORM_USERNAME_ID))
+            # Wait for the form, then fill username and password together
+            self.wait_for_element_ready(
+                [(By.ID, LOGIN_FORM_USERNAME_ID)],
+                WAIT_TIME_LONG,
+                "username field"
             )
-            
-            username_element = self.driver.find_element(By.ID, LOGIN_FORM_USERNAME_ID)
-            username_element.clear()
-            username_element.send_keys(credentials.username)
-            self._log_status("Entered username")
-            
-            # Fill password field (using original working approach)
-            password_element = self.driver.find_element(By.ID, LOGIN_FORM_PASSWORD_ID)
-            password_element.clear()
-            password_element.send_keys(credentials.password)
-            self._log_status("Entered password")
+            self.fill_inputs(
+                [
+                    (By.ID, LOGIN_FORM_USERNAME_ID, credentials.username),
+                    (By.ID, LOGIN_FORM_PASSWORD_ID, credentials.password)
+                ],
+                WAIT_TIME_SHORT,
+                "login form"
+            )
+            self._log_status("Entered username and password")
             
         except Exception as e:
             error_msg = f"Could not find login form fields: {str(e)}"
             self.logger.error(error_msg)
             raise ElementNotFoundError(error_msg) from e
     
-    def handle_captcha_input(self) -> bool:
+    def handle_captcha_input(self, credentials: Optional[ClientCredentials] = None) -> bool:
         """
         Handle CAPTCHA input by user (manual process).
         
         This method waits for the user to manually enter CAPTCHA
-        and submit the login form.
+        and submit the login form. With a CAPTCHA queue the CAPTCHA is
+        answered in the application window instead.
+        
+        Args:
+            credentials (Optional[ClientCredentials]): Client being logged in (needed for the queue)
         
         Returns:
             bool: True if login was successful, False if timeout
@@ -176,6 +303,9 @@ class GSTPortalService(WebAutomationService):
             # Wait for overlay to disappear and click CAPTCHA field to focus
             self.wait_for_page_overlay_to_disappear()
             
+            if self.captcha_queue and credentials:
+                return self._solve_captcha_via_queue(credentials)
+            
             # Multiple CAPTCHA field locator strategies for robustness
             captcha_locators = [
                 (By.ID, LoginFormLocators.CAPTCHA_FIELD_ID),
@@ -213,30 +343,239 @@ class GSTPortalService(WebAutomationService):
             self.logger.error(error_msg)
             raise GSTPortalLoginError(error_msg) from e
     
+    def _solve_captcha_via_queue(self, credentials: ClientCredentials) -> bool:
+        """
+        Log in by sending the CAPTCHA image to the operator queue.
+        
+        The browser waits only on its own request, so other browsers keep
+        working while the operator answers CAPTCHAs one after another.
+        Rejected answers are re-queued at higher priority with the new image.
+        
+        Args:
+            credentials (ClientCredentials): Client being logged in
+            
+        Returns:
+            bool: True if the portal accepted the login, False otherwise
+        """
+        captcha_image_locators = [
+            (By.ID, Locators.Login.CAPTCHA_IMAGE_ID),
+            (By.CSS_SELECTOR, Locators.Login.CAPTCHA_IMAGE_CSS)
+        ]
+        
+        for attempt in range(1, CAPTCHA_QUEUE_MAX_ATTEMPTS + 1):
+            captcha_image = self.wait_for_element_ready(captcha_image_locators, WAIT_TIME_LONG, "CAPTCHA image")
+            request = self.captcha_queue.submit(
+                credentials.client_name,
+                captcha_image.screenshot_as_png,
+                priority=PRIORITY_NORMAL if attempt == 1 else PRIORITY_RETRY,
+                attempt=attempt
+            )
+            self._log_status("CAPTCHA sent to the application window - waiting for answer...")
+            
+            answer = request.wait_for_answer(WAIT_TIME_MANUAL_CAPTCHA)
+            if not answer:
+                self.logger.warning("CAPTCHA was not answered in time or was skipped")
+                return False
+            
+            # Password is cleared by the portal after a rejected attempt
+            password_element = self.driver.find_element(By.ID, LOGIN_FORM_PASSWORD_ID)
+            if not password_element.get_attribute("value"):
+                password_element.send_keys(credentials.password)
+            captcha_element = self.driver.find_element(By.ID, LOGIN_FORM_CAPTCHA_ID)
+            captcha_element.clear()
+            captcha_element.send_keys(answer)
+            self.driver.find_element(By.CSS_SELECTOR, Locators.Login.SUBMIT_BUTTON_CSS).click()
+            
+            def login_outcome():
+                if WELCOME_PAGE_URL_PART in self.driver.current_url:
+                    return "accepted"
+                # The portal clears the CAPTCHA field when it rejects an answer
+                fields = self.driver.find_elements(By.ID, LOGIN_FORM_CAPTCHA_ID)
+                if fields and not fields[0].get_attribute("value"):
+                    return "rejected"
+                return None
+            
+            try:
+                outcome = self.wait_until(login_outcome, CAPTCHA_SUBMIT_TIMEOUT, "login response")
+            except AutomationTimeoutError:
+                outcome = "rejected"
+                
+            if outcome == "accepted":
+                self._log_status(StatusMessages.LOGIN_SUCCESS)
+                return True
+            self._log_status(f"CAPTCHA rejected (attempt {attempt}/{CAPTCHA_QUEUE_MAX_ATTEMPTS})")
+            
+        return False
+    
     def handle_post_login_popups(self) -> None:
-        """Handle any popups that appear after successful login."""
+        """
+        Handle any popups that appear after successful login.
+        
+        The popup is looked for once, after the welcome page has settled; when
+        it is absent the workflow continues immediately. A popup that shows up
+        later is closed by the in-page watcher (see POPUP_AUTO_DISMISS).
+        """
         try:
-            time.sleep(2)  # Brief pause for page stabilization
+            # Let the welcome page settle before looking for the popup
+            self.wait_for_page_ready(WAIT_TIME_SHORT)
+        except AutomationTimeoutError as e:
+            self.logger.debug(f"Welcome page still busy, checking for popup anyway: {e}")
             
+        try:
             popup_locators = [(By.XPATH, Locators.Login.POPUP_CLOSE_XPATH)]
-            self.click_element_with_fallbacks(
-                popup_locators,
-                WAIT_TIME_SHORT,
-                "post-login popup close button"
-            )
+            close_button = self.probe_element(popup_locators)
+            if close_button is None:
+                self._log_status("No post-login popup found (this is normal)")
+                return
+                
+            close_button.click()
             self._log_status("Closed post-login popup")
-            time.sleep(1)
+            self.wait_for_element_invisible(By.XPATH, Locators.Login.POPUP_CLOSE_XPATH, WAIT_TIME_SHORT)
             
-        except ElementNotFoundError:
-            self._log_status("No post-login popup found (this is normal)")
         except Exception as e:
             self.logger.debug(f"Error handling post-login popup: {e}")
             # Not critical, continue
     
+    def save_session(self) -> None:
+        """Save the current portal cookies so later runs can skip login."""
+        if not self.session_store or not self._logged_in_username or not self.driver:
+            return
+            
+        try:
+            self.session_store.save(self._logged_in_username, self.driver)
+        except Exception as e:
+            self.logger.warning(f"Could not save portal session: {e}")
+    
+    def restore_session(self, credentials: ClientCredentials) -> bool:
+        """
+        Try to resume a saved portal session instead of logging in.
+        
+        The saved cookies are loaded into the browser and the welcome page is
+        opened; the session is valid only if the portal keeps us there
+        instead of redirecting to the login page.
+        
+        Args:
+            credentials (ClientCredentials): Client whose session to restore
+            
+        Returns:
+            bool: True if the browser is logged in, False if a full login is needed
+        """
+        if not self.session_store:
+            return False
+            
+        try:
+            if not self.session_store.restore(credentials.username, self.driver):
+                return False
+                
+            self.navigate_to_url(WELCOME_PAGE_URL)
+            self.wait_for_page_ready(WAIT_TIME_LONG)
+            
+            # An expired session is redirected to the login form
+            login_form_shown = bool(self.driver.find_elements(By.ID, LOGIN_FORM_USERNAME_ID))
+            if WELCOME_PAGE_URL_PART in self.driver.current_url and not login_form_shown:
+                self._logged_in_username = credentials.username
+                self._log_status(StatusMessages.SESSION_RESTORED)
+                return True
+        except Exception as e:
+            self.logger.warning(f"Could not restore saved portal session: {e}")
+            
+        self._log_status(StatusMessages.SESSION_EXPIRED)
+        self.session_store.delete(credentials.username)
+        try:
+            self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except Exception as e:
+            self.logger.debug(f"Could not clear restored cookies: {e}")
+        return False
+    
+    def prepare_browser(self, credentials: ClientCredentials) -> None:
+        """
+        Start the browser with a download directory private to this run.
+        
+        Does nothing if the browser was already prepared (e.g. by prestage_login).
+        
+        Args:
+            credentials (ClientCredentials): Client the run belongs to
+        """
+        self.metrics_client_name = credentials.client_name
+        if self.driver is None:
+            self.initialize_webdriver()
+            if POPUP_AUTO_DISMISS:
+                self.install_popup_watcher()
+        if self._run_download_dir is None:
+            self._run_download_dir = self.download_layout.create_run_directory(credentials.client_name)
+            self.set_download_directory(self._run_download_dir)
+    
+    def install_popup_watcher(self) -> None:
+        """Dismiss the post-login popup automatically on every page the browser loads."""
+        try:
+            result = self.driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument",
+                {"source": POPUP_WATCHER_SCRIPT}
+            )
+            self._popup_watcher_id = result.get("identifier")
+        except Exception as e:
+            self.logger.warning(f"Could not install popup watcher: {e}")
+    
+    def remove_popup_watcher(self) -> None:
+        """Stop injecting the popup watcher (so pooled browsers are handed back clean)."""
+        if not self.driver or not self._popup_watcher_id:
+            return
+        try:
+            self.driver.execute_cdp_cmd(
+                "Page.removeScriptToEvaluateOnNewDocument",
+                {"identifier": self._popup_watcher_id}
+            )
+        except Exception as e:
+            self.logger.debug(f"Could not remove popup watcher: {e}")
+        self._popup_watcher_id = None
+    
+    def stage_login(self, credentials: ClientCredentials) -> str:
+        """
+        Bring the browser as far into the login as possible without the CAPTCHA.
+        
+        Args:
+            credentials (ClientCredentials): Client credentials for login
+            
+        Returns:
+            str: LOGIN_STAGE_SESSION if a saved session was resumed,
+                LOGIN_STAGE_FORM if the login form is filled and waiting for the CAPTCHA
+        """
+        self._logged_in_username = None
+        if self.restore_session(credentials):
+            return LOGIN_STAGE_SESSION
+            
+        self.navigate_to_portal()
+        self.click_login_link()
+        self.wait_for_page_overlay_to_disappear()
+        self.fill_login_credentials(credentials)
+        return LOGIN_STAGE_FORM
+    
+    def prestage_login(self, credentials: ClientCredentials) -> None:
+        """
+        Prepare this client's login ahead of its turn in a batch run.
+        
+        The browser is started and left at the filled-in login form (or at the
+        dashboard of a resumed session); perform_login() continues from there,
+        so the client is ready for its CAPTCHA the moment a worker picks it up.
+        
+        Args:
+            credentials (ClientCredentials): Client credentials for login
+        """
+        self.command_profiler.reset()
+        with self.command_profiler.step("prestage_login"):
+            self.prepare_browser(credentials)
+            self._staged_login = self.stage_login(credentials)
+            self._staged_at = time.time()
+        self._log_status("Login pre-staged, waiting for a free worker")
+    
     def perform_login(self, credentials: ClientCredentials) -> bool:
         """
         Perform complete login process to GST portal.
         
+        A saved session for the client is resumed when possible; otherwise
+        the full login with manual CAPTCHA runs and the new session is saved.
+        If prestage_login() already ran, login continues from the staged point.
+        
         Args:
             credentials (ClientCredentials): Client credentials for login
             
@@ -247,14 +586,24 @@ class GSTPortalService(WebAutomationService):
             GSTPortalLoginError: If login process fails
         """
         try:
-            self.navigate_to_portal()
-            self.click_login_link()
-            self.wait_for_page_overlay_to_disappear()
-            self.fill_login_credentials(credentials)
+            # Reuse the stage reached by prestage_login(), if any
+            stage = self._staged_login
+            self._staged_login = None
+            staged_age = time.time() - self._staged_at
+            if stage and staged_age > BATCH_LOGIN_PRESTAGE_MAX_AGE_SECONDS:
+                # The portal expires an unanswered CAPTCHA and login form (and idle sessions)
+                self._log_status(f"Pre-staged login is {staged_age:.0f}s old - reloading the login page")
+                stage = None
+            stage = stage or self.stage_login(credentials)
+            if stage == LOGIN_STAGE_SESSION:
+                self.handle_post_login_popups()
+                return True
             
-            login_success = self.handle_captcha_input()
+            login_success = self.handle_captcha_input(credentials)
             
             if login_success:
+                self._logged_in_username = credentials.username
+                self.save_session()
                 self.handle_post_login_popups()
                 return True
             else:
@@ -265,6 +614,19 @@ class GSTPortalService(WebAutomationService):
             self.logger.error(error_msg)
             raise GSTPortalLoginError(error_msg) from e
     
+    def _open_step_start_page(self, page: str) -> None:
+        """
+        Bring the browser back to the page a workflow step starts from.
+        
+        Args:
+            page (str): Start page of the step (a workflow_plan PAGE_* constant)
+        """
+        self.logger.info(f"Returning to the {page} page for the next workflow step")
+        self.navigate_to_url(WELCOME_PAGE_URL)
+        self.wait_for_page_ready(WAIT_TIME_LONG)
+        if page == PAGE_DASHBOARD:
+            self.navigate_to_returns_dashboard()
+    
     def navigate_to_returns_dashboard(self) -> None:
         """
         Navigate to the Returns Dashboard from the main portal.
@@ -288,9 +650,13 @@ class GSTPortalService(WebAutomationService):
             )
             
             self._log_status(StatusMessages.RETURNS_DASHBOARD_CLICKED)
-            time.sleep(3)  # Wait for dashboard page to load
             
-        except ElementNotFoundError as e:
+            # Wait for the dashboard page to load
+            if not self.wait_for_url_change(RETURNS_DASHBOARD_URL_PART, WAIT_TIME_LONG):
+                raise GSTPortalNavigationError("Returns Dashboard page did not open")
+            self.wait_for_page_ready(WAIT_TIME_LONG)
+            
+        except (ElementNotFoundError, AutomationTimeoutError) as e:
             error_msg = "Could not find Returns Dashboard button"
             self.logger.error(error_msg)
             raise GSTPortalNavigationError(error_msg) from e
@@ -308,116 +674,68 @@ class GSTPortalService(WebAutomationService):
         try:
             self._log_status("Applying filters on Returns Dashboard...")
             
-            # Wait for Angular to fully initialize the dropdowns
-            # The dropdowns exist but Angular needs time to make them interactive
-            self._log_status("Waiting for Angular dropdowns to initialize...")
-            
-            # DEBUG: Let's see what elements ARE available to Selenium
-            try:
-                all_selects = self.driver.find_elements(By.TAG_NAME, "select")
-                self._log_status(f"DEBUG: Found {len(all_selects)} select elements total")
-                
-                for i, select in enumerate(all_selects):
-                    try:
-                        name = select.get_attribute("name") or "no-name"
-                        classes = select.get_attribute("class") or "no-class"
-                        visible = select.is_displayed()
-                        enabled = select.is_enabled()
-                        self._log_status(f"DEBUG: Select {i}: name='{name}', class='{classes}', visible={visible}, enabled={enabled}")
-                    except Exception as e:
-                        self._log_status(f"DEBUG: Select {i}: Error getting attributes: {e}")
-                        
-                # Check if we're in the right frame
-                current_url = self.driver.current_url
-                self._log_status(f"DEBUG: Current URL: {current_url}")
-                
-                # Check for iframes
-                iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
-                self._log_status(f"DEBUG: Found {len(iframes)} iframes")
-                
-            except Exception as e:
-                self._log_status(f"DEBUG: Error during debugging: {e}")
+            # Select FY, quarter and period and click Search in one script call;
+            # it waits in the page for each dependent dropdown to be populated
+            self.wait_for_page_ready(WAIT_TIME_LONG)
+            if DEBUG_MODE:
+                self._log_dashboard_dropdowns()
             
-            # DIRECT approach - bypass the broken find_element_with_fallbacks method
-            try:
-                # Since we know the elements exist (debug showed them), use direct calls
-                fin_dropdown = self.driver.find_element(By.NAME, "fin")
-                self._log_status("SUCCESS: Found Financial Year dropdown directly!")
-            except Exception as e:
-                self._log_status(f"DIRECT method failed: {e}")
-                raise
-            
-            # Extra wait for Angular to fully initialize all form states
-            self._log_status("Waiting for Angular to complete initialization...")
-            time.sleep(5)  # Increased wait time for Angular
-            
-            # Select Financial Year - DIRECT approach  
-            try:
-                fin_dropdown = self.driver.find_element(By.NAME, "fin")
-                from selenium.webdriver.support.ui import Select
-                select_fin = Select(fin_dropdown)
-                select_fin.select_by_index(options.financial_year_index)
-                self._log_status(f"SUCCESS: Selected Financial Year (index: {options.financial_year_index})")
-            except Exception as e:
-                self._log_status(f"FAILED: Could not select Financial Year: {e}")
-                raise
-            self._log_status(f"Selected Financial Year (index: {options.financial_year_index})")
-            time.sleep(0.5)
-            
-            # Select Quarter - DIRECT approach
-            try:
-                quarter_dropdown = self.driver.find_element(By.NAME, "quarter")
-                from selenium.webdriver.support.ui import Select
-                select_quarter = Select(quarter_dropdown)
-                select_quarter.select_by_index(options.quarter_index)
-                self._log_status(f"SUCCESS: Selected Quarter (index: {options.quarter_index})")
-            except Exception as e:
-                self._log_status(f"FAILED: Could not select Quarter: {e}")
-                raise
-            self._log_status(f"Selected Quarter (index: {options.quarter_index})")
-            time.sleep(0.5)
-            
-            # Select Period/Month - DIRECT approach
-            try:
-                month_dropdown = self.driver.find_element(By.NAME, "mon")
-                from selenium.webdriver.support.ui import Select
-                select_month = Select(month_dropdown)
-                select_month.select_by_index(options.month_index)
-                self._log_status(f"SUCCESS: Selected Month (index: {options.month_index})")
-            except Exception as e:
-                self._log_status(f"FAILED: Could not select Month: {e}")
-                raise
-            self._log_status(f"Selected Month (index: {options.month_index})")
-            time.sleep(1)
-            
-            # Click Search button - DIRECT approach
-            try:
-                # Try multiple direct approaches for search button
-                search_button = None
-                try:
-                    search_button = self.driver.find_element(By.XPATH, "//button[normalize-space()='SEARCH']")
-                except:
-                    search_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
+            selections = [
+                (Locators.ReturnsDashboard.YEAR_SELECT_NAME, options.financial_year_index),
+                (Locators.ReturnsDashboard.QUARTER_SELECT_NAME, options.quarter_index),
+                (Locators.ReturnsDashboard.MONTH_SELECT_NAME, options.month_index)
+            ]
+            outcome = self.driver.execute_async_script(
+                DASHBOARD_FILTER_SCRIPT,
+                [[name, index] for name, index in selections],
+                [Locators.ReturnsDashboard.SEARCH_BUTTON_XPATH_ALT, Locators.ReturnsDashboard.SEARCH_BUTTON_CSS],
+                WAIT_TIME_LONG * 1000
+            )
+            if outcome.get("error"):
+                raise GSTPortalNavigationError(outcome["error"])
+            self._log_status(f"Selected {' / '.join(outcome['selected'])} and clicked Search")
                 
-                search_button.click()
-                self._log_status("SUCCESS: Clicked Search button")
-            except Exception as e:
-                self._log_status(f"FAILED: Could not click Search button: {e}")
-                raise
-            self._log_status("Clicked Search button on Returns Dashboard")
-            time.sleep(2)
+            # Confirm the search returned the return tiles (each has an offline download button)
+            self.wait_for_page_ready(WAIT_TIME_LONG)
+            self.wait_for_element_ready(
+                [(By.CSS_SELECTOR, Locators.GSTR2B.INITIAL_DOWNLOAD_BUTTON_CSS)],
+                WAIT_TIME_LONG,
+                "Returns Dashboard search results"
+            )
+            self._log_status("Returns Dashboard search results loaded")
             
         except (ElementNotFoundError, Exception) as e:
             error_msg = f"Failed to filter Returns Dashboard: {str(e)}"
             self.logger.error(error_msg)
             raise GSTPortalNavigationError(error_msg) from e
     
-    def download_gstr2b(self) -> None:
+    def _log_dashboard_dropdowns(self) -> None:
+        """Log every <select> and <iframe> on the dashboard (DEBUG_MODE only)."""
+        try:
+            all_selects = self.driver.find_elements(By.TAG_NAME, "select")
+            self.logger.debug(f"Found {len(all_selects)} select elements total")
+            for i, select in enumerate(all_selects):
+                name = select.get_attribute("name") or "no-name"
+                classes = select.get_attribute("class") or "no-class"
+                self.logger.debug(
+                    f"Select {i}: name='{name}', class='{classes}', "
+                    f"visible={select.is_displayed()}, enabled={select.is_enabled()}"
+                )
+            iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
+            self.logger.debug(f"Found {len(iframes)} iframes on {self.driver.current_url}")
+        except Exception as e:
+            self.logger.debug(f"Error while inspecting dashboard dropdowns: {e}")
+    
+    def download_gstr2b(self) -> Optional[DownloadResult]:
         """
         Download GSTR-2B report from Returns Dashboard.
         
+        Returns:
+            Optional[DownloadResult]: The completed download, None if the generate
+                button was not found on the page
+            
         Raises:
-            GSTPortalNavigationError: If download process fails
+            GSTPortalNavigationError: If download process fails or the file does not arrive in time
         """
         try:
             self._log_status("Attempting to download GSTR-2B...")
@@ -431,32 +749,113 @@ class GSTPortalService(WebAutomationService):
                     "GSTR-2B initial download button"
                 )
                 self._log_status("Clicked GSTR-2B 'Download' button")
-                time.sleep(3)
+                self.wait_for_page_ready(WAIT_TIME_LONG)
             except ElementNotFoundError:
                 self._log_status("Initial download button not found - may need to navigate differently")
             
             # Click generate Excel file button
             try:
                 excel_generate_locators = [(By.XPATH, Locators.GSTR2B.GENERATE_EXCEL_BUTTON_XPATH)]
+                download_tracker = self.create_download_tracker()
+                download_tracker.start()
                 self.click_element_with_fallbacks(
                     excel_generate_locators,
                     WAIT_TIME_SHORT,
                     "GSTR-2B generate Excel button"
                 )
                 self._log_status("Clicked 'GENERATE EXCEL FILE TO DOWNLOAD' button")
-                self._log_status("GSTR-2B Excel download should start. Check your 'GST_Downloads' folder.")
-                time.sleep(15)  # Wait for file generation and download
+                self._log_status("Waiting for GSTR-2B Excel download to finish...")
+                
+                # Wait for file generation and download
+                download = download_tracker.wait_for_download(WAIT_TIME_VERY_LONG)
+                self._log_status(f"GSTR-2B downloaded: {download}")
+                return download
                 
             except ElementNotFoundError as e:
                 error_msg = "Could not find 'GENERATE EXCEL FILE TO DOWNLOAD' button"
                 self.logger.error(error_msg)
                 self._log_status("GSTR-2B download failed - button not found on the page")
+                return None
                 
+        except DownloadTimeoutError as e:
+            error_msg = f"GSTR-2B download did not complete: {str(e)}"
+            self.logger.error(error_msg)
+            raise GSTPortalNavigationError(error_msg) from e
         except Exception as e:
             error_msg = f"GSTR-2B download process failed: {str(e)}"
             self.logger.error(error_msg)
             raise GSTPortalNavigationError(error_msg) from e
     
+    def _open_ledger_directly(self, url: str, url_part: str, ledger_name: str) -> bool:
+        """
+        Open a ledger page by loading its authenticated URL.
+        
+        Args:
+            url (str): Ledger page URL
+            url_part (str): URL part that identifies the ledger page
+            ledger_name (str): Ledger name for status messages
+            
+        Returns:
+            bool: True if the ledger page loaded, False if the menus must be used instead
+        """
+        if not LEDGER_DIRECT_NAVIGATION:
+            return False
+            
+        try:
+            self.navigate_to_url(url)
+            self.wait_for_page_ready(WAIT_TIME_LONG)
+        except Exception as e:
+            self.logger.info(f"Direct load of {ledger_name} failed, using the menus: {e}")
+            return False
+            
+        if url_part in self.driver.current_url:
+            self._log_status(f"Opened '{ledger_name}' directly")
+            return True
+            
+        self.logger.info(f"Direct load of {ledger_name} ended at {self.driver.current_url}, using the menus")
+        self.navigate_to_url(WELCOME_PAGE_URL)  # Menus are only reliable from a portal page
+        self.wait_for_page_ready(WAIT_TIME_LONG)
+        return False
+    
+    def _open_ledger_via_menu(self, services_menu_xpath: str, ledgers_link_text: str,
+                              ledger_link_xpath: str, ledger_name: str) -> None:
+        """
+        Open a ledger page through the Services > Ledgers hover menu.
+        
+        Args:
+            services_menu_xpath (str): XPath of the Services menu
+            ledgers_link_text (str): Link text of the Ledgers submenu
+            ledger_link_xpath (str): XPath of the ledger link in the hover menu
+            ledger_name (str): Ledger name for status messages
+        """
+        # Click Services menu
+        services_locators = [(By.XPATH, services_menu_xpath)]
+        self.click_element_with_fallbacks(
+            services_locators,
+            WAIT_TIME_SHORT,
+            "Services menu"
+        )
+        self._log_status("Clicked 'Services' menu")
+        
+        # Hover over Ledgers submenu once the menu has opened
+        ledgers_locators = [(By.LINK_TEXT, ledgers_link_text)]
+        self.wait_for_element_ready(ledgers_locators, WAIT_TIME_SHORT, "Ledgers submenu")
+        self.hover_over_element(
+            ledgers_locators,
+            WAIT_TIME_SHORT,
+            "Ledgers submenu"
+        )
+        self._log_status("Hovered over 'Ledgers' submenu")
+        
+        # Click the ledger from hover menu
+        ledger_locators = [(By.XPATH, ledger_link_xpath)]
+        self.click_element_with_fallbacks(
+            ledger_locators,
+            WAIT_TIME_LONG,
+            f"{ledger_name} link"
+        )
+        self._log_status(f"Clicked '{ledger_name}' from hover menu")
+    
     def navigate_to_credit_ledger(self, options: CreditLedgerOptions) -> None:
         """
         Navigate to Electronic Credit Ledger and set date range.
@@ -469,44 +868,7 @@ class GSTPortalService(WebAutomationService):
         """
         try:
             self._log_status("Navigating to Electronic Credit Ledger...")
-            
-            # Click Services menu
-            services_locators = [(By.XPATH, Locators.CreditLedger.SERVICES_MENU_XPATH)]
-            self.click_element_with_fallbacks(
-                services_locators,
-                WAIT_TIME_SHORT,
-                "Services menu"
-            )
-            self._log_status("Clicked 'Services' menu")
-            time.sleep(1)
-            
-            # Hover over Ledgers submenu
-            ledgers_locators = [(By.LINK_TEXT, Locators.CreditLedger.LEDGERS_SUBMENU_LINK)]
-            self.hover_over_element(
-                ledgers_locators,
-                WAIT_TIME_SHORT,
-                "Ledgers submenu"
-            )
-            self._log_status("Hovered over 'Ledgers' submenu")
-            
-            # Click Electronic Credit Ledger from hover menu
-            credit_ledger_locators = [(By.XPATH, Locators.CreditLedger.DIRECT_LINK_XPATH)]
-            self.click_element_with_fallbacks(
-                credit_ledger_locators,
-                WAIT_TIME_LONG,
-                "Electronic Credit Ledger link"
-            )
-            self._log_status("Clicked 'Electronic Credit Ledger' from hover menu")
-            
-            # Click detailed credit ledger link
-            detailed_link_locators = [(By.CSS_SELECTOR, Locators.CreditLedger.DETAILED_LINK_CSS)]
-            self.click_element_with_fallbacks(
-                detailed_link_locators,
-                WAIT_TIME_LONG,
-                "detailed Electronic Credit Ledger link"
-            )
-            self._log_status("Clicked detailed 'Electronic Credit Ledger' link")
-            time.sleep(2)
+            self._open_credit_ledger_details()
             
             # Set date range
             self._set_credit_ledger_dates(options)
@@ -518,6 +880,26 @@ class GSTPortalService(WebAutomationService):
                 self.save_debug_screenshot("credit_ledger_navigation_error")
             raise GSTPortalNavigationError(error_msg) from e
     
+    def _open_credit_ledger_details(self) -> None:
+        """Open the detailed Electronic Credit Ledger page in the current tab."""
+        if not self._open_ledger_directly(CREDIT_LEDGER_URL, CREDIT_LEDGER_URL_PART, "Electronic Credit Ledger"):
+            self._open_ledger_via_menu(
+                Locators.CreditLedger.SERVICES_MENU_XPATH,
+                Locators.CreditLedger.LEDGERS_SUBMENU_LINK,
+                Locators.CreditLedger.DIRECT_LINK_XPATH,
+                "Electronic Credit Ledger"
+            )
+            
+        # Click detailed credit ledger link
+        detailed_link_locators = [(By.CSS_SELECTOR, Locators.CreditLedger.DETAILED_LINK_CSS)]
+        self.click_element_with_fallbacks(
+            detailed_link_locators,
+            WAIT_TIME_LONG,
+            "detailed Electronic Credit Ledger link"
+        )
+        self._log_status("Clicked detailed 'Electronic Credit Ledger' link")
+        self.wait_for_page_ready(WAIT_TIME_LONG)
+    
     def _set_credit_ledger_dates(self, options: CreditLedgerOptions) -> None:
         """
         Set date range for credit ledger query.
@@ -526,55 +908,254 @@ class GSTPortalService(WebAutomationService):
             options (CreditLedgerOptions): Date range options
         """
         try:
-            self._log_status(f"Setting credit ledger dates: From {options.from_date} To {options.to_date}")
+            self._submit_credit_ledger_dates(options)
+            self.wait_for_page_ready(WAIT_TIME_LONG)
             
-            # Set From Date
-            from_date_locators = [(By.ID, Locators.CreditLedger.FROM_DATE_FIELD_ID)]
-            from_date_element = self.find_element_with_fallbacks(
-                from_date_locators,
-                WAIT_TIME_SHORT,
-                "From Date field"
-            )
-            from_date_element.clear()
-            from_date_element.click()
-            from_date_element.send_keys(options.from_date)
-            self._log_status(f"Entered 'From Date': {options.from_date}")
+        except Exception as e:
+            error_msg = f"Could not set credit ledger dates: {str(e)}"
+            self.logger.warning(error_msg)
+            self._log_status("Date setting failed - you may need to set dates manually")
             
-            # Click elsewhere to close date picker
+            # Give the user time to set dates manually; continue as soon as the ledger shows up
+            try:
+                self._read_ledger_table(
+                    Locators.CreditLedger.DETAIL_TABLE_ANCHOR_CSS,
+                    Locators.CreditLedger.DETAIL_TABLE_CSS,
+                    Locators.CreditLedger.DETAIL_TABLE_COLUMNS,
+                    WAIT_TIME_LONG,
+                    "credit ledger details"
+                )
+                self._log_status("Credit ledger details loaded")
+            except (AutomationTimeoutError, LedgerExtractionError):
+                self._log_status("Credit ledger details did not load - continuing")
+    
+    def _submit_credit_ledger_dates(self, options: CreditLedgerOptions) -> None:
+        """
+        Enter a date range on the detailed credit ledger page and click GO.
+        
+        Does not wait for the results, so several tabs can query at once.
+        
+        Args:
+            options (CreditLedgerOptions): Date range options
+        """
+        self._log_status(f"Setting credit ledger dates: From {options.from_date} To {options.to_date}")
+        
+        # Set From Date and To Date together
+        self.wait_for_element_ready(
+            [(By.ID, Locators.CreditLedger.FROM_DATE_FIELD_ID)],
+            WAIT_TIME_SHORT,
+            "From Date field"
+        )
+        filled_by_script = self.fill_inputs(
+            [
+                (By.ID, Locators.CreditLedger.FROM_DATE_FIELD_ID, options.from_date),
+                (By.ID, Locators.CreditLedger.TO_DATE_FIELD_ID, options.to_date)
+            ],
+            WAIT_TIME_SHORT,
+            "credit ledger dates"
+        )
+        self._log_status(f"Entered 'From Date': {options.from_date}, 'To Date': {options.to_date}")
+        
+        if not filled_by_script:
+            # Typing opens the date picker; click elsewhere to close it
             self.execute_javascript("document.body.click();")
-            time.sleep(0.5)
+        
+        # Click GO button
+        go_button_locators = [(By.CSS_SELECTOR, Locators.CreditLedger.GO_BUTTON_CSS)]
+        self.click_element_with_fallbacks(
+            go_button_locators,
+            WAIT_TIME_SHORT,
+            "GO button"
+        )
+        self._log_status("Clicked 'GO' button for credit ledger dates")
+    
+    def extract_credit_ledger(self, credentials: ClientCredentials) -> "pd.DataFrame":
+        """
+        Read the credit ledger shown for the selected date range into the ledger store.
+        
+        The whole table is read in one script call instead of one WebDriver
+        call per cell. Must be called after navigate_to_credit_ledger().
+        
+        Args:
+            credentials (ClientCredentials): Client the ledger belongs to
             
-            # Set To Date
-            to_date_locators = [(By.ID, Locators.CreditLedger.TO_DATE_FIELD_ID)]
-            to_date_element = self.find_element_with_fallbacks(
-                to_date_locators,
-                WAIT_TIME_SHORT,
-                "To Date field"
-            )
-            to_date_element.clear()
-            to_date_element.click()
-            to_date_element.send_keys(options.to_date)
-            self._log_status(f"Entered 'To Date': {options.to_date}")
+        Returns:
+            pd.DataFrame: Typed ledger rows (date, reference, IGST/CGST/SGST/cess, balance)
             
-            # Click elsewhere to close date picker
-            self.execute_javascript("document.body.click();")
-            time.sleep(0.5)
+        Raises:
+            AutomationTimeoutError: If the ledger table does not appear
+            LedgerExtractionError: If the table columns cannot be recognized
+        """
+        frame = self._read_credit_ledger_table(credentials)
+        path = self.ledger_store.append(credentials.client_name, credentials.username, CREDIT_LEDGER_NAME, frame)
+        self.credit_ledger = frame
+        self._log_status(f"Extracted {len(frame)} credit ledger entries to {path}")
+        return frame
+    
+    def extract_credit_ledger_windows(self, credentials: ClientCredentials,
+                                      windows: List[CreditLedgerOptions]) -> "pd.DataFrame":
+        """
+        Read a long credit ledger range that was split into date windows.
+        
+        Must be called after navigate_to_credit_ledger(windows[0]). The other
+        windows are queried in extra tabs of the same session, up to
+        CREDIT_LEDGER_PARALLEL_TABS at a time, so the portal works on them
+        together. Windows whose tab cannot be opened are queried one by one
+        in the current tab. All rows are merged, de-duplicated and stored.
+        
+        Args:
+            credentials (ClientCredentials): Client the ledger belongs to
+            windows (List[CreditLedgerOptions]): Consecutive date windows (see CreditLedgerOptions.split)
             
-            # Click GO button
-            go_button_locators = [(By.CSS_SELECTOR, Locators.CreditLedger.GO_BUTTON_CSS)]
-            self.click_element_with_fallbacks(
-                go_button_locators,
-                WAIT_TIME_SHORT,
-                "GO button"
-            )
-            self._log_status("Clicked 'GO' button for credit ledger dates")
-            time.sleep(2)
+        Returns:
+            pd.DataFrame: Merged ledger rows of the whole range
+            
+        Raises:
+            AutomationTimeoutError: If a window's ledger table does not appear
+            LedgerExtractionError: If the table columns cannot be recognized
+        """
+        frames = [self._read_credit_ledger_table(credentials)]
+        main_handle = self.driver.current_window_handle
+        opened: List[str] = []
+        tab_windows = windows[1:] if CREDIT_LEDGER_PARALLEL_TABS > 1 else []
+        sequential = windows[1:] if not tab_windows else []
+        
+        try:
+            for group_start in range(0, len(tab_windows), CREDIT_LEDGER_PARALLEL_TABS):
+                group = tab_windows[group_start:group_start + CREDIT_LEDGER_PARALLEL_TABS]
+                
+                # Submit every window of the group first, then collect the results
+                for window in group:
+                    handle = self._open_credit_ledger_tab(window, main_handle)
+                    if handle:
+                        opened.append(handle)
+                    else:
+                        sequential.append(window)
+                        
+                while opened:
+                    self.driver.switch_to.window(opened[0])
+                    frames.append(self._read_credit_ledger_table(credentials))
+                    self.driver.close()
+                    opened.pop(0)
+                self.driver.switch_to.window(main_handle)
+        finally:
+            self._close_tabs(opened, main_handle)
+            
+        for window in sequential:
+            self._submit_credit_ledger_dates(window)
+            self.wait_for_page_ready(WAIT_TIME_LONG)
+            frames.append(self._read_credit_ledger_table(credentials))
+            
+        merged = merge_ledger_frames(frames)
+        path = self.ledger_store.append(credentials.client_name, credentials.username, CREDIT_LEDGER_NAME, merged)
+        self.credit_ledger = merged
+        self._log_status(
+            f"Extracted {len(merged)} credit ledger entries from {len(windows)} date windows to {path}"
+        )
+        return merged
+    
+    def _read_credit_ledger_table(self, credentials: ClientCredentials) -> "pd.DataFrame":
+        """
+        Wait for the credit ledger table in the current tab and read it in one script call.
+        
+        Args:
+            credentials (ClientCredentials): Client the ledger belongs to
             
+        Returns:
+            pd.DataFrame: Typed ledger rows
+        """
+        table = self._read_ledger_table(
+            Locators.CreditLedger.DETAIL_TABLE_ANCHOR_CSS,
+            Locators.CreditLedger.DETAIL_TABLE_CSS,
+            Locators.CreditLedger.DETAIL_TABLE_COLUMNS,
+            WAIT_TIME_LONG,
+            "credit ledger table"
+        )
+        return build_credit_ledger_frame(table["headers"], table["rows"], credentials.client_name)
+    
+    def _read_ledger_table(self, anchor_css: str, table_css: str, columns: List[str],
+                           timeout: float, description: str) -> Dict[str, Any]:
+        """
+        Wait for a ledger table near an anchor element and read it in one script call.
+        
+        Args:
+            anchor_css (str): CSS selector of the element the table belongs to
+            table_css (str): CSS selector of the table within that element's container
+            columns (List[str]): Required column keywords (see LEDGER_TABLE_SCRIPT)
+            timeout (float): Maximum time to wait for the table
+            description (str): Table description for logging
+            
+        Returns:
+            Dict[str, Any]: The table's flattened headers and body rows
+            
+        Raises:
+            AutomationTimeoutError: If no table appears within the timeout
+            LedgerExtractionError: If tables appear but none has the required columns
+        """
+        last_mismatch: Dict[str, Any] = {}
+        
+        def read_table() -> Optional[Dict[str, Any]]:
+            table = self.driver.execute_script(LEDGER_TABLE_SCRIPT, anchor_css, table_css, columns)
+            if table and table["missing"]:
+                last_mismatch.update(table)
+                return None
+            return table
+            
+        try:
+            return self.wait_until(read_table, timeout, description)
+        except AutomationTimeoutError as e:
+            if last_mismatch:
+                raise LedgerExtractionError(
+                    f"The {description} has no {', '.join(last_mismatch['missing'])} column "
+                    f"(headers: {last_mismatch['headers']}) - the portal layout may have changed"
+                ) from e
+            raise
+    
+    def _open_credit_ledger_tab(self, window: CreditLedgerOptions, main_handle: str) -> Optional[str]:
+        """
+        Open a new tab on the detailed credit ledger and submit a date window.
+        
+        Args:
+            window (CreditLedgerOptions): Date window to query
+            main_handle (str): Tab to return to if the new tab cannot be used
+            
+        Returns:
+            Optional[str]: Handle of the new tab, None if the session does not allow it
+        """
+        handle = None
+        try:
+            self.driver.switch_to.new_window("tab")
+            handle = self.driver.current_window_handle
+            if not LEDGER_DIRECT_NAVIGATION:
+                # The hover menus need a portal page to start from
+                self.navigate_to_url(WELCOME_PAGE_URL)
+                self.wait_for_page_ready(WAIT_TIME_LONG)
+            self._open_credit_ledger_details()
+            self._submit_credit_ledger_dates(window)
+            return handle
         except Exception as e:
-            error_msg = f"Could not set credit ledger dates: {str(e)}"
-            self.logger.warning(error_msg)
-            self._log_status("Date setting failed - you may need to set dates manually")
-            time.sleep(15)  # Pause for manual intervention if needed
+            self.logger.warning(f"Could not query credit ledger window in a new tab, will retry in the main tab: {e}")
+            if handle:
+                try:
+                    self.driver.close()
+                except Exception:
+                    pass
+            self.driver.switch_to.window(main_handle)
+            return None
+    
+    def _close_tabs(self, handles: List[str], main_handle: str) -> None:
+        """
+        Close the given tabs and switch back to the main one.
+        
+        Args:
+            handles (List[str]): Tabs to close
+            main_handle (str): Tab to switch back to
+        """
+        for handle in handles:
+            if handle in self.driver.window_handles:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+        self.driver.switch_to.window(main_handle)
     
     def navigate_to_cash_ledger(self) -> None:
         """
@@ -585,52 +1166,371 @@ class GSTPortalService(WebAutomationService):
         """
         try:
             self._log_status("Navigating to Electronic Cash Ledger...")
+            self._open_cash_ledger_page()
+            self._open_cash_balance_details()
             
-            # Click Services menu
-            services_locators = [(By.XPATH, Locators.CashLedger.SERVICES_MENU_XPATH)]
-            self.click_element_with_fallbacks(
-                services_locators,
-                WAIT_TIME_SHORT,
-                "Services menu"
-            )
-            self._log_status("Clicked 'Services' menu")
-            time.sleep(1)
-            
-            # Hover over Ledgers submenu
-            ledgers_locators = [(By.LINK_TEXT, Locators.CashLedger.LEDGERS_SUBMENU_LINK)]
-            self.hover_over_element(
-                ledgers_locators,
-                WAIT_TIME_SHORT,
-                "Ledgers submenu"
+        except Exception as e:
+            error_msg = f"Failed to navigate to Electronic Cash Ledger: {str(e)}"
+            self.logger.error(error_msg)
+            if self.save_debug_screenshot:
+                self.save_debug_screenshot("cash_ledger_navigation_error")
+            raise GSTPortalNavigationError(error_msg) from e
+    
+    def _open_cash_ledger_page(self) -> None:
+        """Open the Electronic Cash Ledger page in the current tab."""
+        if not self._open_ledger_directly(CASH_LEDGER_URL, CASH_LEDGER_URL_PART, "Electronic Cash Ledger"):
+            self._open_ledger_via_menu(
+                Locators.CashLedger.SERVICES_MENU_XPATH,
+                Locators.CashLedger.LEDGERS_SUBMENU_LINK,
+                Locators.CashLedger.DIRECT_LINK_XPATH,
+                "Electronic Cash Ledger"
             )
-            self._log_status("Hovered over 'Ledgers' submenu")
+            self.wait_for_page_ready(WAIT_TIME_LONG)
+    
+    def _open_cash_balance_details(self) -> None:
+        """Open the balance details modal on the Electronic Cash Ledger page."""
+        balance_details_locators = [(By.CSS_SELECTOR, Locators.CashLedger.BALANCE_DETAILS_CSS)]
+        self.click_element_with_fallbacks(
+            balance_details_locators,
+            WAIT_TIME_LONG,
+            "cash ledger balance details link"
+        )
+        self._log_status("Clicked link to view cash ledger balance details")
+        self.wait_for_element_ready(
+            [(By.CSS_SELECTOR, Locators.CashLedger.BALANCE_MODAL_CSS)],
+            WAIT_TIME_LONG,
+            "cash ledger balance details"
+        )
+    
+    def fetch_credit_ledger(self, credentials: ClientCredentials,
+                            credit_ledger_options: CreditLedgerOptions) -> None:
+        """
+        Open the Electronic Credit Ledger for a date range and extract its rows.
+        
+        Args:
+            credentials (ClientCredentials): Client the ledger belongs to
+            credit_ledger_options (CreditLedgerOptions): Credit Ledger date range
             
-            # Click Electronic Cash Ledger from hover menu
-            cash_ledger_locators = [(By.XPATH, Locators.CashLedger.DIRECT_LINK_XPATH)]
-            self.click_element_with_fallbacks(
-                cash_ledger_locators,
-                WAIT_TIME_LONG,
-                "Electronic Cash Ledger link"
-            )
-            self._log_status("Clicked 'Electronic Cash Ledger' from hover menu")
-            time.sleep(2)
+        Raises:
+            GSTPortalNavigationError: If the ledger cannot be opened
+        """
+        windows = self._get_credit_ledger_windows(credit_ledger_options)
+        self.navigate_to_credit_ledger(windows[0])
+        self._extract_credit_ledger_step(credentials, windows)
+    
+    def fetch_cash_ledger(self, credentials: ClientCredentials) -> None:
+        """
+        Open the Electronic Cash Ledger balance details and extract the balances.
+        
+        Args:
+            credentials (ClientCredentials): Client the ledger belongs to
             
-            # Click balance details link
-            balance_details_locators = [(By.CSS_SELECTOR, Locators.CashLedger.BALANCE_DETAILS_CSS)]
-            self.click_element_with_fallbacks(
-                balance_details_locators,
-                WAIT_TIME_LONG,
-                "cash ledger balance details link"
-            )
-            self._log_status("Clicked link to view cash ledger balance details")
-            time.sleep(3)
+        Raises:
+            GSTPortalNavigationError: If the ledger cannot be opened
+        """
+        self.navigate_to_cash_ledger()
+        self._extract_cash_ledger_step(credentials)
+    
+    def fetch_ledgers_in_tabs(self, credentials: ClientCredentials,
+                              credit_ledger_options: CreditLedgerOptions) -> None:
+        """
+        Fetch the credit and cash ledgers concurrently in two tabs.
+        
+        The cash ledger loads in a second tab while the credit ledger query
+        runs in the first, so the client takes about as long as the slower
+        ledger. The cash ledger tab stays open next to the credit ledger; if
+        it cannot be used, the cash ledger is opened in the main tab afterwards.
+        The cash ledger is fetched even when the credit ledger fails.
+        
+        Args:
+            credentials (ClientCredentials): Client the ledgers belong to
+            credit_ledger_options (CreditLedgerOptions): Credit Ledger date range
             
+        Raises:
+            GSTPortalNavigationError: If the credit ledger cannot be opened
+        """
+        windows = self._get_credit_ledger_windows(credit_ledger_options)
+        main_handle = self.driver.current_window_handle
+        cash_handle = self._start_cash_ledger_tab(main_handle)
+        
+        try:
+            self._log_status("Navigating to Electronic Credit Ledger...")
+            self._open_credit_ledger_details()
+            self._submit_credit_ledger_dates(windows[0])
         except Exception as e:
-            error_msg = f"Failed to navigate to Electronic Cash Ledger: {str(e)}"
+            error_msg = f"Failed to navigate to Electronic Credit Ledger: {str(e)}"
             self.logger.error(error_msg)
-            if self.save_debug_screenshot:
-                self.save_debug_screenshot("cash_ledger_navigation_error")
+            # The cash ledger does not depend on the credit ledger
+            try:
+                if not self._fetch_cash_ledger_tab(credentials, cash_handle, main_handle):
+                    self.fetch_cash_ledger(credentials)
+            except Exception as cash_error:
+                self.logger.error(f"Cash ledger failed as well: {cash_error}")
             raise GSTPortalNavigationError(error_msg) from e
+            
+        # The portal works on the credit ledger query while the cash tab is handled
+        cash_done = self._fetch_cash_ledger_tab(credentials, cash_handle, main_handle)
+            
+        self.wait_for_page_ready(WAIT_TIME_LONG)
+        self._extract_credit_ledger_step(credentials, windows)
+        
+        if not cash_done:
+            self.fetch_cash_ledger(credentials)
+    
+    def _fetch_cash_ledger_tab(self, credentials: ClientCredentials,
+                               cash_handle: Optional[str], main_handle: str) -> bool:
+        """
+        Finish the cash ledger in the tab started by _start_cash_ledger_tab().
+        
+        The tab is closed if it fails, and the main tab is active again afterwards.
+        
+        Args:
+            credentials (ClientCredentials): Client the ledger belongs to
+            cash_handle (Optional[str]): Handle of the cash ledger tab, None if it was not opened
+            main_handle (str): Tab to switch back to
+            
+        Returns:
+            bool: True if the cash ledger was fetched, False if it still has to be fetched
+        """
+        if not cash_handle:
+            return False
+            
+        cash_done = False
+        try:
+            self.driver.switch_to.window(cash_handle)
+            self.wait_for_page_ready(WAIT_TIME_LONG)
+            if CASH_LEDGER_URL_PART not in self.driver.current_url:
+                self._open_cash_ledger_page()
+            self._open_cash_balance_details()
+            self._extract_cash_ledger_step(credentials)
+            cash_done = True
+        except Exception as e:
+            self.logger.warning(f"Cash ledger tab failed, opening it in the main tab: {e}")
+        finally:
+            if cash_done:
+                self.driver.switch_to.window(main_handle)
+            else:
+                self._close_tabs([cash_handle], main_handle)
+        return cash_done
+    
+    def _start_cash_ledger_tab(self, main_handle: str) -> Optional[str]:
+        """
+        Open a second tab and start loading the cash ledger without waiting for it.
+        
+        Args:
+            main_handle (str): Tab to switch back to
+            
+        Returns:
+            Optional[str]: Handle of the cash ledger tab, None if it could not be opened
+        """
+        handle = None
+        try:
+            self.driver.switch_to.new_window("tab")
+            handle = self.driver.current_window_handle
+            # Assigning location returns at once, unlike driver.get(); the menus need a portal page
+            url = CASH_LEDGER_URL if LEDGER_DIRECT_NAVIGATION else WELCOME_PAGE_URL
+            self.driver.execute_script("window.location.href = arguments[0];", url)
+            self._log_status("Loading Electronic Cash Ledger in a second tab")
+        except Exception as e:
+            self.logger.warning(f"Could not open a second tab for the cash ledger: {e}")
+            if handle:
+                self.driver.close()
+            handle = None
+        self.driver.switch_to.window(main_handle)
+        return handle
+    
+    def _get_credit_ledger_windows(self, options: CreditLedgerOptions) -> List[CreditLedgerOptions]:
+        """
+        Get the date windows to query for a credit ledger range.
+        
+        Long ranges are only split when the rows are extracted; otherwise the
+        range is shown as entered.
+        
+        Args:
+            options (CreditLedgerOptions): Credit Ledger date range
+            
+        Returns:
+            List[CreditLedgerOptions]: Windows to query, the first one in the main tab
+        """
+        windows = options.split(CREDIT_LEDGER_MAX_SPAN_DAYS)
+        if not CREDIT_LEDGER_EXTRACTION_ENABLED or len(windows) == 1:
+            return [options]
+        return windows
+    
+    def _extract_credit_ledger_step(self, credentials: ClientCredentials,
+                                    windows: List[CreditLedgerOptions]) -> None:
+        """
+        Extract the credit ledger shown on screen, if extraction is enabled.
+        
+        Failures are logged and not raised: the ledger stays on screen for manual copying.
+        
+        Args:
+            credentials (ClientCredentials): Client the ledger belongs to
+            windows (List[CreditLedgerOptions]): Date windows, the first one already queried
+        """
+        if not CREDIT_LEDGER_EXTRACTION_ENABLED:
+            return
+        try:
+            if len(windows) > 1:
+                self.extract_credit_ledger_windows(credentials, windows)
+            else:
+                self.extract_credit_ledger(credentials)
+        except Exception as e:
+            self.logger.warning(f"Credit ledger extraction failed: {e}")
+            self._log_status("Could not read the credit ledger table - please copy it manually")
+    
+    def _extract_cash_ledger_step(self, credentials: ClientCredentials) -> None:
+        """
+        Extract the cash ledger balance shown on screen, if extraction is enabled.
+        
+        Failures are logged and not raised: the balance details stay open for a visual check.
+        
+        Args:
+            credentials (ClientCredentials): Client the balance belongs to
+        """
+        if not CASH_LEDGER_EXTRACTION_ENABLED:
+            return
+        try:
+            self.extract_cash_ledger_balance(credentials)
+        except Exception as e:
+            self.logger.warning(f"Cash ledger extraction failed: {e}")
+            self._log_status("Could not read the cash ledger balances - please check them manually")
+    
+    def extract_cash_ledger_balance(self, credentials: ClientCredentials) -> CashLedgerBalance:
+        """
+        Read the cash ledger balance details into a typed record.
+        
+        The balance table is read in one script call. Must be called after
+        navigate_to_cash_ledger() has opened the balance details.
+        
+        Args:
+            credentials (ClientCredentials): Client the balance belongs to
+            
+        Returns:
+            CashLedgerBalance: Tax, interest, penalty, fee and other balances per tax type
+            
+        Raises:
+            AutomationTimeoutError: If the balance table does not appear
+            LedgerExtractionError: If the table lacks the balance columns or no balances can be recognized
+        """
+        table = self._read_ledger_table(
+            Locators.CashLedger.BALANCE_MODAL_CSS,
+            Locators.CashLedger.BALANCE_TABLE_CSS,
+            Locators.CashLedger.BALANCE_TABLE_COLUMNS,
+            WAIT_TIME_SHORT,
+            "cash ledger balance table"
+        )
+        balance = build_cash_ledger_balance(table["headers"], table["rows"], credentials.client_name)
+        self.cash_balance = balance
+        self._log_status(f"Cash ledger balance: {balance.get_total():,.2f}")
+        return balance
+    
+    def store_download(self, download: DownloadResult, credentials: ClientCredentials,
+                       return_type: str, options: ReturnsDashboardOptions) -> DownloadResult:
+        """
+        File a finished download under the client, return type and period.
+        
+        Args:
+            download (DownloadResult): Completed download in this run's download directory
+            credentials (ClientCredentials): Client the file belongs to
+            return_type (str): Return type (e.g. "GSTR-2B")
+            options (ReturnsDashboardOptions): Period the file was downloaded for
+            
+        Returns:
+            DownloadResult: The download at its final location
+        """
+        filed = self.download_layout.file_download(
+            download,
+            client_name=credentials.client_name,
+            username=credentials.username,
+            return_type=return_type,
+            financial_year=options.get_financial_year_label(),
+            period=options.get_period_label()
+        )
+        self.downloads.append(filed)
+        self._log_status(f"Saved {return_type} to {filed.path}")
+        return filed
+    
+    def find_existing_gstr2b(self, credentials: ClientCredentials,
+                             options: ReturnsDashboardOptions) -> Optional[DownloadResult]:
+        """
+        Look up a GSTR-2B file already downloaded for the client and period.
+        
+        Args:
+            credentials (ClientCredentials): Client to look up
+            options (ReturnsDashboardOptions): Period to look up
+            
+        Returns:
+            Optional[DownloadResult]: The valid existing file, None if it must be downloaded
+        """
+        return self.download_layout.find_existing(
+            credentials.client_name,
+            credentials.username,
+            "GSTR-2B",
+            options.get_financial_year_label(),
+            options.get_period_label()
+        )
+    
+    def return_to_returns_dashboard(self) -> None:
+        """
+        Go back to the Returns Dashboard from a return page (e.g. GSTR-2B).
+        
+        Uses browser history, which is much cheaper than navigating through
+        the menus again; falls back to loading the welcome page and opening
+        the dashboard from there if history does not lead back to it.
+        """
+        if RETURNS_DASHBOARD_URL_PART in self.driver.current_url:
+            return
+            
+        self.driver.back()
+        if self.wait_for_url_change(RETURNS_DASHBOARD_URL_PART, WAIT_TIME_SHORT):
+            self.wait_for_page_ready(WAIT_TIME_LONG)
+        else:
+            self.logger.info("Browser history did not return to the dashboard - navigating again")
+            self._open_step_start_page(PAGE_DASHBOARD)  # The dashboard button is only on the welcome page
+    
+    def sweep_gstr2b_periods(self, credentials: ClientCredentials,
+                             periods: List[ReturnsDashboardOptions]) -> List[PeriodRunResult]:
+        """
+        Download GSTR-2B for several periods within the current logged-in session.
+        
+        Must be called on the Returns Dashboard. Between periods only the
+        dashboard filters change; a failed period is recorded and the sweep
+        continues with the next one.
+        
+        Args:
+            credentials (ClientCredentials): Client the files belong to
+            periods (List[ReturnsDashboardOptions]): Single-month options to download
+            
+        Returns:
+            List[PeriodRunResult]: One result per period, in the order given
+        """
+        results = []
+        for position, period in enumerate(periods, start=1):
+            label = period.get_display_label()
+            self._log_status(f"GSTR-2B period {position}/{len(periods)}: {label}")
+            result = PeriodRunResult(period_label=label)
+            started_at = time.time()
+            
+            try:
+                if position > 1:
+                    self.return_to_returns_dashboard()
+                self.filter_returns_dashboard(period)
+                download = self.download_gstr2b()
+                if download:
+                    result.download = self.store_download(download, credentials, "GSTR-2B", period)
+                    result.success = True
+                else:
+                    result.error = "GSTR-2B generate button not found"
+            except Exception as e:
+                result.error = str(e)
+                self.logger.error(f"GSTR-2B download for {label} failed: {e}")
+                
+            result.duration_seconds = time.time() - started_at
+            self._log_status(str(result))
+            results.append(result)
+            
+        return results
     
     def execute_automation_workflow(self, credentials: ClientCredentials, 
                                   settings: AutomationSettings,
@@ -650,51 +1550,118 @@ class GSTPortalService(WebAutomationService):
         Returns:
             bool: True if workflow completed successfully, False otherwise
         """
+        self.last_error = None
+        self.downloads = []
+        self.reused_downloads = []
+        self.period_results = []
+        self.credit_ledger = None
+        self.cash_balance = None
+        self.workflow_plan = None
+        if self._staged_login is None:
+            self.command_profiler.reset()  # Keep the commands of a pre-staged login
+        
+        # GSTR-2B periods to fetch; incremental mode reuses files already on disk
+        pending_periods = returns_options.get_periods() if settings.download_gstr2b else []
+        if pending_periods and settings.skip_existing_downloads:
+            remaining_periods = []
+            for period in pending_periods:
+                existing = self.find_existing_gstr2b(credentials, period)
+                if existing:
+                    self.reused_downloads.append(existing)
+                    self.period_results.append(PeriodRunResult(
+                        period_label=period.get_display_label(),
+                        success=True,
+                        download=existing,
+                        reused=True
+                    ))
+                    self._log_status(f"GSTR-2B already downloaded, skipping: {existing.path}")
+                else:
+                    remaining_periods.append(period)
+            pending_periods = remaining_periods
+                
+            if not pending_periods and not settings.requires_ledgers():
+                self._log_status("Nothing left to fetch from the portal - login skipped.")
+                self._log_status(StatusMessages.AUTOMATION_COMPLETE)
+                if self.driver:
+                    self.release_browser()  # Browser was pre-staged for nothing
+                return True
+        
         try:
-            # Initialize WebDriver
-            self.initialize_webdriver()
+            # Initialize WebDriver with a download directory private to this run
+            with self.command_profiler.step("setup"):
+                self.prepare_browser(credentials)
             
-            # Perform login
-            login_success = self.perform_login(credentials)
-            if not login_success:
-                self._log_status("Login failed or timed out")
-                return False
+            # Compile the selected actions into ordered steps (not needed when all GSTR-2B files were reused)
+            plan = compile_workflow_plan(settings, has_pending_periods=bool(pending_periods))
+            self.workflow_plan = plan
+            self.logger.info(f"Workflow plan: {plan.describe()}")
             
-            # Execute selected actions
-            if settings.just_login and not settings.requires_returns_dashboard() and not settings.access_credit_ledger and not settings.access_cash_ledger:
+            step_actions = {
+                STEP_LOGIN: lambda: self.perform_login(credentials),
+                STEP_RETURNS_DASHBOARD: self.navigate_to_returns_dashboard,
+                STEP_FILTER_DASHBOARD: lambda: self.filter_returns_dashboard(returns_options),
+                STEP_GSTR2B: lambda: self.period_results.extend(
+                    self.sweep_gstr2b_periods(credentials, pending_periods)
+                ),
+                STEP_CREDIT_LEDGER: lambda: self.fetch_credit_ledger(credentials, credit_ledger_options),
+                STEP_CASH_LEDGER: lambda: self.fetch_cash_ledger(credentials),
+                STEP_LEDGERS: lambda: self.fetch_ledgers_in_tabs(credentials, credit_ledger_options),
+            }
+            current_page = None
+            for step in plan.steps:
+                with self.command_profiler.step(step.name):
+                    if current_page is not None and step.start_page not in (None, current_page):
+                        self._open_step_start_page(step.start_page)
+                    result = plan.run_step(step, step_actions[step.name])
+                current_page = step.end_page
+                if step.name == STEP_LOGIN and not result:
+                    self.last_error = "Login failed or timed out"
+                    self._log_status(self.last_error)
+                    return False
+                    
+            if plan.get_step_names() == [STEP_LOGIN] and settings.just_login:
                 self._log_status("Action: Just Login selected. Automation will stop here.")
                 return True
             
-            # Returns Dashboard workflow
-            if settings.requires_returns_dashboard():
-                self.navigate_to_returns_dashboard()
-                self.filter_returns_dashboard(returns_options)
-                
-                if settings.download_gstr2b:
-                    self.download_gstr2b()
-            
-            # Electronic Credit Ledger workflow
-            if settings.access_credit_ledger:
-                self.navigate_to_credit_ledger(credit_ledger_options)
-            
-            # Electronic Cash Ledger workflow
-            if settings.access_cash_ledger:
-                self.navigate_to_cash_ledger()
+            failed_periods = [result.period_label for result in self.period_results if not result.success]
+            if failed_periods:
+                self.last_error = f"GSTR-2B download failed for: {', '.join(failed_periods)}"
+                self._log_status(f"Error: {self.last_error}")
+                return False
             
             self._log_status(StatusMessages.AUTOMATION_COMPLETE)
             return True
             
         except Exception as e:
             error_msg = f"Automation workflow failed: {str(e)}"
+            self.last_error = error_msg
             self.logger.error(error_msg)
             self._log_status(f"Error: {error_msg}")
             return False
         finally:
+            if self.workflow_plan:
+                self.logger.info(self.workflow_plan.get_timing_summary())
+            if COMMAND_PROFILING_ENABLED:
+                self.logger.info(self.command_profiler.get_report())
+                
             # Conditional cleanup based on keep_browser_open setting
             if keep_browser_open:
                 self._log_status("Browser will remain open for continued use")
                 self._log_status("Note: You can manually close the browser when finished")
             else:
-                time.sleep(5)  # Brief pause before closing
-                self.close_webdriver()
-                self._log_status(StatusMessages.BROWSER_CLOSED)
\ No newline at end of file
+                self.release_browser()
+    
+    def release_browser(self) -> None:
+        """
+        Close the browser and remove the run's download directory.
+        
+        The portal session is saved first so its age counts from the last activity.
+        """
+        self.save_session()
+        self.remove_popup_watcher()
+        self.close_webdriver()
+        self._staged_login = None
+        self._log_status(StatusMessages.BROWSER_CLOSED)
+        if self._run_download_dir:
+            self.download_layout.cleanup_run_directory(self._run_download_dir)
+            self._run_download_dir = None
\ No newline at end of file
@@ -0,0 +1,526 @@
+"""
+Electronic ledger extraction for GST Automation Application.
+
+This module reads ledger tables shown on the GST portal in a single
+injected script call, converts them to typed pandas DataFrames and appends
+them to a per-client columnar store inside the download tree:
+
+    GST_Downloads/<client>_<username>/Ledgers/<ledger>.parquet
+
+pandas is imported only when a ledger is actually converted or stored, so
+the rest of the application (login, GSTR-2B downloads) works without it.
+Parquet needs the optional pyarrow package; without it the store falls
+back to CSV files with the same columns.
+
+Author: Srinidhi B S
+"""
+import os
+import math
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import pyarrow  # Optional: enables the Parquet ledger store
+except ImportError:
+    pyarrow = None
+
+from config.settings import LEDGER_STORE_FOLDER_NAME
+from services.download_layout import client_folder_name
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Ledger names used for store file names
+CREDIT_LEDGER_NAME = "credit_ledger"
+
+# Columns of an extracted Electronic Credit Ledger, in store order
+CREDIT_LEDGER_COLUMNS = [
+    "client_name", "date", "reference", "description", "transaction_type",
+    "igst", "cgst", "sgst", "cess", "total", "balance", "fetched_at"
+]
+CREDIT_LEDGER_AMOUNT_COLUMNS = ["igst", "cgst", "sgst", "cess", "total", "balance"]
+CREDIT_LEDGER_TEXT_COLUMNS = ["client_name", "reference", "description", "transaction_type"]
+
+# Cash ledger balances: major heads (tax types) and minor heads, with the
+# label keywords used to recognize them in the balance details table
+CASH_LEDGER_MAJOR_HEADS = {
+    "igst": ["igst", "integrated"],
+    "cgst": ["cgst", "central"],
+    "sgst": ["sgst", "utgst", "state"],
+    "cess": ["cess"],
+}
+CASH_LEDGER_MINOR_HEADS = {
+    "tax": ["tax"],
+    "interest": ["interest"],
+    "penalty": ["penalty"],
+    "fee": ["fee"],
+    "others": ["other"],
+}
+
+# Reads a ledger table in one round trip. Only tables in the smallest
+# container around the anchor element (e.g. the ledger's GO button or the
+# balance modal) are considered, never the rest of the page. Multi-row
+# headers (colspan/rowspan) are flattened so every column gets its full
+# label, e.g. "Credit / Debit IGST". Each required column is a lower-case
+# keyword, or several alternatives separated by "|".
+# Returns {headers, rows, missing: []} for the first table that has every
+# required column; if tables are rendered but none has them, the first
+# table's {headers, rows: [], missing} is returned; null while no table is
+# rendered.
+LEDGER_TABLE_SCRIPT = """
+var anchor = document.querySelector(arguments[0]);
+var required = arguments[2];
+if (!anchor) { return null; }
+var tables = [];
+for (var container = anchor; container && container !== document.body; container = container.parentElement) {
+    tables = container.querySelectorAll(arguments[1]);
+    if (tables.length) { break; }
+}
+var candidate = null;
+function text(cell) { return (cell.innerText || cell.textContent || '').replace(/\\s+/g, ' ').trim(); }
+function isHeaderRow(row) {
+    if (row.parentNode.tagName === 'THEAD') { return true; }
+    for (var c = 0; c < row.cells.length; c++) {
+        if (row.cells[c].tagName !== 'TH') { return false; }
+    }
+    return row.cells.length > 0;
+}
+for (var t = 0; t < tables.length; t++) {
+    var table = tables[t];
+    var headRows = [], bodyRows = [];
+    for (var r = 0; r < table.rows.length; r++) {
+        (isHeaderRow(table.rows[r]) ? headRows : bodyRows).push(table.rows[r]);
+    }
+    var grid = [];
+    for (r = 0; r < headRows.length; r++) {
+        grid[r] = grid[r] || [];
+        var col = 0;
+        for (var c = 0; c < headRows[r].cells.length; c++) {
+            var cell = headRows[r].cells[c];
+            while (grid[r][col] !== undefined) { col++; }
+            for (var rs = 0; rs < cell.rowSpan; rs++) {
+                grid[r + rs] = grid[r + rs] || [];
+                for (var cs = 0; cs < cell.colSpan; cs++) { grid[r + rs][col + cs] = text(cell); }
+            }
+            col += cell.colSpan;
+        }
+    }
+    var width = 0;
+    for (r = 0; r < grid.length; r++) { width = Math.max(width, grid[r].length); }
+    var headers = [];
+    for (c = 0; c < width; c++) {
+        var parts = [];
+        for (r = 0; r < grid.length; r++) {
+            var label = grid[r][c] || '';
+            if (label && parts.indexOf(label) === -1) { parts.push(label); }
+        }
+        headers.push(parts.join(' '));
+    }
+    var headerText = headers.join(' ').toLowerCase();
+    var missing = required.filter(function(column) {
+        return !column.split('|').some(function(keyword) { return headerText.indexOf(keyword) !== -1; });
+    });
+    if (missing.length) {
+        candidate = candidate || {headers: headers, rows: [], missing: missing};
+        continue;
+    }
+    var rows = [];
+    for (r = 0; r < bodyRows.length; r++) {
+        if (bodyRows[r].cells.length !== width) { continue; }  // Spanning "no records" / total rows
+        var values = [];
+        for (c = 0; c < width; c++) { values.push(text(bodyRows[r].cells[c])); }
+        rows.push(values);
+    }
+    return {headers: headers, rows: rows, missing: []};
+}
+return candidate;
+"""
+
+class LedgerExtractionError(Exception):
+    """Custom exception for ledger tables that cannot be interpreted."""
+    pass
+
+def parse_amount(value: str) -> float:
+    """
+    Convert a portal amount such as "1,23,456.00" to a float.
+    
+    Args:
+        value (str): Amount text from a ledger cell
+        
+    Returns:
+        float: The amount, NaN for blank or non-numeric cells
+    """
+    cleaned = value.replace(",", "").replace("₹", "").strip()
+    negative = cleaned.startswith("(") and cleaned.endswith(")")
+    cleaned = cleaned.strip("()")
+    try:
+        amount = float(cleaned)
+    except ValueError:
+        return float("nan")
+    return -amount if negative else amount
+
+def _find_column(headers: Sequence[str], keywords: Sequence[str],
+                 balance: Optional[bool] = None) -> Optional[int]:
+    """
+    Find the first column whose label contains any of the keywords.
+    
+    Args:
+        headers (Sequence[str]): Flattened column labels
+        keywords (Sequence[str]): Lower-case keywords to look for
+        balance (Optional[bool]): True to search only the balance columns,
+            False to skip them, None to search all columns
+            
+    Returns:
+        Optional[int]: Column index, None if no label matches
+    """
+    for index, header in enumerate(headers):
+        label = header.lower()
+        if balance is not None and ("balance" in label) != balance:
+            continue
+        if any(keyword in label for keyword in keywords):
+            return index
+    return None
+
+def build_credit_ledger_frame(headers: List[str], rows: List[List[str]],
+                              client_name: str) -> "pd.DataFrame":
+    """
+    Convert a raw Electronic Credit Ledger table to typed rows.
+    
+    Columns are located by their header labels, so the extraction keeps
+    working if the portal reorders or adds columns.
+    
+    Args:
+        headers (List[str]): Flattened column labels from LEDGER_TABLE_SCRIPT
+        rows (List[List[str]]): Cell texts of the table body
+        client_name (str): Client the ledger belongs to
+        
+    Returns:
+        pd.DataFrame: One row per ledger entry with CREDIT_LEDGER_COLUMNS
+        
+    Raises:
+        LedgerExtractionError: If the date or tax amount columns cannot be found
+    """
+    import pandas as pd
+    
+    columns = {
+        "date": _find_column(headers, ["date"]),
+        "reference": _find_column(headers, ["reference"]),
+        "description": _find_column(headers, ["description"]),
+        "transaction_type": _find_column(headers, ["type of transaction", "transaction type"]),
+        "igst": _find_column(headers, ["igst"], balance=False),
+        "cgst": _find_column(headers, ["cgst"], balance=False),
+        "sgst": _find_column(headers, ["sgst", "utgst"], balance=False),
+        "cess": _find_column(headers, ["cess"], balance=False),
+        "total": _find_column(headers, ["total"], balance=False),
+        "balance": _find_column(headers, ["total"], balance=True),
+    }
+    if columns["balance"] is None:
+        balance_columns = [index for index, header in enumerate(headers) if "balance" in header.lower()]
+        if len(balance_columns) == 1:
+            columns["balance"] = balance_columns[0]
+            
+    missing = [name for name in ("date", "igst", "cgst", "sgst") if columns[name] is None]
+    if missing:
+        raise LedgerExtractionError(
+            f"Credit ledger columns not found: {', '.join(missing)} (headers: {headers})"
+        )
+    
+    def cell(row: List[str], name: str) -> str:
+        index = columns[name]
+        return row[index] if index is not None else ""
+        
+    records: List[Dict[str, Any]] = []
+    for row in rows:
+        record = {
+            "client_name": client_name,
+            "date": cell(row, "date"),
+            "reference": cell(row, "reference"),
+            "description": cell(row, "description"),
+            "transaction_type": cell(row, "transaction_type"),
+        }
+        for name in CREDIT_LEDGER_AMOUNT_COLUMNS:
+            record[name] = parse_amount(cell(row, name))
+        if record["date"] or record["reference"] or record["description"]:
+            records.append(record)
+            
+    frame = pd.DataFrame.from_records(records, columns=CREDIT_LEDGER_COLUMNS[:-1])
+    frame["date"] = pd.to_datetime(frame["date"], dayfirst=True, errors="coerce")
+    frame[CREDIT_LEDGER_AMOUNT_COLUMNS] = frame[CREDIT_LEDGER_AMOUNT_COLUMNS].astype("float64")
+    frame["fetched_at"] = pd.Timestamp.now().floor("s")
+    return frame
+
+@dataclass
+class CashLedgerBalance:
+    """
+    Electronic Cash Ledger balance of one client.
+    
+    Attributes:
+        client_name (str): Client the balance belongs to
+        balances (Dict[str, Dict[str, float]]): Amount per major head (e.g. "igst")
+            and minor head (e.g. "interest"); every head in CASH_LEDGER_MAJOR_HEADS
+            and CASH_LEDGER_MINOR_HEADS is present
+        fetched_at (str): ISO timestamp of when the balance was read
+    """
+    client_name: str
+    balances: Dict[str, Dict[str, float]]
+    fetched_at: str = field(default_factory=lambda: time.strftime("%Y-%m-%dT%H:%M:%S"))
+    
+    def get_total(self) -> float:
+        """
+        Get the total cash balance across all heads.
+        
+        Returns:
+            float: Sum of all recognized amounts
+        """
+        return sum(
+            amount for minor_heads in self.balances.values()
+            for amount in minor_heads.values() if not math.isnan(amount)
+        )
+    
+    def to_row(self) -> Dict[str, Any]:
+        """
+        Flatten the balance into one report row.
+        
+        Returns:
+            Dict[str, Any]: client_name, fetched_at, one "<major>_<minor>" column
+                per head (e.g. "igst_interest") and the total
+        """
+        row: Dict[str, Any] = {"client_name": self.client_name, "fetched_at": self.fetched_at}
+        for major in CASH_LEDGER_MAJOR_HEADS:
+            for minor in CASH_LEDGER_MINOR_HEADS:
+                row[f"{major}_{minor}"] = self.balances[major][minor]
+        row["total"] = self.get_total()
+        return row
+
+def _match_head(label: str, heads: Dict[str, List[str]]) -> Optional[str]:
+    """
+    Recognize a head from a table label.
+    
+    Args:
+        label (str): Row or column label
+        heads (Dict[str, List[str]]): Head names and their label keywords
+        
+    Returns:
+        Optional[str]: Matching head name, None if the label matches none (e.g. "Total")
+    """
+    label = label.lower()
+    for head, keywords in heads.items():
+        if any(keyword in label for keyword in keywords):
+            return head
+    return None
+
+def build_cash_ledger_balance(headers: List[str], rows: List[List[str]],
+                              client_name: str) -> CashLedgerBalance:
+    """
+    Convert the raw cash ledger balance details table to a typed record.
+    
+    The portal lists tax types as rows and minor heads as columns; the
+    transposed layout is recognized as well.
+    
+    Args:
+        headers (List[str]): Flattened column labels from LEDGER_TABLE_SCRIPT
+        rows (List[List[str]]): Cell texts of the table body (first cell is the row label)
+        client_name (str): Client the balance belongs to
+        
+    Returns:
+        CashLedgerBalance: Balance per major and minor head
+        
+    Raises:
+        LedgerExtractionError: If no balance amounts can be recognized
+    """
+    column_minor = [_match_head(header, CASH_LEDGER_MINOR_HEADS) for header in headers]
+    column_major = [_match_head(header, CASH_LEDGER_MAJOR_HEADS) for header in headers]
+    # Minor head labels ("Tax", "Interest", ...) never name a tax type, while
+    # tax type labels ("Integrated Tax") can contain a minor head keyword
+    transposed = any(column_major)
+    
+    balances = {
+        major: {minor: float("nan") for minor in CASH_LEDGER_MINOR_HEADS}
+        for major in CASH_LEDGER_MAJOR_HEADS
+    }
+    found = 0
+    for row in rows:
+        if not row:
+            continue
+        if transposed:
+            minor = _match_head(row[0], CASH_LEDGER_MINOR_HEADS)
+            cells = [(column_major[index], minor) for index in range(1, len(row))]
+        else:
+            major = _match_head(row[0], CASH_LEDGER_MAJOR_HEADS)
+            cells = [(major, column_minor[index]) for index in range(1, len(row))]
+            
+        for index, (major, minor) in enumerate(cells, start=1):
+            if major and minor and math.isnan(balances[major][minor]):
+                balances[major][minor] = parse_amount(row[index])
+                found += 1
+                
+    if not found:
+        raise LedgerExtractionError(
+            f"No cash ledger balances recognized (headers: {headers})"
+        )
+        
+    return CashLedgerBalance(client_name=client_name, balances=balances)
+
+def merge_ledger_frames(frames: "List[pd.DataFrame]") -> "pd.DataFrame":
+    """
+    Combine ledger rows from several fetches into one chronological frame.
+    
+    A row that another fetch also returned (identical apart from fetched_at,
+    e.g. the opening balance repeated by adjacent date windows, or a range
+    fetched again) is kept once. Identical rows within one fetch are
+    separate ledger entries (e.g. repeated ITC lines) and are all kept: the
+    n-th copy in one fetch only matches the n-th copy in another.
+    
+    Args:
+        frames (List[pd.DataFrame]): Ledger rows to combine, one frame per fetch
+        
+    Returns:
+        pd.DataFrame: De-duplicated rows sorted by date
+    """
+    import pandas as pd
+    
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=CREDIT_LEDGER_COLUMNS)
+        
+    key_columns = [column for column in frames[0].columns if column != "fetched_at"]
+    numbered = [
+        frame.assign(_occurrence=frame.groupby(key_columns, dropna=False, sort=False).cumcount())
+        for frame in frames
+    ]
+    combined = pd.concat(numbered, ignore_index=True)
+    combined = combined.drop_duplicates(subset=key_columns + ["_occurrence"], keep="last")
+    combined = combined.drop(columns="_occurrence")
+    if "date" in combined.columns:
+        combined = combined.sort_values("date", kind="stable")
+    return combined.reset_index(drop=True)
+
+def write_cash_balance_report(balances: List[CashLedgerBalance], path: str) -> str:
+    """
+    Write the cash ledger balances of many clients to one CSV file.
+    
+    Args:
+        balances (List[CashLedgerBalance]): One balance per client
+        path (str): Report file to write
+        
+    Returns:
+        str: Path of the written report
+    """
+    import pandas as pd
+    
+    frame = pd.DataFrame([balance.to_row() for balance in balances])
+    frame = frame.sort_values("client_name", kind="stable")
+    temp_path = f"{path}.tmp"
+    frame.to_csv(temp_path, index=False)
+    os.replace(temp_path, path)
+    logger.info(f"Wrote cash ledger balances of {len(balances)} clients to {path}")
+    return path
+
+class LedgerStore:
+    """
+    Per-client columnar store of extracted ledger rows.
+    
+    Each append merges the new rows into the client's existing file and
+    drops duplicates, so overlapping date ranges can be fetched again safely.
+    """
+    
+    def __init__(self, root_dir: str):
+        """
+        Initialize the ledger store.
+        
+        Args:
+            root_dir (str): Root of the download tree (see DownloadLayout.root_dir)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.root_dir = root_dir
+        self.file_format = "parquet" if pyarrow is not None else "csv"
+        self._lock = threading.Lock()
+        if pyarrow is None:
+            self.logger.info("pyarrow is not installed - ledger rows are stored as CSV")
+    
+    def get_store_path(self, client_name: str, username: str, ledger_name: str) -> str:
+        """
+        Get the store file of a client's ledger.
+        
+        Args:
+            client_name (str): Client name
+            username (str): GST portal username of the client
+            ledger_name (str): Ledger name (e.g. CREDIT_LEDGER_NAME)
+            
+        Returns:
+            str: Path of the Parquet (or CSV) file
+        """
+        return os.path.join(
+            self.root_dir,
+            client_folder_name(client_name, username),
+            LEDGER_STORE_FOLDER_NAME,
+            f"{ledger_name}.{self.file_format}"
+        )
+    
+    def read(self, client_name: str, username: str, ledger_name: str) -> "pd.DataFrame":
+        """
+        Read all stored rows of a client's ledger.
+        
+        Args:
+            client_name (str): Client name
+            username (str): GST portal username of the client
+            ledger_name (str): Ledger name (e.g. CREDIT_LEDGER_NAME)
+            
+        Returns:
+            pd.DataFrame: Stored rows, empty (with the ledger columns) if nothing was stored yet
+        """
+        import pandas as pd
+        
+        path = self.get_store_path(client_name, username, ledger_name)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return pd.DataFrame(columns=CREDIT_LEDGER_COLUMNS)
+        if self.file_format == "parquet":
+            return pd.read_parquet(path)
+            
+        frame = pd.read_csv(path, parse_dates=["date", "fetched_at"], keep_default_na=False,
+                            na_values=[""], dtype={column: str for column in CREDIT_LEDGER_TEXT_COLUMNS})
+        # Blank text cells come back as NaN; restore the "" the frame was built with
+        text_columns = [column for column in CREDIT_LEDGER_TEXT_COLUMNS if column in frame.columns]
+        frame[text_columns] = frame[text_columns].fillna("")
+        return frame
+    
+    def append(self, client_name: str, username: str, ledger_name: str, frame: "pd.DataFrame") -> str:
+        """
+        Add rows to a client's ledger, replacing the file atomically.
+        
+        Rows already stored by an earlier fetch are stored once (see
+        merge_ledger_frames). An empty frame leaves the store untouched.
+        
+        Args:
+            client_name (str): Client name
+            username (str): GST portal username of the client
+            ledger_name (str): Ledger name (e.g. CREDIT_LEDGER_NAME)
+            frame (pd.DataFrame): Rows to add
+            
+        Returns:
+            str: Path of the store file
+        """
+        path = self.get_store_path(client_name, username, ledger_name)
+        if frame.empty:
+            self.logger.info(f"No {ledger_name} rows to store for {client_name}")
+            return path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        with self._lock:
+            combined = merge_ledger_frames([self.read(client_name, username, ledger_name), frame])
+            
+            temp_path = f"{path}.tmp"
+            if self.file_format == "parquet":
+                combined.to_parquet(temp_path, index=False)
+            else:
+                combined.to_csv(temp_path, index=False)
+            os.replace(temp_path, path)
+            
+        self.logger.info(f"Stored {len(frame)} {ledger_name} rows ({len(combined)} total) in {path}")
+        return path
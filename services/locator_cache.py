@@ -0,0 +1,255 @@
+"""
+Persisted locator ranking cache for GST Automation Application.
+
+This module records which fallback locator strategy found each element,
+together with hit counts and latencies, and keeps that knowledge in a small
+JSON file so later runs try the usual winner first. Statistics are dropped
+when the portal markup appears to have changed.
+
+Author: Srinidhi B S
+"""
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import (
+    LOCATOR_CACHE_FILENAME, LOCATOR_CACHE_MAX_MISSES, LOCATOR_CACHE_MAX_AGE_DAYS
+)
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+
+def _strategy_key(strategy: Tuple[Any, str]) -> str:
+    """
+    Build the cache key for a (By, locator) strategy.
+    
+    Args:
+        strategy (Tuple[Any, str]): The (By, locator) tuple
+        
+    Returns:
+        str: Stable key such as "xpath=//button"
+    """
+    by, locator = strategy
+    return f"{by}={locator}"
+
+class LocatorRankingCache:
+    """
+    On-disk cache that ranks fallback locator strategies per element.
+    
+    Elements are identified by the description passed to the locator
+    helpers (e.g. "CAPTCHA field"). For each element the cache keeps, per
+    strategy, the number of wins, total latency, consecutive misses and the
+    time of the last win.
+    """
+    
+    def __init__(self, cache_path: Optional[str] = None,
+                 max_misses: int = LOCATOR_CACHE_MAX_MISSES,
+                 max_age_days: float = LOCATOR_CACHE_MAX_AGE_DAYS):
+        """
+        Initialize the cache and load existing rankings from disk.
+        
+        Args:
+            cache_path (Optional[str]): Path to the JSON cache file, None for the default
+            max_misses (int): Consecutive misses after which a strategy's stats are dropped
+            max_age_days (float): Stats without a win for this long are dropped on load
+        """
+        if cache_path is None:
+            app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            cache_path = os.path.join(app_dir, LOCATOR_CACHE_FILENAME)
+            
+        self.logger = logging.getLogger(__name__)
+        self.cache_path = cache_path
+        self.max_misses = max_misses
+        self.max_age_seconds = max_age_days * 24 * 3600
+        self._elements: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # One writer of the cache file at a time
+        self._changes = 0  # Modifications since the cache was created
+        self._saved_changes = 0  # Modifications already written to disk
+        
+        self.load()
+    
+    def load(self) -> None:
+        """Load rankings from disk, discarding stale or unreadable entries."""
+        if not os.path.exists(self.cache_path):
+            return
+            
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable locator cache {self.cache_path}: {e}")
+            return
+            
+        if data.get("version") != CACHE_FORMAT_VERSION:
+            self.logger.info("Locator cache format changed - starting with an empty cache")
+            return
+            
+        cutoff = time.time() - self.max_age_seconds
+        elements = {}
+        for description, strategies in data.get("elements", {}).items():
+            fresh = {
+                key: stats for key, stats in strategies.items()
+                if stats.get("last_hit", 0) >= cutoff
+            }
+            if fresh:
+                elements[description] = fresh
+                
+        with self._lock:
+            self._elements = elements
+        self.logger.debug(f"Loaded locator rankings for {len(elements)} elements")
+    
+    def save(self) -> None:
+        """Write rankings to disk atomically if they changed since the last save."""
+        with self._save_lock:
+            with self._lock:
+                changes = self._changes
+                if changes == self._saved_changes:
+                    return
+                data = {"version": CACHE_FORMAT_VERSION, "elements": self._elements}
+                payload = json.dumps(data, indent=2, sort_keys=True)
+                
+            temp_path = f"{self.cache_path}.tmp"
+            try:
+                with open(temp_path, "w", encoding="utf-8") as file:
+                    file.write(payload)
+                os.replace(temp_path, self.cache_path)
+            except OSError as e:
+                self.logger.warning(f"Failed to save locator cache: {e}")
+                return
+            
+            # Changes recorded while the file was written stay pending for the next save
+            with self._lock:
+                self._saved_changes = changes
+    
+    def rank(self, description: str, locator_strategies: List[Tuple[Any, str]]) -> List[Tuple[Any, str]]:
+        """
+        Reorder strategies so historically winning ones are tried first.
+        
+        Strategies with wins are sorted by win count (then average latency);
+        strategies without statistics keep their original relative order.
+        
+        Args:
+            description (str): Element description used as the cache key
+            locator_strategies (List[Tuple[Any, str]]): Strategies in their declared order
+            
+        Returns:
+            List[Tuple[Any, str]]: Strategies in ranked order
+        """
+        with self._lock:
+            stats = self._elements.get(description, {})
+            if not stats:
+                return list(locator_strategies)
+            
+            def sort_key(item):
+                position, strategy = item
+                entry = stats.get(_strategy_key(strategy))
+                if not entry or not entry.get("hits"):
+                    return (1, 0, 0.0, position)
+                average_latency = entry["total_latency"] / entry["hits"]
+                return (0, -entry["hits"], average_latency, position)
+                
+            ranked = sorted(enumerate(locator_strategies), key=sort_key)
+            
+        return [strategy for _, strategy in ranked]
+    
+    def record_success(self, description: str, locator_strategies: List[Tuple[Any, str]],
+                       winner_index: int, latency_seconds: float) -> None:
+        """
+        Record that a strategy found the element.
+        
+        The previously top-ranked strategy gets a miss if another strategy
+        won; after too many consecutive misses its stats are dropped.
+        
+        Args:
+            description (str): Element description used as the cache key
+            locator_strategies (List[Tuple[Any, str]]): Strategies in the order they were tried
+            winner_index (int): Index of the winning strategy in locator_strategies
+            latency_seconds (float): Time taken to find the element
+        """
+        winner_key = _strategy_key(locator_strategies[winner_index])
+        current_keys = {_strategy_key(strategy) for strategy in locator_strategies}
+        
+        with self._lock:
+            stats = self._elements.setdefault(description, {})
+            
+            # Forget strategies that are no longer declared in code
+            for key in list(stats):
+                if key not in current_keys:
+                    del stats[key]
+                    
+            # Penalize strategies that were ranked ahead of the winner
+            for strategy in locator_strategies[:winner_index]:
+                key = _strategy_key(strategy)
+                entry = stats.get(key)
+                if entry:
+                    entry["misses"] = entry.get("misses", 0) + 1
+                    if entry["misses"] >= self.max_misses:
+                        self.logger.info(f"Dropping stale locator ranking for {description}: {key}")
+                        del stats[key]
+                        
+            entry = stats.setdefault(winner_key, {"hits": 0, "total_latency": 0.0})
+            entry["hits"] += 1
+            entry["total_latency"] += latency_seconds
+            entry["misses"] = 0
+            entry["last_hit"] = time.time()
+            self._changes += 1
+    
+    def record_failure(self, description: str) -> None:
+        """
+        Record that no strategy found the element.
+        
+        A complete failure suggests the markup changed, so the element's
+        rankings are dropped and the declared order is used next time.
+        
+        Args:
+            description (str): Element description used as the cache key
+        """
+        with self._lock:
+            if self._elements.pop(description, None) is not None:
+                self.logger.info(f"Dropped locator rankings for {description} after lookup failure")
+                self._changes += 1
+    
+    def get_stats(self, description: str) -> Dict[str, Dict[str, float]]:
+        """
+        Get a copy of the recorded statistics for an element.
+        
+        Args:
+            description (str): Element description used as the cache key
+            
+        Returns:
+            Dict[str, Dict[str, float]]: Stats keyed by "by=locator"
+        """
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._elements.get(description, {}).items()}
+    
+    def clear(self) -> None:
+        """Remove all rankings (the file is rewritten on the next save)."""
+        with self._lock:
+            self._elements.clear()
+            self._changes += 1
+
+_shared_cache: Optional[LocatorRankingCache] = None
+_shared_cache_lock = threading.Lock()
+
+def get_locator_cache() -> LocatorRankingCache:
+    """
+    Get the process-wide locator cache shared by all automation services.
+    
+    The cache is saved automatically when the interpreter exits.
+    
+    Returns:
+        LocatorRankingCache: The shared cache instance
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = LocatorRankingCache()
+            atexit.register(_shared_cache.save)
+        return _shared_cache
@@ -0,0 +1,230 @@
+"""
+Page load metrics for GST Automation Application.
+
+This module reads the browser's Navigation Timing and Resource Timing
+entries after every portal page transition and appends them, tagged with
+the client and workflow step, to a local JSON Lines file. Comparing the
+portal's own timings (DNS, time to first byte, load, API requests) with the
+step durations shows whether a slow run was the portal or the automation.
+
+Author: Srinidhi B S
+"""
+import os
+import json
+import time
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional
+
+from config.settings import PAGE_METRICS_FILENAME
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Installed on every new document before the portal's own scripts run (see
+# create_webdriver). The browser keeps only 250 resource entries by default
+# and the portal loads more than that on its first page, so the buffer is
+# enlarged before the first request and again whenever it fills up; entries
+# that still do not fit are counted as dropped.
+RESOURCE_TIMING_SETUP_SCRIPT = """
+(function() {
+    var perf = window.performance;
+    if (!perf || !perf.setResourceTimingBufferSize || window.__gstResourceBufferSize) { return; }
+    window.__gstResourceBufferSize = 2000;
+    window.__gstResourceEntriesDropped = false;
+    perf.setResourceTimingBufferSize(window.__gstResourceBufferSize);
+    perf.addEventListener('resourcetimingbufferfull', function() {
+        if (window.__gstResourceBufferSize < 16000) {
+            window.__gstResourceBufferSize *= 2;
+            perf.setResourceTimingBufferSize(window.__gstResourceBufferSize);
+        } else {
+            window.__gstResourceEntriesDropped = true;
+        }
+    });
+})();
+"""
+
+# Reads the timings the page collected since the last transition. Returns
+# null unless a new document loaded or the URL changed (an Angular route
+# change, which creates no navigation entry) since the previous call, so
+# repeated readiness waits on one page record nothing. The navigation entry
+# is reported once per document; resource entries are cleared after reading,
+# so each record only covers the requests made since the previous one.
+PAGE_TIMING_SCRIPT = """
+var perf = window.performance;
+if (!perf || !perf.getEntriesByType) { return null; }
+var navEntry = perf.getEntriesByType('navigation')[0];
+var newDocument = navEntry && !window.__gstNavigationReported;
+if (!newDocument && window.__gstReportedUrl === location.href) { return null; }
+window.__gstReportedUrl = location.href;
+function ms(value) { return Math.round(value); }
+var navigation = null;
+if (newDocument) {
+    window.__gstNavigationReported = true;
+    navigation = {
+        type: navEntry.type,
+        dns_ms: ms(navEntry.domainLookupEnd - navEntry.domainLookupStart),
+        connect_ms: ms(navEntry.connectEnd - navEntry.connectStart),
+        ttfb_ms: ms(navEntry.responseStart - navEntry.requestStart),
+        dom_content_loaded_ms: ms(navEntry.domContentLoadedEventEnd),
+        load_ms: ms(navEntry.loadEventEnd),
+        document_bytes: navEntry.transferSize || 0
+    };
+}
+var resources = perf.getEntriesByType('resource');
+if (!navigation && !resources.length) { return null; }
+var summary = {count: 0, bytes: 0, api_count: 0, api_ms: 0, slowest_ms: 0, slowest_url: null,
+               dropped: !!window.__gstResourceEntriesDropped};
+window.__gstResourceEntriesDropped = false;
+for (var i = 0; i < resources.length; i++) {
+    var entry = resources[i];
+    summary.count++;
+    summary.bytes += entry.transferSize || 0;
+    if (entry.initiatorType === 'xmlhttprequest' || entry.initiatorType === 'fetch') {
+        summary.api_count++;
+        summary.api_ms += entry.duration;
+    }
+    if (entry.duration > summary.slowest_ms) {
+        summary.slowest_ms = entry.duration;
+        summary.slowest_url = entry.name;
+    }
+}
+summary.api_ms = ms(summary.api_ms);
+summary.slowest_ms = ms(summary.slowest_ms);
+if (perf.clearResourceTimings) { perf.clearResourceTimings(); }
+return {url: location.href, navigation: navigation, resources: summary};
+"""
+
+@dataclass
+class PageLoadMetrics:
+    """
+    Browser-side timings of one portal page transition.
+    
+    Navigation fields are None for in-page (Angular route) transitions,
+    which only load resources. Resource figures cover everything loaded
+    since the previous transition was recorded.
+    
+    Attributes:
+        client_name (str): Client the run belongs to
+        step (str): Workflow step that caused the transition
+        url (str): Page URL when the timings were read
+        recorded_at (float): Unix time the timings were read
+        navigation_type (Optional[str]): "navigate", "reload", "back_forward", or None
+        dns_ms (Optional[int]): DNS lookup time
+        connect_ms (Optional[int]): TCP/TLS connection time
+        ttfb_ms (Optional[int]): Time from request to first response byte
+        dom_content_loaded_ms (Optional[int]): DOMContentLoaded, from navigation start
+        load_ms (Optional[int]): Load event end, from navigation start
+        document_bytes (Optional[int]): Transferred size of the HTML document
+        resource_count (int): Resources loaded since the previous reading
+        resource_bytes (int): Transferred size of those resources
+        api_request_count (int): XHR/fetch requests among them
+        api_request_ms (int): Total duration of those requests
+        slowest_resource_ms (int): Duration of the slowest resource
+        slowest_resource_url (Optional[str]): URL of the slowest resource
+        resource_entries_dropped (bool): True if the browser's timing buffer overflowed,
+            so the resource figures are incomplete
+    """
+    client_name: str
+    step: str
+    url: str
+    recorded_at: float
+    navigation_type: Optional[str] = None
+    dns_ms: Optional[int] = None
+    connect_ms: Optional[int] = None
+    ttfb_ms: Optional[int] = None
+    dom_content_loaded_ms: Optional[int] = None
+    load_ms: Optional[int] = None
+    document_bytes: Optional[int] = None
+    resource_count: int = 0
+    resource_bytes: int = 0
+    api_request_count: int = 0
+    api_request_ms: int = 0
+    slowest_resource_ms: int = 0
+    slowest_resource_url: Optional[str] = None
+    resource_entries_dropped: bool = False
+    
+    @classmethod
+    def from_timing(cls, client_name: str, step: str, timing: Dict[str, Any]) -> "PageLoadMetrics":
+        """
+        Build metrics from the result of PAGE_TIMING_SCRIPT.
+        
+        Args:
+            client_name (str): Client the run belongs to
+            step (str): Workflow step that caused the transition
+            timing (Dict[str, Any]): Script result (url, navigation, resources)
+            
+        Returns:
+            PageLoadMetrics: The metrics record
+        """
+        navigation = timing.get("navigation") or {}
+        resources = timing.get("resources") or {}
+        return cls(
+            client_name=client_name,
+            step=step,
+            url=timing.get("url", ""),
+            recorded_at=time.time(),
+            navigation_type=navigation.get("type"),
+            dns_ms=navigation.get("dns_ms"),
+            connect_ms=navigation.get("connect_ms"),
+            ttfb_ms=navigation.get("ttfb_ms"),
+            dom_content_loaded_ms=navigation.get("dom_content_loaded_ms"),
+            load_ms=navigation.get("load_ms"),
+            document_bytes=navigation.get("document_bytes"),
+            resource_count=resources.get("count", 0),
+            resource_bytes=resources.get("bytes", 0),
+            api_request_count=resources.get("api_count", 0),
+            api_request_ms=resources.get("api_ms", 0),
+            slowest_resource_ms=resources.get("slowest_ms", 0),
+            slowest_resource_url=resources.get("slowest_url"),
+            resource_entries_dropped=resources.get("dropped", False)
+        )
+
+class PageMetricsLog:
+    """
+    Append-only JSON Lines file of page load metrics, shared by all browsers.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the metrics log.
+        
+        Args:
+            path (Optional[str]): Path of the metrics file, None for the default in the app folder
+        """
+        if path is None:
+            app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            path = os.path.join(app_dir, PAGE_METRICS_FILENAME)
+            
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self._lock = threading.Lock()
+    
+    def append(self, metrics: PageLoadMetrics) -> None:
+        """
+        Append one metrics record to the file.
+        
+        Args:
+            metrics (PageLoadMetrics): Record to store
+        """
+        line = json.dumps(asdict(metrics), ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(line + "\n")
+
+_shared_log: Optional[PageMetricsLog] = None
+_shared_log_lock = threading.Lock()
+
+def get_page_metrics_log() -> PageMetricsLog:
+    """
+    Get the process-wide page metrics log shared by all automation services.
+    
+    Returns:
+        PageMetricsLog: The shared log instance
+    """
+    global _shared_log
+    with _shared_log_lock:
+        if _shared_log is None:
+            _shared_log = PageMetricsLog()
+        return _shared_log
@@ -0,0 +1,169 @@
+"""
+Portal session persistence for GST Automation Application.
+
+This module saves the GST portal cookies of a logged-in browser per client
+and restores them into a later browser, so repeat runs within the portal's
+session lifetime can skip the login form and the manual CAPTCHA.
+
+The saved files contain live session tokens; they are written with
+owner-only permissions and are ignored by git.
+
+Author: Srinidhi B S
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from selenium import webdriver
+
+from config.settings import SESSION_FOLDER_NAME, SESSION_MAX_AGE_MINUTES
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Cookies outside this domain are never saved or restored
+PORTAL_COOKIE_DOMAIN = "gst.gov.in"
+
+# Fields accepted by the DevTools Network.setCookies command
+RESTORABLE_COOKIE_FIELDS = (
+    "name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires"
+)
+
+class SessionStore:
+    """
+    On-disk store of GST portal cookies, one file per portal username.
+    """
+    
+    def __init__(self, directory: Optional[str] = None,
+                 max_age_minutes: float = SESSION_MAX_AGE_MINUTES):
+        """
+        Initialize the session store.
+        
+        Args:
+            directory (Optional[str]): Folder for session files, None for the default in the app folder
+            max_age_minutes (float): Saved sessions older than this are treated as expired
+        """
+        if directory is None:
+            app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            directory = os.path.join(app_dir, SESSION_FOLDER_NAME)
+            
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory
+        self.max_age_seconds = max_age_minutes * 60
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+    
+    def _session_path(self, username: str) -> str:
+        """
+        Get the session file path for a portal username.
+        
+        The username is hashed so file names do not reveal client logins.
+        
+        Args:
+            username (str): GST portal username
+            
+        Returns:
+            str: Path of the session file
+        """
+        key = hashlib.sha256(username.strip().lower().encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, f"{key}.json")
+    
+    def save(self, username: str, driver: webdriver.Chrome) -> int:
+        """
+        Save the browser's portal cookies for a username.
+        
+        Args:
+            username (str): GST portal username the session belongs to
+            driver (webdriver.Chrome): Browser holding the logged-in session
+            
+        Returns:
+            int: Number of cookies saved
+        """
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        portal_cookies = [
+            {field: cookie[field] for field in RESTORABLE_COOKIE_FIELDS if field in cookie}
+            for cookie in cookies
+            if cookie.get("domain", "").lstrip(".").endswith(PORTAL_COOKIE_DOMAIN)
+        ]
+        if not portal_cookies:
+            return 0
+            
+        payload = json.dumps({"saved_at": time.time(), "cookies": portal_cookies})
+        path = self._session_path(username)
+        temp_path = f"{path}.tmp"
+        
+        with self._lock:
+            descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                file.write(payload)
+            os.replace(temp_path, path)
+            
+        self.logger.debug(f"Saved {len(portal_cookies)} portal cookies")
+        return len(portal_cookies)
+    
+    def load(self, username: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load saved cookies for a username if the session is still fresh.
+        
+        Args:
+            username (str): GST portal username
+            
+        Returns:
+            Optional[List[Dict[str, Any]]]: Saved cookies, None if missing, unreadable or expired
+        """
+        path = self._session_path(username)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable session file: {e}")
+            self.delete(username)
+            return None
+            
+        age_seconds = time.time() - data.get("saved_at", 0)
+        if age_seconds > self.max_age_seconds:
+            self.logger.info(f"Saved session is {age_seconds / 60:.0f} minutes old - treating as expired")
+            self.delete(username)
+            return None
+            
+        return data.get("cookies") or None
+    
+    def restore(self, username: str, driver: webdriver.Chrome) -> bool:
+        """
+        Load saved cookies for a username into a browser.
+        
+        Args:
+            username (str): GST portal username
+            driver (webdriver.Chrome): Browser to restore the session into
+            
+        Returns:
+            bool: True if cookies were restored, False if no fresh session was saved
+        """
+        cookies = self.load(username)
+        if not cookies:
+            return False
+            
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        self.logger.debug(f"Restored {len(cookies)} portal cookies")
+        return True
+    
+    def delete(self, username: str) -> None:
+        """
+        Forget the saved session for a username.
+        
+        Args:
+            username (str): GST portal username
+        """
+        with self._lock:
+            try:
+                os.remove(self._session_path(username))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning(f"Could not delete session file: {e}")
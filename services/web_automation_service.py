@@ -9,7 +9,8 @@ Author: Srinidhi B S
 import os
 import time
 import logging
-from typing import Optional, Callable, Any, List, Tuple
+from dataclasses import dataclass
+from typing import Optional, Callable, Any, List, Tuple, TYPE_CHECKING
 from contextlib import contextmanager
 
 # Selenium imports
@@ -29,12 +30,254 @@ from config.settings import (
     CHROMEDRIVER_RELATIVE_PATH, DOWNLOAD_FOLDER_NAME,
     CHROME_DOWNLOAD_PREFERENCES, CHROME_OPTIONS,
     SAVE_SCREENSHOTS_ON_ERROR, SCREENSHOT_PREFIX,
-    PLATFORM_DISPLAY_NAME, CHROMEDRIVER_DIRECTORY, IS_EFFECTIVE_WINDOWS
+    PLATFORM_DISPLAY_NAME, CHROMEDRIVER_DIRECTORY, IS_EFFECTIVE_WINDOWS,
+    WAIT_POLL_INTERVAL, NETWORK_QUIET_PERIOD_MS, RACE_FALLBACK_LOCATORS,
+    LOCATOR_CACHE_ENABLED, FAST_FORM_FILL_ENABLED, ANGULAR_IDLE_WAIT_ENABLED,
+    OBSERVED_ELEMENT_WAITS, COMMAND_PROFILING_ENABLED, PAGE_METRICS_ENABLED,
+    Locators
 )
+from services.locator_cache import LocatorRankingCache, get_locator_cache
+from services.download_tracker import DownloadTracker
+from services.command_profiler import CommandProfiler
+from services.page_metrics import (
+    PageMetricsLog, PageLoadMetrics, PAGE_TIMING_SCRIPT, RESOURCE_TIMING_SETUP_SCRIPT,
+    get_page_metrics_log
+)
+
+if TYPE_CHECKING:
+    from services.webdriver_pool import WebDriverPool
 
 # Set up logging for this module
 logger = logging.getLogger(__name__)
 
+# Injected into every page before its own scripts run. Counts in-flight
+# XMLHttpRequest/fetch calls so waits can tell when the page's network is idle.
+NETWORK_TRACKER_SCRIPT = """
+(function() {
+    if (window.__gstPendingRequests !== undefined) { return; }
+    window.__gstPendingRequests = 0;
+    window.__gstLastNetworkActivity = Date.now();
+    function started() { window.__gstPendingRequests++; window.__gstLastNetworkActivity = Date.now(); }
+    function finished() {
+        window.__gstPendingRequests = Math.max(0, window.__gstPendingRequests - 1);
+        window.__gstLastNetworkActivity = Date.now();
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        started();
+        this.addEventListener('loadend', finished);
+        return originalSend.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function() {
+            started();
+            return originalFetch.apply(this, arguments).then(
+                function(response) { finished(); return response; },
+                function(error) { finished(); throw error; }
+            );
+        };
+    }
+})();
+"""
+
+# Returns true when the document is loaded, the network has been quiet for
+# the given period and no loading overlay is visible.
+PAGE_READY_SCRIPT = """
+var quietPeriod = arguments[0];
+var overlayClass = arguments[1];
+if (document.readyState !== 'complete') { return false; }
+if (window.__gstPendingRequests !== undefined) {
+    if (window.__gstPendingRequests > 0) { return false; }
+    if (Date.now() - window.__gstLastNetworkActivity < quietPeriod) { return false; }
+}
+var overlays = document.getElementsByClassName(overlayClass);
+for (var i = 0; i < overlays.length; i++) {
+    var style = window.getComputedStyle(overlays[i]);
+    if (style.display !== 'none' && style.visibility !== 'hidden' && overlays[i].getClientRects().length) {
+        return false;
+    }
+}
+return true;
+"""
+
+# Shared by the scripts below: findAll(by, locator) resolves a Selenium
+# (By, locator) pair to a list of elements inside the page.
+FIND_ELEMENTS_JS = """
+function toArray(list) { return Array.prototype.slice.call(list); }
+function findAll(by, locator) {
+    switch (by) {
+        case 'id':
+            var byId = document.getElementById(locator);
+            return byId ? [byId] : [];
+        case 'name': return toArray(document.getElementsByName(locator));
+        case 'css selector': return toArray(document.querySelectorAll(locator));
+        case 'class name': return toArray(document.getElementsByClassName(locator));
+        case 'tag name': return toArray(document.getElementsByTagName(locator));
+        case 'xpath':
+            var snapshot = document.evaluate(locator, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var n = 0; n < snapshot.snapshotLength; n++) { nodes.push(snapshot.snapshotItem(n)); }
+            return nodes;
+        case 'link text':
+        case 'partial link text':
+            return toArray(document.getElementsByTagName('a')).filter(function(a) {
+                var text = (a.innerText || a.textContent || '').trim();
+                return by === 'link text' ? text === locator : text.indexOf(locator) !== -1;
+            });
+    }
+    return [];
+}
+"""
+
+# Waits inside the page until the document is loaded and the AngularJS app
+# has no $http requests pending, on two checks in a row (a finished request
+# often starts the next one from its callback).
+# Resolves with {idle, angular, reason}; pages without AngularJS only need
+# to be loaded.
+# Asynchronous: arguments[0] is the deadline in milliseconds, the last
+# argument is the WebDriver callback.
+ANGULAR_IDLE_SCRIPT = """
+var deadline = Date.now() + arguments[0];
+var done = arguments[arguments.length - 1];
+function getInjector() {
+    if (!window.angular) { return null; }
+    var root = document.querySelector('[ng-app], [data-ng-app], .ng-scope') || document.body;
+    try { return window.angular.element(root).injector() || null; } catch (e) { return null; }
+}
+var idleChecks = 0;
+function check() {
+    var busy = null;
+    var injector = null;
+    if (document.readyState !== 'complete') {
+        busy = 'document still loading';
+    } else {
+        injector = getInjector();
+        if (injector) {
+            var pending = injector.get('$http').pendingRequests.length;
+            if (pending) { busy = pending + ' $http request(s) pending'; }
+        }
+    }
+    if (!busy && !injector) { return done({idle: true, angular: false}); }
+    idleChecks = busy ? 0 : idleChecks + 1;
+    if (idleChecks >= 2) { return done({idle: true, angular: true}); }
+    if (Date.now() > deadline) { return done({idle: false, angular: !!injector, reason: busy || 'app not settled'}); }
+    setTimeout(check, 50);
+}
+check();
+"""
+
+# Shared by the locator scripts below: firstMatch(strategies, requireInteractable)
+# returns the first match in strategy order as [index, element], or null.
+MATCH_LOCATORS_JS = FIND_ELEMENTS_JS + """
+function isInteractable(el) {
+    if (el.disabled) { return false; }
+    var style = window.getComputedStyle(el);
+    return style.display !== 'none' && style.visibility !== 'hidden' && el.getClientRects().length > 0;
+}
+function firstMatch(strategies, requireInteractable) {
+    for (var i = 0; i < strategies.length; i++) {
+        try {
+            var elements = findAll(strategies[i][0], strategies[i][1]);
+            for (var j = 0; j < elements.length; j++) {
+                if (elements[j].nodeType === 1 && (!requireInteractable || isInteractable(elements[j]))) {
+                    return [i, elements[j]];
+                }
+            }
+        } catch (e) {
+            // Invalid selector for this document - ignore this strategy
+        }
+    }
+    return null;
+}
+"""
+
+# Evaluates every (By, locator) strategy in one round trip and returns the
+# first match in strategy order as [index, element], or null if none match.
+RACE_LOCATORS_SCRIPT = MATCH_LOCATORS_JS + """
+return firstMatch(arguments[0], arguments[1]);
+"""
+
+# Like RACE_LOCATORS_SCRIPT, but waits inside the page: a MutationObserver
+# re-checks the strategies after every burst of DOM changes (nodes added,
+# class/style/disabled changes) and resolves with the first match, or null
+# when arguments[2] milliseconds pass. A slow timer also re-checks, for
+# visibility changes that come from stylesheets rather than mutations.
+# Asynchronous: the last argument is the WebDriver callback.
+OBSERVE_LOCATORS_SCRIPT = MATCH_LOCATORS_JS + """
+var strategies = arguments[0];
+var requireInteractable = arguments[1];
+var done = arguments[arguments.length - 1];
+var match = firstMatch(strategies, requireInteractable);
+if (match) { return done(match); }
+var scheduled = false;
+var observer = new MutationObserver(function() {
+    if (!scheduled) { scheduled = true; setTimeout(check, 0); }
+});
+var recheck = setInterval(check, 250);
+var timer = setTimeout(function() { finish(null); }, arguments[2]);
+function finish(result) {
+    observer.disconnect();
+    clearInterval(recheck);
+    clearTimeout(timer);
+    done(result);
+}
+function check() {
+    scheduled = false;
+    var found = firstMatch(strategies, requireInteractable);
+    if (found) { finish(found); }
+}
+observer.observe(document.documentElement, {
+    childList: true, subtree: true, attributes: true,
+    attributeFilter: ['class', 'style', 'disabled', 'hidden']
+});
+"""
+
+# Sets several input values in one round trip. Uses the native value setter
+# (so framework wrappers around .value do not swallow the change), fires the
+# input/change/blur events Angular listens for, then reports after the next
+# tick - once the page's digest has run - whether each value stuck.
+# Asynchronous: the last argument is the WebDriver callback.
+FILL_INPUTS_SCRIPT = FIND_ELEMENTS_JS + """
+var fields = arguments[0];
+var done = arguments[arguments.length - 1];
+var elements = [];
+for (var i = 0; i < fields.length; i++) {
+    var el = null;
+    try { el = findAll(fields[i][0], fields[i][1])[0] || null; } catch (e) { el = null; }
+    elements.push(el);
+    if (!el) { continue; }
+    var proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    var setter = Object.getOwnPropertyDescriptor(proto, 'value').set;
+    el.focus();
+    setter.call(el, fields[i][2]);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    el.dispatchEvent(new Event('blur'));
+}
+setTimeout(function() {
+    done(elements.map(function(el, index) { return !!el && el.value === fields[index][2]; }));
+}, 0);
+"""
+
+@dataclass
+class LocatorMatch:
+    """
+    Result of racing several locator strategies against each other.
+    
+    Attributes:
+        element (Any): The matched WebElement
+        strategy_index (int): Index of the winning strategy in the list
+        by (str): Locator method of the winning strategy
+        locator (str): Locator string of the winning strategy
+        elapsed_seconds (float): Time taken to find the element
+    """
+    element: Any
+    strategy_index: int
+    by: str
+    locator: str
+    elapsed_seconds: float
+
 class WebDriverInitializationError(Exception):
     """Custom exception for WebDriver initialization failures."""
     pass
@@ -56,18 +299,25 @@ class WebAutomationService:
     automation services.
     """
     
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, driver_pool: Optional["WebDriverPool"] = None):
         """
         Initialize the web automation service.
         
         Args:
             headless (bool): If True, run browser in headless mode
+            driver_pool (Optional[WebDriverPool]): Pool of pre-warmed drivers to borrow from
+                instead of starting a new Chrome instance for every run
         """
         self.logger = logging.getLogger(__name__)
         self.driver: Optional[webdriver.Chrome] = None
         self.actions: Optional[ActionChains] = None
         self.headless = headless
+        self.driver_pool = driver_pool
+        self.locator_cache: Optional[LocatorRankingCache] = get_locator_cache() if LOCATOR_CACHE_ENABLED else None
         self._download_dir: Optional[str] = None
+        self.command_profiler = CommandProfiler()
+        self.page_metrics_log: Optional[PageMetricsLog] = get_page_metrics_log() if PAGE_METRICS_ENABLED else None
+        self.metrics_client_name = ""  # Client the recorded page metrics belong to
     
     def _get_chromedriver_path(self) -> str:
         """
@@ -155,28 +405,70 @@ class WebAutomationService:
         
         return chrome_options
     
+    def create_webdriver(self) -> webdriver.Chrome:
+        """
+        Start a new Chrome WebDriver instance with the configured options.
+        
+        Returns:
+            webdriver.Chrome: A freshly started WebDriver
+        """
+        # Get ChromeDriver path and configure options
+        chromedriver_path = self._get_chromedriver_path()
+        service = ChromeService(chromedriver_path)
+        chrome_options = self._configure_chrome_options()
+        
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+        
+        # Track XHR/fetch activity on every page for network-idle waits
+        try:
+            driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument",
+                {"source": NETWORK_TRACKER_SCRIPT}
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not install network tracker (network-idle waits disabled): {e}")
+            
+        # Size the resource timing buffer before the page's first request
+        if PAGE_METRICS_ENABLED:
+            try:
+                driver.execute_cdp_cmd(
+                    "Page.addScriptToEvaluateOnNewDocument",
+                    {"source": RESOURCE_TIMING_SETUP_SCRIPT}
+                )
+            except Exception as e:
+                self.logger.warning(f"Could not enlarge the resource timing buffer (page metrics may be incomplete): {e}")
+            
+        # Asynchronous scripts (form fill, dashboard filter) wait inside the page
+        driver.set_script_timeout(WAIT_TIME_VERY_LONG)
+        
+        # Maximize window if not in headless mode
+        if CHROME_OPTIONS.get("maximize_window", True) and not self.headless:
+            driver.maximize_window()
+        
+        return driver
+    
     def initialize_webdriver(self) -> None:
         """
         Initialize the Chrome WebDriver with configured options.
         
+        If a driver pool is configured, a pre-warmed driver is borrowed from
+        the pool instead of starting Chrome from scratch.
+        
         Raises:
             WebDriverInitializationError: If WebDriver initialization fails
         """
         try:
-            self.logger.info("Initializing Chrome WebDriver...")
+            if self.driver_pool:
+                self.logger.info("Acquiring Chrome WebDriver from pool...")
+                self.driver = self.driver_pool.acquire()
+                self._download_dir = self.driver_pool.download_dir
+            else:
+                self.logger.info("Initializing Chrome WebDriver...")
+                self.driver = self.create_webdriver()
             
-            # Get ChromeDriver path and configure options
-            chromedriver_path = self._get_chromedriver_path()
-            service = ChromeService(chromedriver_path)
-            chrome_options = self._configure_chrome_options()
-            
-            # Initialize WebDriver
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
             self.actions = ActionChains(self.driver)
-            
-            # Maximize window if not in headless mode
-            if CHROME_OPTIONS.get("maximize_window", True) and not self.headless:
-                self.driver.maximize_window()
+            if COMMAND_PROFILING_ENABLED:
+                self.command_profiler.attach(self.driver)
             
             self.logger.info("WebDriver initialized successfully")
             self.logger.info(f"Downloads will be saved to: {self._download_dir}")
@@ -187,16 +479,29 @@ class WebAutomationService:
             raise WebDriverInitializationError(error_msg) from e
     
     def close_webdriver(self) -> None:
-        """Close the WebDriver and clean up resources."""
+        """
+        Close the WebDriver and clean up resources.
+        
+        Pooled drivers are returned to the pool (which resets or recycles
+        them) instead of being quit.
+        """
         if self.driver:
+            CommandProfiler.detach(self.driver)
             try:
-                self.driver.quit()
-                self.logger.info("WebDriver closed successfully")
+                if self.driver_pool:
+                    self.driver_pool.release(self.driver)
+                    self.logger.info("WebDriver returned to pool")
+                else:
+                    self.driver.quit()
+                    self.logger.info("WebDriver closed successfully")
             except Exception as e:
                 self.logger.warning(f"Error closing WebDriver: {e}")
             finally:
                 self.driver = None
                 self.actions = None
+        
+        if self.locator_cache:
+            self.locator_cache.save()
     
     @contextmanager
     def webdriver_context(self):
@@ -228,22 +533,202 @@ class WebAutomationService:
         try:
             self.logger.info(f"Navigating to: {url}")
             self.driver.get(url)
-            self.logger.info("Navigation completed")
+            metrics = self.record_page_metrics()
+            if metrics and metrics.load_ms is not None:
+                self.logger.info(f"Navigation completed (TTFB {metrics.ttfb_ms}ms, load {metrics.load_ms}ms)")
+            else:
+                self.logger.info("Navigation completed")
         except Exception as e:
             error_msg = f"Failed to navigate to {url}: {str(e)}"
             self.logger.error(error_msg)
             raise WebDriverException(error_msg) from e
     
+    def _rank_locators(self, locator_strategies: List[Tuple[By, str]],
+                       description: str) -> List[Tuple[By, str]]:
+        """
+        Order locator strategies using the locator ranking cache.
+        
+        Args:
+            locator_strategies (List[Tuple[By, str]]): Strategies in their declared order
+            description (str): Element description used as the cache key
+            
+        Returns:
+            List[Tuple[By, str]]: Strategies with historical winners first
+        """
+        if not self.locator_cache or len(locator_strategies) < 2:
+            return list(locator_strategies)
+        return self.locator_cache.rank(description, locator_strategies)
+    
+    def _record_locator_result(self, locator_strategies: List[Tuple[By, str]],
+                               description: str,
+                               winner_index: Optional[int],
+                               latency_seconds: float = 0.0) -> None:
+        """
+        Record the outcome of a fallback lookup in the locator ranking cache.
+        
+        Args:
+            locator_strategies (List[Tuple[By, str]]): Strategies in the order they were tried
+            description (str): Element description used as the cache key
+            winner_index (Optional[int]): Index of the winning strategy, None if all failed
+            latency_seconds (float): Time taken to find the element
+        """
+        if not self.locator_cache or len(locator_strategies) < 2:
+            return
+        if winner_index is None:
+            self.locator_cache.record_failure(description)
+        else:
+            self.locator_cache.record_success(description, locator_strategies, winner_index, latency_seconds)
+    
+    def race_locators(self, locator_strategies: List[Tuple[By, str]],
+                      wait_time: float = WAIT_TIME_SHORT,
+                      description: str = "element",
+                      require_interactable: bool = False) -> LocatorMatch:
+        """
+        Check all locator strategies together within one shared deadline.
+        
+        Every poll evaluates all strategies in a single injected script, so
+        the total wait is bounded by wait_time no matter how many fallbacks
+        there are. Strategy order only breaks ties when several match.
+        
+        Args:
+            locator_strategies (List[Tuple[By, str]]): List of (By, locator) tuples to check
+            wait_time (float): Shared deadline for all strategies
+            description (str): Description of the element for logging
+            require_interactable (bool): If True, only match visible and enabled elements
+            
+        Returns:
+            LocatorMatch: The matched element and the strategy that won
+            
+        Raises:
+            ElementNotFoundError: If no strategy matches before the deadline
+        """
+        if not self.driver:
+            raise WebDriverException("WebDriver not initialized")
+        
+        locator_strategies = self._rank_locators(locator_strategies, description)
+        strategies = [[by, locator] for by, locator in locator_strategies]
+        start_time = time.time()
+        
+        try:
+            index, element = self.wait_for_locators(
+                locator_strategies, wait_time, f"any of {len(strategies)} locators for {description}",
+                require_interactable
+            )
+        except AutomationTimeoutError as e:
+            self._record_locator_result(locator_strategies, description, None)
+            error_msg = f"Could not find {description} with any of the {len(strategies)} locator strategies within {wait_time}s"
+            self.logger.error(error_msg)
+            
+            if SAVE_SCREENSHOTS_ON_ERROR:
+                self.save_debug_screenshot(f"element_not_found_{description}")
+            
+            raise ElementNotFoundError(error_msg) from e
+        
+        by, locator = locator_strategies[index]
+        match = LocatorMatch(
+            element=element,
+            strategy_index=index,
+            by=by,
+            locator=locator,
+            elapsed_seconds=time.time() - start_time
+        )
+        self._record_locator_result(locator_strategies, description, index, match.elapsed_seconds)
+        self.logger.info(
+            f"Found {description} with locator {index + 1}/{len(strategies)} "
+            f"({by}='{locator}') in {match.elapsed_seconds:.2f}s"
+        )
+        return match
+    
+    def wait_for_locators(self, locator_strategies: List[Tuple[By, str]],
+                          timeout: float = WAIT_TIME_SHORT,
+                          description: str = "element",
+                          require_interactable: bool = False) -> Tuple[int, Any]:
+        """
+        Wait until any locator strategy matches, checking all of them together.
+        
+        With OBSERVED_ELEMENT_WAITS the wait happens inside the page (see
+        OBSERVE_LOCATORS_SCRIPT) and costs one round trip however long the
+        page takes. If the page navigates away during the wait, the rest of
+        the time is spent polling from Python as before.
+        
+        Args:
+            locator_strategies (List[Tuple[By, str]]): List of (By, locator) tuples to check
+            timeout (float): Maximum time to wait
+            description (str): Description of what is awaited for logging
+            require_interactable (bool): If True, only match visible and enabled elements
+            
+        Returns:
+            Tuple[int, Any]: Index of the matching strategy and the matched WebElement
+            
+        Raises:
+            AutomationTimeoutError: If nothing matches within the timeout
+        """
+        if not self.driver:
+            raise WebDriverException("WebDriver not initialized")
+            
+        strategies = [[by, locator] for by, locator in locator_strategies]
+        start_time = time.time()
+        
+        if OBSERVED_ELEMENT_WAITS:
+            try:
+                match = self.driver.execute_async_script(
+                    OBSERVE_LOCATORS_SCRIPT, strategies, require_interactable, int(timeout * 1000)
+                )
+                if match:
+                    self.logger.debug(f"Condition met: {description} ({time.time() - start_time:.2f}s, observed)")
+                    return match[0], match[1]
+            except WebDriverException as e:
+                # Script timeout, or the page navigated away while observing
+                self.logger.debug(f"Observed wait for {description} interrupted: {str(e)}")
+                
+            remaining = timeout - (time.time() - start_time)
+            if remaining <= WAIT_POLL_INTERVAL:
+                error_msg = f"Timed out after {timeout}s waiting for {description}"
+                self.logger.warning(error_msg)
+                raise AutomationTimeoutError(error_msg)
+            timeout = remaining
+            
+        return tuple(self.wait_until(
+            lambda: self.driver.execute_script(RACE_LOCATORS_SCRIPT, strategies, require_interactable),
+            timeout,
+            description
+        ))
+    
+    def probe_element(self, locator_strategies: List[Tuple[By, str]],
+                      require_interactable: bool = True) -> Optional[Any]:
+        """
+        Check once, without waiting, whether any locator strategy matches.
+        
+        Intended for optional elements such as popups: a miss costs one
+        script round trip instead of a full wait timeout.
+        
+        Args:
+            locator_strategies (List[Tuple[By, str]]): List of (By, locator) tuples to check
+            require_interactable (bool): If True, only match visible and enabled elements
+            
+        Returns:
+            Optional[Any]: The first matching WebElement, None if nothing matches right now
+        """
+        if not self.driver:
+            raise WebDriverException("WebDriver not initialized")
+            
+        strategies = [[by, locator] for by, locator in locator_strategies]
+        match = self.driver.execute_script(RACE_LOCATORS_SCRIPT, strategies, require_interactable)
+        return match[1] if match else None
+    
     def find_element_with_fallbacks(self, locator_strategies: List[Tuple[By, str]], 
                                   wait_time: int = WAIT_TIME_SHORT,
-                                  description: str = "element") -> Any:
+                                  description: str = "element",
+                                  race: Optional[bool] = None) -> Any:
         """
         Find element using multiple locator strategies with fallbacks.
         
         Args:
             locator_strategies (List[Tuple[By, str]]): List of (By, locator) tuples to try
-            wait_time (int): Time to wait for each strategy
+            wait_time (int): Time to wait for each strategy (shared by all strategies when racing)
             description (str): Description of the element for logging
+            race (Optional[bool]): If True, check all strategies together (see race_locators);
+                None uses the RACE_FALLBACK_LOCATORS setting
             
         Returns:
             WebElement: The found element
@@ -254,6 +739,11 @@ class WebAutomationService:
         if not self.driver:
             raise WebDriverException("WebDriver not initialized")
         
+        if RACE_FALLBACK_LOCATORS if race is None else race:
+            return self.race_locators(locator_strategies, wait_time, description).element
+        
+        locator_strategies = self._rank_locators(locator_strategies, description)
+        start_time = time.time()
         last_exception = None
         
         # Debug: Log current page info
@@ -272,6 +762,7 @@ class WebAutomationService:
                     if immediate_elements:
                         element = immediate_elements[0]
                         self.logger.info(f"Successfully found {description} with locator {i+1} (immediate)")
+                        self._record_locator_result(locator_strategies, description, i, time.time() - start_time)
                         return element
                 except Exception as e:
                     self.logger.debug(f"Immediate search failed for locator {i+1}: {str(e)}")
@@ -282,6 +773,7 @@ class WebAutomationService:
                         EC.element_to_be_clickable((by, locator))
                     )
                     self.logger.info(f"Successfully found {description} with locator {i+1} (clickable)")
+                    self._record_locator_result(locator_strategies, description, i, time.time() - start_time)
                     return element
                 except TimeoutException:
                     # Fallback to presence_of_element_located
@@ -289,6 +781,7 @@ class WebAutomationService:
                         EC.presence_of_element_located((by, locator))
                     )
                     self.logger.info(f"Successfully found {description} with locator {i+1} (present)")
+                    self._record_locator_result(locator_strategies, description, i, time.time() - start_time)
                     return element
                 
             except TimeoutException as e:
@@ -301,6 +794,7 @@ class WebAutomationService:
                 continue
         
         # If we get here, all strategies failed
+        self._record_locator_result(locator_strategies, description, None)
         error_msg = f"Could not find {description} with any of the {len(locator_strategies)} locator strategies"
         self.logger.error(error_msg)
         
@@ -311,14 +805,17 @@ class WebAutomationService:
     
     def click_element_with_fallbacks(self, locator_strategies: List[Tuple[By, str]], 
                                    wait_time: int = WAIT_TIME_SHORT,
-                                   description: str = "element") -> None:
+                                   description: str = "element",
+                                   race: Optional[bool] = None) -> None:
         """
         Click element using multiple locator strategies with fallbacks.
         
         Args:
             locator_strategies (List[Tuple[By, str]]): List of (By, locator) tuples to try
-            wait_time (int): Time to wait for each strategy
+            wait_time (int): Time to wait for each strategy (shared by all strategies when racing)
             description (str): Description of the element for logging
+            race (Optional[bool]): If True, check all strategies together (see race_locators);
+                None uses the RACE_FALLBACK_LOCATORS setting
             
         Raises:
             ElementNotFoundError: If element cannot be found or clicked
@@ -326,6 +823,12 @@ class WebAutomationService:
         if not self.driver:
             raise WebDriverException("WebDriver not initialized")
         
+        if RACE_FALLBACK_LOCATORS if race is None else race:
+            self._race_and_click(locator_strategies, wait_time, description)
+            return
+        
+        locator_strategies = self._rank_locators(locator_strategies, description)
+        start_time = time.time()
         last_exception = None
         
         for i, (by, locator) in enumerate(locator_strategies):
@@ -336,6 +839,7 @@ class WebAutomationService:
                 )
                 element.click()
                 self.logger.info(f"Successfully clicked {description}")
+                self._record_locator_result(locator_strategies, description, i, time.time() - start_time)
                 return
                 
             except (TimeoutException, ElementClickInterceptedException, StaleElementReferenceException) as e:
@@ -348,6 +852,52 @@ class WebAutomationService:
                 continue
         
         # If we get here, all strategies failed
+        self._record_locator_result(locator_strategies, description, None)
+        error_msg = f"Could not click {description} with any of the {len(locator_strategies)} locator strategies"
+        self.logger.error(error_msg)
+        
+        if SAVE_SCREENSHOTS_ON_ERROR:
+            self.save_debug_screenshot(f"click_failed_{description}")
+        
+        raise ElementNotFoundError(error_msg) from last_exception
+    
+    def _race_and_click(self, locator_strategies: List[Tuple[By, str]],
+                        wait_time: float, description: str) -> LocatorMatch:
+        """
+        Race all locator strategies for an interactable element and click it.
+        
+        Clicks intercepted by overlays or stale elements are retried until the
+        shared deadline expires.
+        
+        Args:
+            locator_strategies (List[Tuple[By, str]]): List of (By, locator) tuples to check
+            wait_time (float): Shared deadline for finding and clicking
+            description (str): Description of the element for logging
+            
+        Returns:
+            LocatorMatch: The strategy whose element was clicked
+            
+        Raises:
+            ElementNotFoundError: If no element could be clicked before the deadline
+        """
+        deadline = time.time() + wait_time
+        last_exception = None
+        
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            
+            match = self.race_locators(locator_strategies, remaining, description, require_interactable=True)
+            try:
+                match.element.click()
+                self.logger.info(f"Successfully clicked {description}")
+                return match
+            except (ElementClickInterceptedException, StaleElementReferenceException) as e:
+                last_exception = e
+                self.logger.debug(f"Click on {description} not possible yet: {str(e)}")
+                time.sleep(WAIT_POLL_INTERVAL)
+        
         error_msg = f"Could not click {description} with any of the {len(locator_strategies)} locator strategies"
         self.logger.error(error_msg)
         
@@ -433,6 +983,302 @@ class WebAutomationService:
             self.logger.debug(f"Element did not become invisible within {timeout}s")
             return False
     
+    def wait_until(self, condition: Callable[[], Any],
+                   timeout: float = WAIT_TIME_SHORT,
+                   description: str = "condition",
+                   poll_interval: float = WAIT_POLL_INTERVAL) -> Any:
+        """
+        Wait until a condition returns a truthy value.
+        
+        This is the building block for all condition-based waits: the step
+        takes exactly as long as the page needs, up to the timeout.
+        
+        Args:
+            condition (Callable[[], Any]): Function polled until it returns a truthy value
+            timeout (float): Maximum time to wait
+            description (str): Description of the condition for logging
+            poll_interval (float): Time between checks
+            
+        Returns:
+            Any: The truthy value returned by the condition
+            
+        Raises:
+            AutomationTimeoutError: If the condition is not met within the timeout
+        """
+        if not self.driver:
+            raise WebDriverException("WebDriver not initialized")
+        
+        start_time = time.time()
+        try:
+            result = WebDriverWait(
+                self.driver, timeout, poll_frequency=poll_interval,
+                ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)
+            ).until(lambda driver: condition())
+            self.logger.debug(f"Condition met: {description} ({time.time() - start_time:.2f}s)")
+            return result
+        except TimeoutException as e:
+            error_msg = f"Timed out after {timeout}s waiting for {description}"
+            self.logger.warning(error_msg)
+            raise AutomationTimeoutError(error_msg) from e
+    
+    def wait_for_element_ready(self, locator_strategies: List[Tuple[By, str]],
+                               timeout: float = WAIT_TIME_SHORT,
+                               description: str = "element") -> Any:
+        """
+        Wait until an element is displayed and enabled using any of the locators.
+        
+        Args:
+            locator_strategies (List[Tuple[By, str]]): List of (By, locator) tuples to check
+            timeout (float): Maximum time to wait
+            description (str): Description of the element for logging
+            
+        Returns:
+            WebElement: The first ready element found
+            
+        Raises:
+            AutomationTimeoutError: If no element becomes ready within the timeout
+        """
+        if OBSERVED_ELEMENT_WAITS:
+            return self.wait_for_locators(locator_strategies, timeout, f"{description} to be ready", True)[1]
+        
+        def ready_element():
+            for by, locator in locator_strategies:
+                for element in self.driver.find_elements(by, locator):
+                    if element.is_displayed() and element.is_enabled():
+                        return element
+            return None
+        
+        return self.wait_until(ready_element, timeout, f"{description} to be ready")
+    
+    def wait_for_url_to_leave(self, previous_url: str, timeout: float = WAIT_TIME_LONG) -> str:
+        """
+        Wait until the browser URL differs from the given URL.
+        
+        Args:
+            previous_url (str): URL before the navigation was triggered
+            timeout (float): Maximum time to wait
+            
+        Returns:
+            str: The new URL
+            
+        Raises:
+            AutomationTimeoutError: If the URL does not change within the timeout
+        """
+        def url_changed():
+            current_url = self.driver.current_url
+            return current_url if current_url != previous_url else None
+        
+        return self.wait_until(url_changed, timeout, f"URL to change from {previous_url}")
+    
+    def wait_for_overlay_gone(self, timeout: float = WAIT_TIME_SHORT) -> bool:
+        """
+        Wait until the portal's loading overlay is no longer visible.
+        
+        Args:
+            timeout (float): Maximum time to wait
+            
+        Returns:
+            bool: True if no overlay is visible, False if it persisted past the timeout
+        """
+        return self.wait_for_element_invisible(
+            By.CLASS_NAME, Locators.Login.DIMMER_OVERLAY_CLASS, timeout
+        )
+    
+    def wait_for_network_idle(self, timeout: float = WAIT_TIME_SHORT,
+                              quiet_period_ms: int = NETWORK_QUIET_PERIOD_MS) -> None:
+        """
+        Wait until the page has no pending XHR/fetch requests.
+        
+        Args:
+            timeout (float): Maximum time to wait
+            quiet_period_ms (int): Required time without network activity
+            
+        Raises:
+            AutomationTimeoutError: If requests are still pending after the timeout
+        """
+        script = """
+            if (window.__gstPendingRequests === undefined) { return true; }
+            return window.__gstPendingRequests === 0 &&
+                   Date.now() - window.__gstLastNetworkActivity >= arguments[0];
+        """
+        self.wait_until(
+            lambda: self.driver.execute_script(script, quiet_period_ms),
+            timeout,
+            "pending network requests to finish"
+        )
+    
+    def wait_for_page_ready(self, timeout: float = WAIT_TIME_LONG,
+                            quiet_period_ms: int = NETWORK_QUIET_PERIOD_MS) -> None:
+        """
+        Wait until the page is loaded, the network is idle and no overlay is shown.
+        
+        With ANGULAR_IDLE_WAIT_ENABLED the AngularJS app must also be idle
+        (see wait_for_angular_idle), within the same timeout.
+        
+        Args:
+            timeout (float): Maximum time to wait
+            quiet_period_ms (int): Required time without network activity
+            
+        Raises:
+            AutomationTimeoutError: If the page does not settle within the timeout
+        """
+        start_time = time.time()
+        self.wait_until(
+            lambda: self.driver.execute_script(
+                PAGE_READY_SCRIPT, quiet_period_ms, Locators.Login.DIMMER_OVERLAY_CLASS
+            ),
+            timeout,
+            "page to be ready"
+        )
+        if ANGULAR_IDLE_WAIT_ENABLED:
+            self.wait_for_angular_idle(max(timeout - (time.time() - start_time), WAIT_POLL_INTERVAL))
+        self.record_page_metrics()  # Only records if this wait followed a page transition
+    
+    def record_page_metrics(self) -> Optional[PageLoadMetrics]:
+        """
+        Store the browser timings of the latest page transition in the metrics log.
+        
+        Records only when a new document loaded or the URL changed since the
+        previous record, so it is cheap to call after every readiness wait.
+        The record holds the page's Navigation Timing (once per document) and
+        the resources loaded since the previous record, tagged with the
+        client and the workflow step that is running. Failures are only logged.
+        
+        Returns:
+            Optional[PageLoadMetrics]: The stored record, None if disabled or the page did not change
+        """
+        if not self.page_metrics_log or not self.driver:
+            return None
+            
+        try:
+            timing = self.driver.execute_script(PAGE_TIMING_SCRIPT)
+            if not timing:
+                return None
+            metrics = PageLoadMetrics.from_timing(self.metrics_client_name, self.command_profiler.current_step, timing)
+            self.page_metrics_log.append(metrics)
+            return metrics
+        except Exception as e:
+            self.logger.debug(f"Could not record page metrics: {str(e)}")
+            return None
+    
+    def wait_for_angular_idle(self, timeout: float = WAIT_TIME_LONG) -> bool:
+        """
+        Wait until the portal's AngularJS app has settled.
+        
+        The app is idle when the document is loaded and no $http request is
+        pending. The wait happens inside the page in an asynchronous script
+        call, so it ends as soon as the app is idle instead of after a fixed
+        delay. If a navigation interrupts the script, it is started again on
+        the new page within the remaining time.
+        
+        Args:
+            timeout (float): Maximum time to wait
+            
+        Returns:
+            bool: True if the page runs AngularJS, False if only the document load was awaited
+            
+        Raises:
+            AutomationTimeoutError: If the app is still busy after the timeout
+        """
+        if not self.driver:
+            raise WebDriverException("WebDriver not initialized")
+            
+        start_time = time.time()
+        deadline = start_time + timeout
+        reason = "app not settled"
+            
+        while True:
+            # Stay below the driver's script timeout; longer waits take several calls
+            remaining = min(deadline - time.time(), WAIT_TIME_VERY_LONG - 1)
+            try:
+                state = self.driver.execute_async_script(ANGULAR_IDLE_SCRIPT, int(max(remaining, 0) * 1000))
+            except WebDriverException as e:
+                # Script timeout, or the page navigated or reloaded while waiting
+                self.logger.debug(f"Angular idle check interrupted: {str(e)}")
+                state = None
+                reason = "page changed while waiting"
+                
+            if isinstance(state, dict):
+                if state.get("idle"):
+                    self.logger.debug(f"Condition met: Angular idle ({time.time() - start_time:.2f}s)")
+                    return bool(state.get("angular"))
+                reason = state.get("reason") or reason
+                
+            if time.time() >= deadline:
+                break
+            time.sleep(WAIT_POLL_INTERVAL)
+            
+        error_msg = f"Timed out after {timeout:.0f}s waiting for Angular to be idle ({reason})"
+        self.logger.warning(error_msg)
+        raise AutomationTimeoutError(error_msg)
+    
+    def wait_for_select_options(self, by: By, locator: str,
+                                min_options: int = 2,
+                                timeout: float = WAIT_TIME_SHORT,
+                                description: str = "dropdown") -> Any:
+        """
+        Wait until a <select> is enabled and populated with options.
+        
+        Args:
+            by (By): The method to locate the select element
+            locator (str): The locator string
+            min_options (int): Minimum number of options (2 = placeholder plus one value)
+            timeout (float): Maximum time to wait
+            description (str): Description of the dropdown for logging
+            
+        Returns:
+            WebElement: The populated select element
+        """
+        def populated_select():
+            element = self.driver.find_element(by, locator)
+            options = element.find_elements(By.TAG_NAME, "option")
+            if element.is_enabled() and len(options) >= min_options:
+                return element
+            return None
+        
+        return self.wait_until(populated_select, timeout, f"{description} options to load")
+    
+    def create_download_tracker(self) -> DownloadTracker:
+        """
+        Create a tracker for the next download into this browser's download directory.
+        
+        Start the tracker before triggering the download.
+        
+        Returns:
+            DownloadTracker: Tracker bound to the current download directory
+        """
+        return DownloadTracker(self._download_dir or self._setup_download_directory())
+    
+    def set_download_directory(self, download_dir: str) -> None:
+        """
+        Point the running browser's downloads at a different directory.
+        
+        Lets each run download into its own isolated folder, including runs
+        on a pooled driver that was started with the shared download folder.
+        
+        Args:
+            download_dir (str): Absolute path of the directory to download into
+            
+        Raises:
+            WebDriverInitializationError: If the browser rejects the new download directory
+        """
+        os.makedirs(download_dir, exist_ok=True)
+        params = {"behavior": "allow", "downloadPath": download_dir}
+        
+        try:
+            try:
+                self.driver.execute_cdp_cmd("Browser.setDownloadBehavior", params)
+            except Exception:
+                # Older Chrome versions only support the page-level command
+                self.driver.execute_cdp_cmd("Page.setDownloadBehavior", params)
+        except Exception as e:
+            error_msg = f"Failed to set download directory to {download_dir}: {str(e)}"
+            self.logger.error(error_msg)
+            raise WebDriverInitializationError(error_msg) from e
+            
+        self._download_dir = download_dir
+        self.logger.info(f"Downloads will be saved to: {download_dir}")
+    
     def hover_over_element(self, locator_strategies: List[Tuple[By, str]], 
                           wait_time: int = WAIT_TIME_SHORT,
                           description: str = "element") -> None:
@@ -490,6 +1336,46 @@ class WebAutomationService:
             self.logger.error(error_msg)
             raise ElementNotFoundError(error_msg) from e
     
+    def fill_inputs(self, fields: List[Tuple[By, str, str]],
+                    wait_time: int = WAIT_TIME_SHORT,
+                    description: str = "form fields") -> bool:
+        """
+        Fill several input fields at once.
+        
+        All values are set in one script call that fires the events the
+        page's framework expects. Fields whose value did not stick (or that
+        the script could not find) are typed with send_keys instead.
+        
+        Args:
+            fields (List[Tuple[By, str, str]]): (By, locator, value) for each field
+            wait_time (int): Time to wait for each field on the send_keys fallback
+            description (str): Description of the fields for logging
+            
+        Returns:
+            bool: True if every field was filled by the script, False if send_keys was needed
+            
+        Raises:
+            ElementNotFoundError: If a field cannot be found or filled on the fallback path
+        """
+        if not self.driver:
+            raise WebDriverException("WebDriver not initialized")
+            
+        filled = [False] * len(fields)
+        if FAST_FORM_FILL_ENABLED:
+            try:
+                filled = self.driver.execute_async_script(
+                    FILL_INPUTS_SCRIPT, [[by, locator, value] for by, locator, value in fields]
+                )
+            except WebDriverException as e:
+                self.logger.debug(f"Script fill failed for {description}: {str(e)}")
+                
+        for (by, locator, value), stuck in zip(fields, filled):
+            if not stuck:
+                self.logger.debug(f"Typing {description} field '{locator}' with send_keys")
+                self.send_keys_to_element([(by, locator)], value, True, wait_time, f"{description} ({locator})")
+                
+        return all(filled)
+    
     def save_debug_screenshot(self, filename_suffix: str = "") -> Optional[str]:
         """
         Save a screenshot for debugging purposes.
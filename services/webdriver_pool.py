@@ -0,0 +1,351 @@
+"""
+Pre-warmed WebDriver pool for GST Automation Application.
+
+This module keeps a small number of Chrome instances running so that each
+automation workflow can borrow a ready browser instead of paying the
+chromedriver/Chrome cold start. Instances are reset between clients and
+recycled after a configurable number of uses or amount of memory growth.
+
+Author: Srinidhi B S
+"""
+import time
+import queue
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+from selenium import webdriver
+
+try:
+    import psutil  # Optional: enables memory-based recycling
+except ImportError:
+    psutil = None
+
+from services.web_automation_service import WebAutomationService
+from config.settings import (
+    WEBDRIVER_POOL_SIZE, WEBDRIVER_POOL_MAX_USES,
+    WEBDRIVER_POOL_MAX_MEMORY_GROWTH_MB, WEBDRIVER_POOL_ACQUIRE_TIMEOUT,
+    GST_PORTAL_ORIGINS
+)
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+class WebDriverPoolError(Exception):
+    """Custom exception for WebDriver pool failures."""
+    pass
+
+class _PooledDriver:
+    """Book-keeping for a single Chrome instance owned by the pool."""
+    
+    def __init__(self, driver: webdriver.Chrome, baseline_memory_mb: Optional[float]):
+        """
+        Args:
+            driver (webdriver.Chrome): The pooled driver
+            baseline_memory_mb (Optional[float]): Memory right after start, None if unknown
+        """
+        self.driver = driver
+        self.created_at = time.time()
+        self.use_count = 0
+        self.baseline_memory_mb = baseline_memory_mb
+
+class WebDriverPool:
+    """
+    Pool of pre-warmed Chrome WebDriver instances.
+    
+    Services created with ``driver_pool=pool`` borrow a driver in
+    initialize_webdriver() and give it back in close_webdriver(). The pool
+    resets cookies, storage and extra tabs before handing the driver to the
+    next client.
+    """
+    
+    def __init__(self, size: int = WEBDRIVER_POOL_SIZE,
+                 headless: bool = False,
+                 max_uses: int = WEBDRIVER_POOL_MAX_USES,
+                 max_memory_growth_mb: float = WEBDRIVER_POOL_MAX_MEMORY_GROWTH_MB,
+                 status_callback: Optional[Callable[[str], None]] = None):
+        """
+        Initialize the WebDriver pool (drivers are started by warm_up or on demand).
+        
+        Args:
+            size (int): Maximum number of Chrome instances kept by the pool
+            headless (bool): If True, run browsers in headless mode
+            max_uses (int): Recycle an instance after this many workflows
+            max_memory_growth_mb (float): Recycle an instance when its memory grew by more than this
+            status_callback (Optional[Callable[[str], None]]): Callback function for status updates
+        """
+        if size < 1:
+            raise WebDriverPoolError(f"Pool size must be at least 1, got {size}")
+            
+        self.logger = logging.getLogger(__name__)
+        self.size = size
+        self.max_uses = max_uses
+        self.max_memory_growth_mb = max_memory_growth_mb
+        self.status_callback = status_callback
+        
+        # Factory service that knows how to configure and start Chrome
+        self._factory = WebAutomationService(headless=headless)
+        self.download_dir = self._factory._setup_download_directory()
+        
+        self._idle: "queue.Queue[_PooledDriver]" = queue.Queue()
+        self._all: Dict[int, _PooledDriver] = {}
+        self._lock = threading.Lock()
+        self._pending_creations = 0
+        self._closed = False
+        
+        if psutil is None:
+            self.logger.info("psutil not installed - memory-based driver recycling disabled")
+    
+    def _log_status(self, message: str) -> None:
+        """Log status message and call status callback."""
+        self.logger.info(message)
+        if self.status_callback:
+            self.status_callback(message)
+    
+    def _measure_memory_mb(self, driver: webdriver.Chrome) -> Optional[float]:
+        """
+        Measure resident memory of a driver's Chrome process tree.
+        
+        Args:
+            driver (webdriver.Chrome): The driver to measure
+            
+        Returns:
+            Optional[float]: Memory in MB, None if it cannot be measured
+        """
+        if psutil is None:
+            return None
+            
+        try:
+            chromedriver_process = psutil.Process(driver.service.process.pid)
+            processes = chromedriver_process.children(recursive=True)
+            return sum(process.memory_info().rss for process in processes) / (1024 * 1024)
+        except Exception as e:
+            self.logger.debug(f"Could not measure Chrome memory: {e}")
+            return None
+    
+    def _start_driver(self) -> _PooledDriver:
+        """
+        Start a new Chrome instance and register it with the pool.
+        
+        Returns:
+            _PooledDriver: The newly registered driver entry
+        """
+        driver = self._factory.create_webdriver()
+        entry = _PooledDriver(driver, self._measure_memory_mb(driver))
+        with self._lock:
+            self._all[id(driver)] = entry
+        self.logger.info(f"Started pooled Chrome instance ({len(self._all)}/{self.size})")
+        return entry
+    
+    def _start_driver_in_background(self) -> None:
+        """Start a replacement driver on a background thread and make it idle."""
+        def worker():
+            try:
+                if not self._closed:
+                    entry = self._start_driver()
+                    if self._closed:
+                        self._discard(entry)
+                    else:
+                        self._idle.put(entry)
+            except Exception as e:
+                self.logger.error(f"Failed to start pooled Chrome instance: {e}")
+            finally:
+                with self._lock:
+                    self._pending_creations -= 1
+                    
+        with self._lock:
+            self._pending_creations += 1
+        threading.Thread(target=worker, daemon=True, name="gst-driver-pool").start()
+    
+    def warm_up(self) -> None:
+        """
+        Start Chrome instances until the pool is full.
+        
+        Instances are started in parallel; this call returns once they are all ready.
+        """
+        with self._lock:
+            missing = self.size - len(self._all) - self._pending_creations
+            
+        if missing <= 0:
+            return
+            
+        self._log_status(f"Warming up {missing} Chrome instance(s)...")
+        for _ in range(missing):
+            self._start_driver_in_background()
+            
+        # Wait until all background creations have finished
+        while True:
+            with self._lock:
+                if self._pending_creations == 0:
+                    break
+            time.sleep(0.1)
+            
+        self._log_status(f"WebDriver pool ready with {self._idle.qsize()} idle instance(s)")
+    
+    def acquire(self, timeout: float = WEBDRIVER_POOL_ACQUIRE_TIMEOUT) -> webdriver.Chrome:
+        """
+        Borrow a clean driver from the pool.
+        
+        Args:
+            timeout (float): Maximum time to wait for a free driver
+            
+        Returns:
+            webdriver.Chrome: A driver reset to a blank state
+            
+        Raises:
+            WebDriverPoolError: If the pool is closed or no driver becomes free in time
+        """
+        if self._closed:
+            raise WebDriverPoolError("WebDriver pool is closed")
+            
+        try:
+            entry = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_grow = len(self._all) + self._pending_creations < self.size
+                if can_grow:
+                    self._pending_creations += 1
+                    
+            if can_grow:
+                try:
+                    entry = self._start_driver()
+                finally:
+                    with self._lock:
+                        self._pending_creations -= 1
+            else:
+                try:
+                    entry = self._idle.get(timeout=timeout)
+                except queue.Empty:
+                    raise WebDriverPoolError(f"No pooled WebDriver became available within {timeout}s")
+                    
+        entry.use_count += 1
+        return entry.driver
+    
+    def release(self, driver: webdriver.Chrome) -> None:
+        """
+        Return a borrowed driver to the pool.
+        
+        The driver is reset for the next client, or quit and replaced if it
+        reached its use limit, grew too much in memory or failed to reset.
+        
+        Args:
+            driver (webdriver.Chrome): The driver obtained from acquire()
+        """
+        with self._lock:
+            entry = self._all.get(id(driver))
+            
+        if entry is None:
+            self.logger.warning("Released driver does not belong to this pool - quitting it")
+            self._quit_driver(driver)
+            return
+            
+        recycle_reason = None
+        if self._closed:
+            recycle_reason = "pool closed"
+        elif entry.use_count >= self.max_uses:
+            recycle_reason = f"reached {entry.use_count} uses"
+        elif not self._reset_driver(driver):
+            recycle_reason = "reset failed"
+        else:
+            memory_mb = self._measure_memory_mb(driver)
+            if (memory_mb is not None and entry.baseline_memory_mb is not None and
+                    memory_mb - entry.baseline_memory_mb > self.max_memory_growth_mb):
+                recycle_reason = f"memory grew to {memory_mb:.0f} MB"
+                
+        if recycle_reason:
+            self.logger.info(f"Recycling pooled Chrome instance: {recycle_reason}")
+            self._discard(entry)
+            if not self._closed:
+                self._start_driver_in_background()
+        else:
+            self._idle.put(entry)
+    
+    def _reset_driver(self, driver: webdriver.Chrome) -> bool:
+        """
+        Reset a driver to a clean state between clients.
+        
+        Closes extra tabs, navigates to a blank page, points downloads back
+        at the shared download folder and clears cookies, cache and storage
+        for every GST portal origin.
+        
+        Args:
+            driver (webdriver.Chrome): The driver to reset
+            
+        Returns:
+            bool: True if the reset succeeded, False otherwise
+        """
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.get("about:blank")
+            
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            driver.execute_cdp_cmd(
+                "Browser.setDownloadBehavior",
+                {"behavior": "allow", "downloadPath": self.download_dir}
+            )
+            for origin in GST_PORTAL_ORIGINS:
+                driver.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin",
+                    {"origin": origin, "storageTypes": "all"}
+                )
+            return True
+        except Exception as e:
+            self.logger.warning(f"Failed to reset pooled WebDriver: {e}")
+            return False
+    
+    def _discard(self, entry: _PooledDriver) -> None:
+        """Remove a driver from the pool and quit it."""
+        with self._lock:
+            self._all.pop(id(entry.driver), None)
+        self._quit_driver(entry.driver)
+    
+    def _quit_driver(self, driver: webdriver.Chrome) -> None:
+        """Quit a driver, ignoring errors from already-dead browsers."""
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.debug(f"Error quitting pooled WebDriver: {e}")
+    
+    def get_idle_count(self) -> int:
+        """
+        Get the number of drivers ready to be acquired.
+        
+        Returns:
+            int: Number of idle drivers
+        """
+        return self._idle.qsize()
+    
+    def shutdown(self) -> None:
+        """Quit all Chrome instances owned by the pool."""
+        self._closed = True
+        
+        with self._lock:
+            entries = list(self._all.values())
+            self._all.clear()
+            
+        for entry in entries:
+            self._quit_driver(entry.driver)
+            
+        # Drain the idle queue
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+                
+        self._log_status(f"WebDriver pool shut down ({len(entries)} instance(s) closed)")
+    
+    def __enter__(self):
+        """Warm up the pool when used as a context manager."""
+        self.warm_up()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Shut down the pool when leaving the context."""
+        self.shutdown()
+        return False
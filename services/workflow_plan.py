@@ -0,0 +1,258 @@
+"""
+Workflow plan compiler for GST Automation Application.
+
+This module turns the user's AutomationSettings into an explicit, ordered
+list of workflow steps with dependencies:
+
+    login -> returns_dashboard -> filter_dashboard | gstr2b
+    login -> credit_ledger, cash_ledger (or both together in two tabs)
+
+Shared prerequisites appear once, and steps that continue on the page the
+previous step left the browser on are run first, which keeps page
+transitions to a minimum (e.g. the GSTR-2B download runs straight after the
+Returns Dashboard opens, not after a ledger has taken the browser away).
+Each step records its status and duration so the plan can be inspected and
+timed after a run.
+
+Author: Srinidhi B S
+"""
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Tuple
+
+from config.settings import LEDGER_MULTI_TAB_ENABLED
+from models.client_data import AutomationSettings
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Step names
+STEP_LOGIN = "login"
+STEP_RETURNS_DASHBOARD = "returns_dashboard"
+STEP_FILTER_DASHBOARD = "filter_dashboard"
+STEP_GSTR2B = "gstr2b"
+STEP_CREDIT_LEDGER = "credit_ledger"
+STEP_CASH_LEDGER = "cash_ledger"
+STEP_LEDGERS = "ledgers"  # Credit and cash ledger together in two tabs
+
+# Portal pages a step starts from or leaves the browser on
+PAGE_WELCOME = "welcome"
+PAGE_DASHBOARD = "dashboard"
+PAGE_GSTR2B = "gstr2b"
+PAGE_CREDIT_LEDGER = "credit_ledger"
+PAGE_CASH_LEDGER = "cash_ledger"
+
+# Step status values
+STATUS_PENDING = "pending"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+@dataclass
+class WorkflowStep:
+    """
+    A single step of a compiled workflow plan.
+    
+    Attributes:
+        name (str): Step name (one of the STEP_* constants)
+        description (str): Human-readable description
+        depends_on (Tuple[str, ...]): Steps that must finish first
+        start_page (Optional[str]): Page the step starts from, None if any page will do
+        end_page (str): Page the step leaves the browser on
+        status (str): STATUS_PENDING, STATUS_DONE or STATUS_FAILED
+        duration_seconds (float): Time the step took
+    """
+    name: str
+    description: str
+    depends_on: Tuple[str, ...] = ()
+    start_page: Optional[str] = None
+    end_page: str = PAGE_WELCOME
+    status: str = STATUS_PENDING
+    duration_seconds: float = 0.0
+    
+    def __str__(self) -> str:
+        """
+        String representation of the step.
+        
+        Returns:
+            str: Step name, status and duration
+        """
+        if self.status == STATUS_PENDING:
+            return f"{self.name}: {self.status}"
+        return f"{self.name}: {self.status} in {self.duration_seconds:.1f}s"
+
+@dataclass
+class WorkflowPlan:
+    """
+    Ordered workflow steps compiled from AutomationSettings.
+    
+    Attributes:
+        steps (List[WorkflowStep]): Steps in execution order
+    """
+    steps: List[WorkflowStep] = field(default_factory=list)
+    
+    def get_step_names(self) -> List[str]:
+        """
+        Get the step names in execution order.
+        
+        Returns:
+            List[str]: Step names
+        """
+        return [step.name for step in self.steps]
+    
+    def has_step(self, name: str) -> bool:
+        """
+        Check whether the plan contains a step.
+        
+        Args:
+            name (str): Step name
+            
+        Returns:
+            bool: True if the step is part of the plan
+        """
+        return name in self.get_step_names()
+    
+    def count_page_transitions(self) -> int:
+        """
+        Count the page changes the plan needs after login.
+        
+        Returns:
+            int: Number of steps that must first go back to their start page
+        """
+        transitions = 0
+        current_page = PAGE_WELCOME
+        for step in self.steps[1:]:
+            if step.start_page is not None and step.start_page != current_page:
+                transitions += 1
+            current_page = step.end_page
+        return transitions
+    
+    def run_step(self, step: WorkflowStep, action: Callable[[], Any]) -> Any:
+        """
+        Run a step's action and record its status and duration.
+        
+        Args:
+            step (WorkflowStep): Step being run
+            action (Callable[[], Any]): Function performing the step
+            
+        Returns:
+            Any: Whatever the action returned
+            
+        Raises:
+            Exception: Any exception raised by the action (the step is marked failed)
+        """
+        start_time = time.time()
+        try:
+            result = action()
+            step.status = STATUS_DONE
+            return result
+        except Exception:
+            step.status = STATUS_FAILED
+            raise
+        finally:
+            step.duration_seconds = time.time() - start_time
+            logger.debug(f"Workflow step {step}")
+    
+    def describe(self) -> str:
+        """
+        Get a one-line description of the plan.
+        
+        Returns:
+            str: Step names in execution order
+        """
+        return " -> ".join(self.get_step_names())
+    
+    def get_timing_summary(self) -> str:
+        """
+        Get a human-readable timing report of the steps.
+        
+        Returns:
+            str: One line per step with status and duration
+        """
+        total = sum(step.duration_seconds for step in self.steps)
+        lines = [f"Workflow plan ({total:.1f}s, {self.count_page_transitions()} page transitions):"]
+        lines.extend(f"  {step}" for step in self.steps)
+        return "\n".join(lines)
+
+def _order_steps(steps: List[WorkflowStep]) -> List[WorkflowStep]:
+    """
+    Order steps so dependencies run first and page transitions are few.
+    
+    Among the steps whose dependencies are done, one that can continue on
+    the current page is preferred; ties keep the declaration order.
+    
+    Args:
+        steps (List[WorkflowStep]): Steps in declaration order
+        
+    Returns:
+        List[WorkflowStep]: Steps in execution order
+    """
+    remaining = list(steps)
+    ordered: List[WorkflowStep] = []
+    done = set()
+    current_page = None
+    
+    while remaining:
+        ready = [step for step in remaining if all(dependency in done for dependency in step.depends_on)]
+        if not ready:
+            raise ValueError(f"Workflow steps have unmet dependencies: {[step.name for step in remaining]}")
+        same_page = [step for step in ready if step.start_page in (None, current_page)]
+        step = (same_page or ready)[0]
+        
+        ordered.append(step)
+        remaining.remove(step)
+        done.add(step.name)
+        current_page = step.end_page
+        
+    return ordered
+
+def compile_workflow_plan(settings: AutomationSettings, has_pending_periods: bool) -> WorkflowPlan:
+    """
+    Compile the selected automation actions into an ordered step plan.
+    
+    Args:
+        settings (AutomationSettings): Selected automation actions
+        has_pending_periods (bool): True if GSTR-2B periods still need downloading
+            (False when every period was reused from earlier runs)
+            
+    Returns:
+        WorkflowPlan: Steps in execution order, always starting with login
+    """
+    steps = [WorkflowStep(STEP_LOGIN, "Log in to the GST portal", end_page=PAGE_WELCOME)]
+    
+    download_gstr2b = settings.download_gstr2b and has_pending_periods
+    show_dashboard = settings.returns_dashboard and not settings.download_gstr2b
+    if download_gstr2b or show_dashboard:
+        steps.append(WorkflowStep(
+            STEP_RETURNS_DASHBOARD, "Open the Returns Dashboard",
+            depends_on=(STEP_LOGIN,), start_page=PAGE_WELCOME, end_page=PAGE_DASHBOARD
+        ))
+    if show_dashboard:
+        steps.append(WorkflowStep(
+            STEP_FILTER_DASHBOARD, "Select the return period on the dashboard",
+            depends_on=(STEP_RETURNS_DASHBOARD,), start_page=PAGE_DASHBOARD, end_page=PAGE_DASHBOARD
+        ))
+    if download_gstr2b:
+        steps.append(WorkflowStep(
+            STEP_GSTR2B, "Download GSTR-2B for each pending period",
+            depends_on=(STEP_RETURNS_DASHBOARD,), start_page=PAGE_DASHBOARD, end_page=PAGE_GSTR2B
+        ))
+        
+    if settings.access_credit_ledger and settings.access_cash_ledger and LEDGER_MULTI_TAB_ENABLED:
+        steps.append(WorkflowStep(
+            STEP_LEDGERS, "Fetch the credit and cash ledgers in two tabs",
+            depends_on=(STEP_LOGIN,), start_page=PAGE_WELCOME, end_page=PAGE_CREDIT_LEDGER
+        ))
+    else:
+        if settings.access_credit_ledger:
+            steps.append(WorkflowStep(
+                STEP_CREDIT_LEDGER, "Fetch the Electronic Credit Ledger",
+                depends_on=(STEP_LOGIN,), start_page=PAGE_WELCOME, end_page=PAGE_CREDIT_LEDGER
+            ))
+        if settings.access_cash_ledger:
+            steps.append(WorkflowStep(
+                STEP_CASH_LEDGER, "Fetch the Electronic Cash Ledger balance",
+                depends_on=(STEP_LOGIN,), start_page=PAGE_WELCOME, end_page=PAGE_CASH_LEDGER
+            ))
+            
+    return WorkflowPlan(steps=_order_steps(steps))
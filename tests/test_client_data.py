@@ -0,0 +1,41 @@
+"""
+Tests for the client data models.
+
+Author: Srinidhi B S
+"""
+import unittest
+
+from models.client_data import CreditLedgerOptions
+
+class CreditLedgerOptionsSplitTest(unittest.TestCase):
+    """Splitting credit ledger date ranges into portal-sized windows."""
+    
+    def window_dates(self, options, max_span_days):
+        """List the (from, to) dates of the windows a range is split into."""
+        return [(window.from_date, window.to_date) for window in options.split(max_span_days)]
+    
+    def test_window_ends_at_financial_year_boundary(self):
+        options = CreditLedgerOptions(from_date="01-03-2024", to_date="30-04-2024")
+        
+        self.assertEqual(
+            self.window_dates(options, 365),
+            [("01-03-2024", "31-03-2024"), ("01-04-2024", "30-04-2024")]
+        )
+    
+    def test_long_range_is_split_by_span(self):
+        options = CreditLedgerOptions(from_date="01-04-2024", to_date="30-06-2024")
+        
+        self.assertEqual(
+            self.window_dates(options, 31),
+            [("01-04-2024", "01-05-2024"), ("02-05-2024", "01-06-2024"), ("02-06-2024", "30-06-2024")]
+        )
+    
+    def test_invalid_ranges_are_returned_unchanged(self):
+        backwards = CreditLedgerOptions(from_date="30-04-2024", to_date="01-04-2024")
+        unparsable = CreditLedgerOptions(from_date="2024-04-01", to_date="2024-04-30")
+        
+        self.assertEqual(backwards.split(31), [backwards])
+        self.assertEqual(unparsable.split(31), [unparsable])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""
+Tests for the download layout and manifest.
+
+Author: Srinidhi B S
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from services.download_layout import DownloadLayout
+from services.download_tracker import DownloadResult
+
+class DownloadLayoutTest(unittest.TestCase):
+    """Filing downloads and finding them again."""
+    
+    def setUp(self):
+        self.root_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root_dir)
+        self.layout = DownloadLayout(self.root_dir)
+    
+    def file_gstr2b(self, client_name, username, content):
+        """File a GSTR-2B download for August 2025-26."""
+        run_dir = self.layout.create_run_directory(client_name)
+        path = os.path.join(run_dir, "GSTR2B.xlsx")
+        with open(path, "wb") as file:
+            file.write(content)
+        download = DownloadResult(path=path, size_bytes=len(content), elapsed_seconds=1.0)
+        return self.layout.file_download(download, client_name, username, "GSTR-2B", "2025-26", "August")
+    
+    def test_clients_with_the_same_name_do_not_share_files(self):
+        first = self.file_gstr2b("Acme Traders", "acme_north", b"north")
+        second = self.file_gstr2b("Acme Traders", "acme_south", b"south-office")
+        
+        self.assertNotEqual(os.path.dirname(first.path), os.path.dirname(second.path))
+        found = self.layout.find_existing("Acme Traders", "acme_north", "GSTR-2B", "2025-26", "August")
+        self.assertEqual(found.path, first.path)
+        found = self.layout.find_existing("Acme Traders", "acme_south", "GSTR-2B", "2025-26", "August")
+        self.assertEqual(found.path, second.path)
+        self.assertIsNone(self.layout.find_existing("Acme Traders", "acme_east", "GSTR-2B", "2025-26", "August"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+"""
+Tests for electronic ledger extraction and the ledger store.
+
+Author: Srinidhi B S
+"""
+import os
+import math
+import shutil
+import tempfile
+import unittest
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+from services.ledger_extraction import (
+    LedgerStore, LedgerExtractionError, CREDIT_LEDGER_NAME, CREDIT_LEDGER_COLUMNS,
+    build_credit_ledger_frame, build_cash_ledger_balance, merge_ledger_frames, parse_amount
+)
+
+# Flattened headers of the detailed credit ledger table
+CREDIT_HEADERS = [
+    "Sr. No.", "Date", "Reference No.", "Ledger used for discharging liability", "Description",
+    "Type of Transaction", "Credit / Debit IGST", "Credit / Debit CGST", "Credit / Debit SGST/UTGST",
+    "Credit / Debit Cess", "Credit / Debit Total", "Balance Available IGST", "Balance Available Total"
+]
+
+def credit_row(date: str, reference: str, igst: str, balance: str, description: str = "") -> list:
+    """Build one credit ledger table row with IGST only."""
+    return ["1", date, reference, "", description, "Credit", igst, "0.00", "0.00", "0.00", igst, balance, balance]
+
+class ParseAmountTest(unittest.TestCase):
+    """Conversion of portal amount texts."""
+    
+    def test_indian_grouping_and_currency_sign(self):
+        self.assertEqual(parse_amount("1,23,456.50"), 123456.5)
+        self.assertEqual(parse_amount("₹ 2,000.00"), 2000.0)
+    
+    def test_brackets_are_negative(self):
+        self.assertEqual(parse_amount("(1,500.00)"), -1500.0)
+    
+    def test_blank_and_text_are_nan(self):
+        self.assertTrue(math.isnan(parse_amount("")))
+        self.assertTrue(math.isnan(parse_amount("-NA-")))
+
+@unittest.skipUnless(pd is not None, "pandas is not installed")
+class CreditLedgerFrameTest(unittest.TestCase):
+    """Header matching of the detailed credit ledger table."""
+    
+    def test_columns_are_found_by_label(self):
+        frame = build_credit_ledger_frame(
+            CREDIT_HEADERS, [credit_row("15-04-2024", "REF1", "(250.00)", "750.00", "Utilised")], "Acme"
+        )
+        
+        self.assertEqual(list(frame.columns), CREDIT_LEDGER_COLUMNS)
+        row = frame.iloc[0]
+        self.assertEqual(row["date"], pd.Timestamp(2024, 4, 15))
+        self.assertEqual(row["description"], "Utilised")
+        self.assertEqual(row["igst"], -250.0)  # Credit / Debit column, not the balance column
+        self.assertEqual(row["balance"], 750.0)
+    
+    def test_reordered_columns(self):
+        order = [1, 0, 2, 4, 5, 8, 7, 6, 9, 10, 11, 12, 3]
+        headers = [CREDIT_HEADERS[index] for index in order]
+        source = credit_row("15-04-2024", "REF1", "250.00", "750.00")
+        frame = build_credit_ledger_frame(headers, [[source[index] for index in order]], "Acme")
+        
+        self.assertEqual(frame.iloc[0]["reference"], "REF1")
+        self.assertEqual(frame.iloc[0]["igst"], 250.0)
+    
+    def test_missing_tax_columns_raise(self):
+        with self.assertRaises(LedgerExtractionError):
+            build_credit_ledger_frame(["Date", "Reference No.", "Amount"], [], "Acme")
+
+class CashLedgerBalanceTest(unittest.TestCase):
+    """Both layouts of the cash ledger balance table."""
+    
+    def test_tax_types_as_rows(self):
+        headers = ["Description", "Tax", "Interest", "Penalty", "Fee", "Others", "Total"]
+        rows = [
+            ["Integrated Tax (IGST)", "1,000.00", "10.00", "0.00", "0.00", "0.00", "1,010.00"],
+            ["Central Tax (CGST)", "200.00", "0.00", "0.00", "50.00", "0.00", "250.00"],
+        ]
+        balance = build_cash_ledger_balance(headers, rows, "Acme")
+        
+        self.assertEqual(balance.balances["igst"]["tax"], 1000.0)
+        self.assertEqual(balance.balances["igst"]["interest"], 10.0)
+        self.assertEqual(balance.balances["cgst"]["fee"], 50.0)
+        self.assertTrue(math.isnan(balance.balances["sgst"]["tax"]))
+        self.assertEqual(balance.get_total(), 1260.0)
+    
+    def test_tax_types_as_columns(self):
+        headers = ["Description", "Integrated Tax (IGST)", "Central Tax (CGST)",
+                   "State/UT Tax (SGST/UTGST)", "Cess", "Total"]
+        rows = [
+            ["Tax", "100.00", "200.00", "300.00", "0.00", "600.00"],
+            ["Interest", "1.00", "2.00", "3.00", "0.00", "6.00"],
+        ]
+        balance = build_cash_ledger_balance(headers, rows, "Acme")
+        
+        self.assertEqual(balance.balances["sgst"]["tax"], 300.0)
+        self.assertEqual(balance.balances["cgst"]["interest"], 2.0)
+        self.assertEqual(balance.get_total(), 606.0)
+    
+    def test_unrecognized_table_raises(self):
+        with self.assertRaises(LedgerExtractionError):
+            build_cash_ledger_balance(["Name", "Value"], [["Foo", "1.00"]], "Acme")
+
+@unittest.skipUnless(pd is not None, "pandas is not installed")
+class LedgerStoreTest(unittest.TestCase):
+    """Append and read back ledger rows."""
+    
+    def setUp(self):
+        self.root_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root_dir)
+        self.store = LedgerStore(self.root_dir)
+    
+    def test_round_trip_keeps_blank_text_and_dedups_refetch(self):
+        frame = build_credit_ledger_frame(
+            CREDIT_HEADERS, [credit_row("01-04-2024", "REF1", "1,000.00", "1,000.00")], "Acme"
+        )
+        self.store.append("Acme", "acme123", CREDIT_LEDGER_NAME, frame)
+        self.store.append("Acme", "acme123", CREDIT_LEDGER_NAME, frame)
+        
+        stored = self.store.read("Acme", "acme123", CREDIT_LEDGER_NAME)
+        self.assertEqual(len(stored), 1)
+        self.assertEqual(stored.loc[0, "description"], "")
+        self.assertEqual(stored.loc[0, "reference"], "REF1")
+        self.assertEqual(stored.loc[0, "igst"], 1000.0)
+    
+    def test_identical_entries_within_one_fetch_are_kept(self):
+        rows = [
+            credit_row("01-04-2024", "REF1", "500.00", "500.00", "ITC from GSTR-3B"),
+            credit_row("01-04-2024", "REF1", "500.00", "500.00", "ITC from GSTR-3B"),
+        ]
+        frame = build_credit_ledger_frame(CREDIT_HEADERS, rows, "Acme")
+        self.store.append("Acme", "acme123", CREDIT_LEDGER_NAME, frame)
+        self.store.append("Acme", "acme123", CREDIT_LEDGER_NAME, frame)
+        
+        self.assertEqual(len(self.store.read("Acme", "acme123", CREDIT_LEDGER_NAME)), 2)
+    
+    def test_overlapping_windows_merge_shared_rows(self):
+        first = build_credit_ledger_frame(CREDIT_HEADERS, [
+            credit_row("31-03-2024", "REF1", "100.00", "100.00"),
+            credit_row("01-04-2024", "REF2", "200.00", "300.00"),
+        ], "Acme")
+        second = build_credit_ledger_frame(CREDIT_HEADERS, [
+            credit_row("01-04-2024", "REF2", "200.00", "300.00"),
+            credit_row("02-04-2024", "REF3", "50.00", "350.00"),
+        ], "Acme")
+        
+        merged = merge_ledger_frames([first, second])
+        self.assertEqual(list(merged["reference"]), ["REF1", "REF2", "REF3"])
+    
+    def test_empty_extraction_does_not_break_later_appends(self):
+        empty = build_credit_ledger_frame(CREDIT_HEADERS, [], "Acme")
+        self.store.append("Acme", "acme123", CREDIT_LEDGER_NAME, merge_ledger_frames([empty]))
+        
+        frame = build_credit_ledger_frame(
+            CREDIT_HEADERS, [credit_row("01-04-2024", "REF1", "1,000.00", "1,000.00")], "Acme"
+        )
+        self.store.append("Acme", "acme123", CREDIT_LEDGER_NAME, frame)
+        self.assertEqual(len(self.store.read("Acme", "acme123", CREDIT_LEDGER_NAME)), 1)
+    
+    def test_read_zero_byte_store(self):
+        path = self.store.get_store_path("Acme", "acme123", CREDIT_LEDGER_NAME)
+        os.makedirs(os.path.dirname(path))
+        open(path, "w").close()
+        
+        stored = self.store.read("Acme", "acme123", CREDIT_LEDGER_NAME)
+        self.assertTrue(stored.empty)
+        self.assertEqual(list(stored.columns), CREDIT_LEDGER_COLUMNS)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Tests for the workflow plan compiler.
+
+Author: Srinidhi B S
+"""
+import unittest
+
+from models.client_data import AutomationSettings
+from services.workflow_plan import (
+    WorkflowPlan, WorkflowStep, compile_workflow_plan, _order_steps,
+    STEP_LOGIN, STEP_RETURNS_DASHBOARD, STEP_GSTR2B, STEP_CREDIT_LEDGER, STEP_CASH_LEDGER,
+    PAGE_WELCOME, PAGE_DASHBOARD, PAGE_GSTR2B, PAGE_CREDIT_LEDGER, PAGE_CASH_LEDGER
+)
+
+class WorkflowPlanOrderTest(unittest.TestCase):
+    """Ordering of workflow steps by start and end page."""
+    
+    def _declared_steps(self):
+        """Steps declared with a ledger between the dashboard and the GSTR-2B download."""
+        return [
+            WorkflowStep(STEP_LOGIN, "Log in", end_page=PAGE_WELCOME),
+            WorkflowStep(STEP_RETURNS_DASHBOARD, "Dashboard", depends_on=(STEP_LOGIN,),
+                         start_page=PAGE_WELCOME, end_page=PAGE_DASHBOARD),
+            WorkflowStep(STEP_CREDIT_LEDGER, "Credit ledger", depends_on=(STEP_LOGIN,),
+                         start_page=PAGE_WELCOME, end_page=PAGE_CREDIT_LEDGER),
+            WorkflowStep(STEP_GSTR2B, "GSTR-2B", depends_on=(STEP_RETURNS_DASHBOARD,),
+                         start_page=PAGE_DASHBOARD, end_page=PAGE_GSTR2B),
+            WorkflowStep(STEP_CASH_LEDGER, "Cash ledger", depends_on=(STEP_LOGIN,),
+                         start_page=PAGE_WELCOME, end_page=PAGE_CASH_LEDGER),
+        ]
+    
+    def test_ordering_removes_page_transitions(self):
+        declared = WorkflowPlan(steps=self._declared_steps())
+        ordered = WorkflowPlan(steps=_order_steps(self._declared_steps()))
+        
+        self.assertEqual(declared.count_page_transitions(), 3)
+        self.assertEqual(ordered.count_page_transitions(), 2)
+        self.assertEqual(
+            ordered.get_step_names(),
+            [STEP_LOGIN, STEP_RETURNS_DASHBOARD, STEP_GSTR2B, STEP_CREDIT_LEDGER, STEP_CASH_LEDGER]
+        )
+    
+    def test_compiled_plan_runs_gstr2b_on_the_dashboard(self):
+        settings = AutomationSettings(download_gstr2b=True, access_credit_ledger=True, access_cash_ledger=True)
+        plan = compile_workflow_plan(settings, has_pending_periods=True)
+        
+        names = plan.get_step_names()
+        self.assertEqual(names[0], STEP_LOGIN)
+        self.assertEqual(names.index(STEP_GSTR2B), names.index(STEP_RETURNS_DASHBOARD) + 1)
+        self.assertTrue(all(step.start_page is not None for step in plan.steps[1:]))
+
+if __name__ == "__main__":
+    unittest.main()